@@ -0,0 +1,364 @@
+"""
+생성 파이프라인 벤치마크
+
+합성 택소노미 + 오프라인 AI(LocalRuleClient)로 네트워크 없이 전체 파이프라인을 실행하고
+단계별 시간, events/sec, bytes/sec, 피크 RSS를 JSON으로 남긴다.
+
+    python -m benchmarks.bench_pipeline run                       # 1k/10k/100k DAU × 1/7/30일
+    python -m benchmarks.bench_pipeline run --dau 1000 --days 1   # 일부 규모만
+    python -m benchmarks.compare benchmarks/results/A.json benchmarks/results/B.json
+
+각 규모는 별도 프로세스에서 실행하므로 피크 RSS가 이전 규모의 영향을 받지 않는다.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import shutil
+import tempfile
+import threading
+import subprocess
+import contextlib
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import click
+import numpy as np
+
+from data_generator.config.config_schema import DataGeneratorConfig, IndustryType, PlatformType
+from data_generator.readers.taxonomy_reader import TaxonomyReader
+from data_generator.ai.local_client import LocalRuleClient
+from data_generator.generators.intelligent_property_generator import IntelligentPropertyGenerator
+from data_generator.generators.behavior_engine import BehaviorEngine
+from data_generator.generators.property_update_engine import PropertyUpdateEngine
+from data_generator.generators.user_generator import UserGenerator
+from data_generator.generators.log_generator import LogGenerator
+from data_generator.utils.rng import RandomStreams
+from data_generator.utils.telemetry import Telemetry
+
+from .synthetic_taxonomy import write_synthetic_taxonomy
+
+
+DEFAULT_DAU = (1000, 10000, 100000)
+DEFAULT_DAYS = (1, 7, 30)
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# 파이프라인 단계 (출력 순서)
+STAGES = (
+    "taxonomy_load",
+    "ai_analysis",
+    "user_generation",
+    "session_planning",
+    "property_generation",
+    "serialization",
+    "file_writing",
+    "log_other",
+)
+
+
+def current_rss_bytes() -> Optional[int]:
+    """현재 RSS (Linux /proc 기준, 없으면 None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_bytes() -> int:
+    """프로세스 시작 이후 피크 RSS"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageTimer(Telemetry):
+    """
+    단계별 배타 시간 측정기 (Telemetry) + 단계별 피크 RSS
+
+    백그라운드 스레드가 RSS를 주기적으로 읽어 그 시점에 실행 중인 단계의 피크로 기록.
+    """
+
+    def __init__(self, sample_interval: float = 0.01):
+        super().__init__(detailed=True)
+        self.peak_rss: Dict[str, int] = {}
+        self._sample_interval = sample_interval
+        self._sampling = current_rss_bytes() is not None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start_sampler(self):
+        if self._sampling and self._sampler is None:
+            self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+            self._sampler.start()
+
+    def stop_sampler(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def _sample_loop(self):
+        while not self._stop.wait(self._sample_interval):
+            stack = self._stack
+            if not stack:
+                continue
+            try:
+                stage = stack[-1][0]
+            except IndexError:
+                continue
+            self._record_rss(stage, current_rss_bytes())
+
+    def _record_rss(self, stage: str, rss: Optional[int]):
+        if rss is not None and rss > self.peak_rss.get(stage, 0):
+            self.peak_rss[stage] = rss
+
+    def exit(self):
+        stage = self._stack[-1][0]
+        super().exit()
+        if not self._sampling:
+            self._record_rss(stage, peak_rss_bytes())
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """큰 단계 측정 (샘플링 주기보다 짧게 끝나도 종료 시점 RSS를 기록)"""
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self._record_rss(name, current_rss_bytes())
+            self.exit()
+
+
+def run_case(
+    dau: int,
+    days: int,
+    taxonomy_path: Path,
+    output_dir: Path,
+    seed: int = 42,
+    json_backend: str = "json",
+) -> Dict[str, Any]:
+    """
+    한 규모(DAU × 일수)의 전체 파이프라인 실행 후 단계별 측정 결과 반환
+
+    단계 구분은 파이프라인 메서드를 감싸서 측정 (이벤트당 호출 오버헤드 약 1µs 포함)
+    """
+    timer = StageTimer()
+    timer.start_sampler()
+    started_at = time.perf_counter()
+
+    with timer.stage("taxonomy_load"):
+        taxonomy = TaxonomyReader(str(taxonomy_path)).read()
+
+    start_date = date(2024, 1, 1)
+    config = DataGeneratorConfig(
+        taxonomy_file=str(taxonomy_path),
+        product_name="Benchmark",
+        industry=IndustryType.GAME_IDLE,
+        platform=PlatformType.MOBILE_APP,
+        start_date=start_date,
+        end_date=start_date + timedelta(days=days - 1),
+        dau=dau,
+        seed=seed,
+        output_dir=str(output_dir),
+        ai_provider="local",
+        json_backend=json_backend,
+    )
+    rng = RandomStreams(config.seed)
+    product_info = LogGenerator.product_info_for(config)
+
+    with timer.stage("ai_analysis"):
+        ai_client = LocalRuleClient(taxonomy=taxonomy)
+        all_properties = list(taxonomy.common_properties) + list(taxonomy.user_properties)
+        for event in taxonomy.events:
+            all_properties.extend(event.properties)
+        intelligent_generator = IntelligentPropertyGenerator(
+            ai_client=ai_client,
+            taxonomy_properties=all_properties,
+            product_info=product_info,
+            event_names=taxonomy.get_all_event_names(),
+            enable_cache=False,
+            rng=rng,
+        )
+        intelligent_generator.analyze_properties()
+        behavior_engine = BehaviorEngine(
+            ai_client, taxonomy, product_info, intelligent_generator=intelligent_generator, rng=rng,
+        )
+        for scenario_config in config.scenarios:
+            behavior_engine.get_behavior_pattern(scenario_config.get_scenario_key())
+        update_engine = PropertyUpdateEngine(ai_client, taxonomy, product_info, enable_cache=False, rng=rng)
+        update_engine.analyze_event_update_patterns()
+
+    with timer.stage("user_generation"):
+        users = UserGenerator(config, taxonomy, intelligent_generator=intelligent_generator, rng=rng).generate_users()
+
+    log_generator = LogGenerator(
+        config, taxonomy, behavior_engine, users,
+        ai_client=ai_client,
+        intelligent_generator=intelligent_generator,
+        rng=rng,
+        update_engine=update_engine,
+    )
+    timer.instrument(behavior_engine, "plan_daily_sessions", "session_planning")
+    timer.instrument(behavior_engine, "plan_session_events", "session_planning")
+    timer.instrument(behavior_engine, "select_events_for_session", "session_planning")
+    timer.instrument(log_generator, "_generate_event_log", "property_generation")
+    timer.instrument(log_generator.event_encoder, "track", "serialization")
+    timer.instrument(log_generator.event_encoder, "user", "serialization")
+    timer.instrument(log_generator.writer, "flush", "file_writing")
+
+    with timer.stage("log_other"):
+        report = log_generator.generate()
+
+    total_seconds = time.perf_counter() - started_at
+    timer.stop_sampler()
+
+    events = report.type_counts.get("track", 0)
+    total_bytes = report.total_bytes
+
+    stages = {}
+    for name in STAGES:
+        seconds = timer.seconds.get(name, 0.0)
+        stage_result = {
+            "seconds": round(seconds, 4),
+            "calls": timer.calls.get(name, 0),
+            "share": round(seconds / total_seconds, 4) if total_seconds else 0.0,
+            # 파이프라인 전체 이벤트/바이트를 이 단계 시간으로 나눈 값 (이 단계만의 처리 속도)
+            "events_per_sec": round(events / seconds, 1) if seconds else None,
+            "bytes_per_sec": round(total_bytes / seconds, 1) if seconds else None,
+            "peak_rss_mb": round(timer.peak_rss[name] / 1024 / 1024, 1) if name in timer.peak_rss else None,
+        }
+        if name == "user_generation":
+            stage_result["users_per_sec"] = round(len(users) / seconds, 1) if seconds else None
+        stages[name] = stage_result
+
+    return {
+        "dau": dau,
+        "days": days,
+        "users": len(users),
+        "events": events,
+        "lines": report.total_lines,
+        "bytes": total_bytes,
+        "total_seconds": round(total_seconds, 4),
+        "events_per_sec": round(events / total_seconds, 1) if total_seconds else None,
+        "bytes_per_sec": round(total_bytes / total_seconds, 1) if total_seconds else None,
+        "peak_rss_mb": round(peak_rss_bytes() / 1024 / 1024, 1),
+        "stages": stages,
+    }
+
+
+def environment_info() -> Dict[str, Any]:
+    """결과 비교용 실행 환경 정보"""
+    def git(*args) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ["git", *args], capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "git_commit": git("rev-parse", "HEAD"),
+        "git_dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+@click.group()
+def cli():
+    """Demo Data Generator 파이프라인 벤치마크"""
+    pass
+
+
+@cli.command()
+@click.option('--dau', 'dau_list', type=int, multiple=True, help='DAU 규모 (여러 번 지정 가능, 기본: 1000 10000 100000)')
+@click.option('--days', 'days_list', type=int, multiple=True, help='기간 일수 (여러 번 지정 가능, 기본: 1 7 30)')
+@click.option('--seed', type=int, default=42, help='생성 시드')
+@click.option('--json-backend', type=click.Choice(['json', 'orjson', 'ujson']), default='json', help='직렬화 백엔드')
+@click.option('--events', 'event_count', type=int, default=40, help='합성 택소노미 이벤트 수')
+@click.option('--output', '-o', type=click.Path(), default=None, help='결과 JSON 경로 (기본: benchmarks/results/<시각>_<커밋>.json)')
+@click.option('--keep-logs', is_flag=True, default=False, help='생성된 로그 파일과 작업 디렉터리를 지우지 않음')
+def run(dau_list, days_list, seed, json_backend, event_count, output, keep_logs):
+    """규모별 벤치마크 실행 후 결과를 JSON으로 저장"""
+    dau_list = dau_list or DEFAULT_DAU
+    days_list = days_list or DEFAULT_DAYS
+
+    workdir = Path(tempfile.mkdtemp(prefix="dg_bench_"))
+    taxonomy_path = write_synthetic_taxonomy(workdir / "taxonomy.xlsx", event_count=event_count, seed=seed)
+
+    env = environment_info()
+    result = {
+        "benchmark": "pipeline",
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        **env,
+        "settings": {"seed": seed, "json_backend": json_backend, "taxonomy_events": event_count},
+        "cases": [],
+    }
+
+    try:
+        for dau in dau_list:
+            for days in days_list:
+                click.echo(f"▶ DAU {dau:,} × {days}일 ...")
+                case_file = workdir / f"case_{dau}_{days}.json"
+                command = [
+                    sys.executable, "-m", "benchmarks.bench_pipeline", "case",
+                    "--dau", str(dau), "--days", str(days), "--seed", str(seed),
+                    "--json-backend", json_backend,
+                    "--taxonomy", str(taxonomy_path),
+                    "--output-dir", str(workdir / f"logs_{dau}_{days}"),
+                    "--result", str(case_file),
+                ]
+                completed = subprocess.run(command, cwd=Path(__file__).parent.parent)
+                if completed.returncode != 0 or not case_file.exists():
+                    click.echo(f"  ⚠️  실패 (exit {completed.returncode})")
+                    result["cases"].append({"dau": dau, "days": days, "error": completed.returncode})
+                    continue
+
+                case = json.loads(case_file.read_text())
+                result["cases"].append(case)
+                click.echo(
+                    f"  ✓ {case['events']:,} events, {case['total_seconds']:.1f}s, "
+                    f"{case['events_per_sec']:,.0f} events/s, peak RSS {case['peak_rss_mb']:.0f} MB"
+                )
+                if not keep_logs:
+                    for path in (workdir / f"logs_{dau}_{days}").glob("*"):
+                        path.unlink()
+    finally:
+        # 작업 디렉터리(택소노미, 규모별 결과, 로그)는 --keep-logs일 때만 남김
+        if keep_logs:
+            click.echo(f"  로그 보관: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if output:
+        output_path = Path(output)
+    else:
+        commit = (env["git_commit"] or "nogit")[:8]
+        output_path = RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+    click.echo(f"\n✓ 결과 저장: {output_path}")
+
+
+@cli.command()
+@click.option('--dau', type=int, required=True)
+@click.option('--days', type=int, required=True)
+@click.option('--seed', type=int, default=42)
+@click.option('--json-backend', type=str, default='json')
+@click.option('--taxonomy', type=click.Path(exists=True), required=True)
+@click.option('--output-dir', type=click.Path(), required=True)
+@click.option('--result', type=click.Path(), required=True, help='측정 결과 JSON 경로')
+def case(dau, days, seed, json_backend, taxonomy, output_dir, result):
+    """한 규모만 현재 프로세스에서 실행 (run이 규모마다 별도 프로세스로 호출)"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        measured = run_case(dau, days, Path(taxonomy), Path(output_dir), seed=seed, json_backend=json_backend)
+    Path(result).write_text(json.dumps(measured, indent=2))
+
+
+if __name__ == "__main__":
+    cli()
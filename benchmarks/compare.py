@@ -0,0 +1,76 @@
+"""
+벤치마크 결과 비교 - 두 결과 JSON의 규모별 events/sec, 단계별 시간, 피크 RSS 차이를 출력
+
+    python -m benchmarks.compare <기준.json> <비교.json> [--threshold 0.1]
+
+처리 속도가 threshold 이상 떨어지거나 피크 RSS가 threshold 이상 늘면 회귀로 표시하고 종료 코드 1을 반환.
+"""
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import click
+
+
+def _cases(result: Dict[str, Any]) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    return {(case["dau"], case["days"]): case for case in result.get("cases", []) if "error" not in case}
+
+
+def _change(base: Optional[float], new: Optional[float]) -> Optional[float]:
+    if not base or new is None:
+        return None
+    return (new - base) / base
+
+
+def _format_change(change: Optional[float]) -> str:
+    return "   n/a" if change is None else f"{change * 100:+6.1f}%"
+
+
+@click.command()
+@click.argument('base_file', type=click.Path(exists=True))
+@click.argument('new_file', type=click.Path(exists=True))
+@click.option('--threshold', type=float, default=0.1, help='회귀로 판단할 변화율 (기본 10%)')
+def compare(base_file, new_file, threshold):
+    """두 벤치마크 결과 비교"""
+    base = json.loads(Path(base_file).read_text())
+    new = json.loads(Path(new_file).read_text())
+    click.echo(f"기준: {(base.get('git_commit') or '?')[:8]}  비교: {(new.get('git_commit') or '?')[:8]}")
+
+    base_cases, new_cases = _cases(base), _cases(new)
+    regressions = []
+
+    for key in sorted(set(base_cases) & set(new_cases)):
+        b, n = base_cases[key], new_cases[key]
+        throughput = _change(b["events_per_sec"], n["events_per_sec"])
+        rss = _change(b["peak_rss_mb"], n["peak_rss_mb"])
+        click.echo(
+            f"\nDAU {key[0]:,} × {key[1]}일: {b['events_per_sec']:,.0f} → {n['events_per_sec']:,.0f} events/s "
+            f"({_format_change(throughput)}), peak RSS {b['peak_rss_mb']:.0f} → {n['peak_rss_mb']:.0f} MB ({_format_change(rss)})"
+        )
+        if throughput is not None and throughput < -threshold:
+            regressions.append(f"DAU {key[0]} × {key[1]}일 events/sec {_format_change(throughput)}")
+        if rss is not None and rss > threshold:
+            regressions.append(f"DAU {key[0]} × {key[1]}일 peak RSS {_format_change(rss)}")
+
+        for stage, b_stage in b["stages"].items():
+            n_stage = n["stages"].get(stage)
+            if not n_stage:
+                continue
+            change = _change(b_stage["seconds"], n_stage["seconds"])
+            click.echo(f"  {stage:<20} {b_stage['seconds']:>9.3f}s → {n_stage['seconds']:>9.3f}s  {_format_change(change)}")
+
+    missing = set(base_cases) ^ set(new_cases)
+    if missing:
+        click.echo(f"\n⚠️  한쪽에만 있는 규모: {sorted(missing)}")
+
+    if regressions:
+        click.echo("\n❌ 회귀:")
+        for line in regressions:
+            click.echo(f"  - {line}")
+        sys.exit(1)
+    click.echo("\n✓ 회귀 없음")
+
+
+if __name__ == "__main__":
+    compare()
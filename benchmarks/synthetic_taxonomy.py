@@ -0,0 +1,131 @@
+"""
+벤치마크용 합성 택소노미 생성기
+실제 택소노미 엑셀과 같은 시트/컬럼 구조로 파일을 만들어 TaxonomyReader 로딩까지 측정할 수 있게 한다.
+"""
+import random
+from pathlib import Path
+from typing import List, Dict, Any
+
+import pandas as pd
+
+
+# (속성명, 타입) 후보 - LocalRuleClient 휴리스틱이 범위/예시 값을 찾을 수 있는 이름 위주
+_EVENT_PROPERTY_POOL = [
+    ("stage_id", "string"), ("item_id", "string"), ("product_id", "string"), ("currency_id", "string"),
+    ("reward_type", "string"), ("ad_placement", "string"), ("transaction_type", "string"),
+    ("quantity", "number"), ("amount", "number"), ("price_usd", "number"), ("duration_seconds", "number"),
+    ("clear_time_seconds", "number"), ("party_power", "number"), ("balance_after", "number"),
+    ("previous_level", "number"), ("current_level", "number"), ("score", "number"),
+    ("is_first_clear", "boolean"), ("is_success", "boolean"),
+    ("result_list", "list"), ("reward_info", "object"),
+]
+
+_COMMON_PROPERTY_POOL = [
+    ("channel", "string"), ("server_id", "string"), ("tmp_level", "number"), ("tmp_xp", "number"),
+    ("tmp_gold", "number"), ("tmp_gem", "number"), ("tmp_stamina", "number"), ("tmp_combat_power", "number"),
+    ("tmp_session_count", "number"), ("tmp_days_since_install", "number"), ("tmp_total_playtime_minutes", "number"),
+    ("tmp_guild_id", "string"), ("tmp_stat_attack", "number"), ("tmp_stat_defense", "number"),
+    ("tmp_stat_critical_rate", "number"), ("tmp_active_buff_list", "list"),
+]
+
+_USER_PROPERTY_POOL = [
+    ("account_id", "string", "user_set_once"), ("first_seen_time", "time", "user_set_once"),
+    ("acquisition_channel", "string", "user_set_once"), ("nick_name", "string", "user_set"),
+    ("last_login_time", "time", "user_set"), ("last_purchase_time", "time", "user_set"),
+    ("total_purchase_count", "number", "user_add"), ("total_purchase_amount", "number", "user_add"),
+    ("total_stage_clear_count", "number", "user_add"), ("total_quest_completed_count", "number", "user_add"),
+    ("total_playtime_minutes", "number", "user_add"), ("current_player_level", "number", "user_set"),
+    ("current_gold_balance", "number", "user_set"), ("max_consecutive_login_days", "number", "user_set"),
+    ("is_test_account", "boolean", "user_set_once"), ("push_notification_opt_in", "boolean", "user_set"),
+    ("recent_login_timestamps", "list", "user_append"),
+]
+
+# 이벤트 이름 구성 요소 (세션/온보딩/진행/전환 이벤트가 고루 섞이도록)
+_FIXED_EVENTS = [
+    "te_app_install", "te_app_start", "te_app_end", "te_register", "te_login", "te_logout",
+    "te_tutorial_step_completed", "te_purchase_attempt", "te_purchase_succeeded", "te_shop_entered",
+]
+_EVENT_VERBS = ["clear", "start", "completed", "claimed", "upgrade", "summon", "enter", "exit", "share", "view"]
+_EVENT_NOUNS = ["stage", "quest", "combat", "gacha", "reward", "unit", "mission", "event", "guild", "raid", "pvp", "shop"]
+
+
+def build_taxonomy_rows(
+    event_count: int = 40,
+    props_per_event: int = 6,
+    seed: int = 0,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    시트별 행 목록 생성 (같은 seed면 항상 같은 택소노미)
+
+    Args:
+        event_count: 이벤트 수 (최소 고정 이벤트 수만큼)
+        props_per_event: 이벤트당 고유 속성 수
+        seed: 택소노미 구성 난수 시드
+    """
+    rng = random.Random(seed)
+
+    event_names = list(_FIXED_EVENTS)
+    candidates = [f"te_{noun}_{verb}" for noun in _EVENT_NOUNS for verb in _EVENT_VERBS]
+    rng.shuffle(candidates)
+    for name in candidates:
+        if len(event_names) >= event_count:
+            break
+        event_names.append(name)
+
+    event_rows = []
+    for event_name in event_names:
+        properties = rng.sample(_EVENT_PROPERTY_POOL, min(props_per_event, len(_EVENT_PROPERTY_POOL)))
+        for i, (prop_name, prop_type) in enumerate(properties):
+            event_rows.append({
+                "이벤트 이름 (필수)": event_name if i == 0 else None,
+                "이벤트 별칭": event_name.replace("te_", "").replace("_", " ") if i == 0 else None,
+                "이벤트 설명": f"synthetic event {event_name}" if i == 0 else None,
+                "이벤트 태그": None,
+                "속성 이름 (필수)": prop_name,
+                "속성 별칭": prop_name.replace("_", " "),
+                "속성 유형 (필수)": prop_type,
+                "속성 설명": f"synthetic property {prop_name}",
+            })
+
+    common_rows = [
+        {"속성 이름 (필수)": name, "속성 별칭": name.replace("_", " "), "속성 유형 (필수)": prop_type, "속성 설명": None}
+        for name, prop_type in _COMMON_PROPERTY_POOL
+    ]
+    user_rows = [
+        {
+            "속성 이름 (필수)": name,
+            "속성 별칭": name.replace("_", " "),
+            "속성 유형 (필수)": prop_type,
+            "업데이트 방식": update_method,
+            "속성 설명": None,
+            "속성 태그": None,
+        }
+        for name, prop_type, update_method in _USER_PROPERTY_POOL
+    ]
+    id_rows = [
+        {"게임 유형": "단일 계정 단일 프로필", "속성 이름": "#account_id", "속성 별칭": "account", "속성 설명": None, "값 설명": None},
+        {"게임 유형": "단일 계정 단일 프로필", "속성 이름": "#distinct_id", "속성 별칭": "device", "속성 설명": None, "값 설명": None},
+    ]
+
+    return {
+        "#유저 ID 체계": id_rows,
+        "#이벤트 데이터": event_rows,
+        "#공통 이벤트 속성": common_rows,
+        "#유저 데이터": user_rows,
+    }
+
+
+def write_synthetic_taxonomy(
+    path: Path,
+    event_count: int = 40,
+    props_per_event: int = 6,
+    seed: int = 0,
+) -> Path:
+    """합성 택소노미를 엑셀 파일로 저장 (TaxonomyReader가 그대로 읽을 수 있는 형식)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sheets = build_taxonomy_rows(event_count, props_per_event, seed)
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet_name, rows in sheets.items():
+            pd.DataFrame(rows).to_excel(writer, sheet_name=sheet_name, index=False)
+    return path
@@ -0,0 +1,122 @@
+"""
+Asyncio adapter for AI clients.
+블로킹 AI 클라이언트 호출을 스레드에서 동시에 실행 (rate limiter는 각 호출 안에서 그대로 적용)
+"""
+import asyncio
+from typing import Dict, Any, List, Callable, Optional, Sequence
+
+from .base_client import BaseAIClient
+
+
+class AsyncAIClient:
+    """
+    BaseAIClient의 asyncio 버전
+
+    Anthropic/OpenAI SDK 호출은 블로킹이므로 asyncio.to_thread로 실행하고,
+    동시 실행 수는 세마포어로 제한한다. 분당 요청 수 제한은 클라이언트의 RateLimiter가 담당.
+    """
+
+    def __init__(self, client: BaseAIClient, max_concurrency: int = 4):
+        """
+        Args:
+            client: 동기 AI 클라이언트
+            max_concurrency: 동시에 진행할 최대 호출 수
+        """
+        self.client = client
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """블로킹 함수 1개를 스레드에서 실행 (동시 실행 수 제한)"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            # 세마포어는 이벤트 루프에 묶이므로 asyncio.run마다 새로 생성
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        async with self._semaphore:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def gather(self, calls: Sequence[Callable[[], Any]]) -> List[Any]:
+        """인자 없는 호출들을 동시에 실행하고 결과를 순서대로 반환 (첫 예외는 그대로 전파)"""
+        return list(await asyncio.gather(*(self.run(call) for call in calls)))
+
+    async def generate_behavior_pattern(
+        self,
+        product_info: Dict[str, Any],
+        scenario: str,
+        event_taxonomy: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """BaseAIClient.generate_behavior_pattern의 비동기 버전"""
+        return await self.run(
+            self.client.generate_behavior_pattern,
+            product_info=product_info,
+            scenario=scenario,
+            event_taxonomy=event_taxonomy,
+        )
+
+    async def generate_custom_behavior_pattern(
+        self,
+        product_info: Dict[str, Any],
+        custom_scenario_description: str,
+        event_taxonomy: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """BaseAIClient.generate_custom_behavior_pattern의 비동기 버전"""
+        return await self.run(
+            self.client.generate_custom_behavior_pattern,
+            product_info=product_info,
+            custom_scenario_description=custom_scenario_description,
+            event_taxonomy=event_taxonomy,
+        )
+
+    async def generate_event_properties(
+        self,
+        event_name: str,
+        event_schema: Dict[str, Any],
+        user_context: Dict[str, Any],
+        product_info: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """BaseAIClient.generate_event_properties의 비동기 버전"""
+        return await self.run(
+            self.client.generate_event_properties,
+            event_name=event_name,
+            event_schema=event_schema,
+            user_context=user_context,
+            product_info=product_info,
+        )
+
+    async def generate_user_properties(
+        self,
+        user_segment: str,
+        product_info: Dict[str, Any],
+        user_schema: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """BaseAIClient.generate_user_properties의 비동기 버전"""
+        return await self.run(
+            self.client.generate_user_properties,
+            user_segment=user_segment,
+            product_info=product_info,
+            user_schema=user_schema,
+        )
+
+    async def analyze_property_relationships(
+        self,
+        taxonomy_properties: List[Dict[str, Any]],
+        product_info: Dict[str, Any],
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """BaseAIClient.analyze_property_relationships의 비동기 버전 (event_names 등 추가 인자 전달)"""
+        return await self.run(
+            self.client.analyze_property_relationships,
+            taxonomy_properties=taxonomy_properties,
+            product_info=product_info,
+            **kwargs,
+        )
+
+    async def analyze_update_patterns(
+        self,
+        prompt: str,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """BaseAIClient.analyze_update_patterns의 비동기 버전 (taxonomy, product_info 전달)"""
+        return await self.run(self.client.analyze_update_patterns, prompt, **kwargs)
@@ -1,13 +1,111 @@
 """
 Base AI client interface.
 """
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
+
+from ..models.taxonomy import EventTaxonomy
+from ..utils.cache_manager import AIResponseCache
+from ..utils.rate_limiter import RateLimiter, jittered_backoff
 
 
 class BaseAIClient(ABC):
     """Abstract base class for AI clients"""
 
+    provider: str = "unknown"  # 응답 캐시 키에 포함되는 provider 이름
+    model: Optional[str] = None
+    response_cache: Optional[AIResponseCache] = None  # 설정하면 모든 _call_api 응답을 캐싱
+    rate_limiter: Optional[RateLimiter] = None  # provider별 공용 요청/토큰 예산
+    rate_limit_errors: tuple = ()  # 429(rate limit)로 간주할 SDK 예외 타입
+    expected_output_tokens: int = 1024  # 토큰 예산 예약 시 응답 토큰 예상치
+    max_rate_limit_retries: int = 5
+
+    def _call_api(self, system_prompt: str, user_prompt: str, max_retries: int = 3) -> Dict[str, Any]:
+        """
+        AI 호출 (응답 캐시 적용)
+
+        response_cache가 있으면 (provider, model, 프롬프트) 해시로 먼저 조회하고,
+        없을 때만 _request_api로 실제 호출한 뒤 저장한다.
+        """
+        cache = self.response_cache
+        if cache is None:
+            return self._request_api(system_prompt, user_prompt, max_retries)
+
+        key = cache.key_for(self.provider, self.model, system_prompt, user_prompt)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self._request_api(system_prompt, user_prompt, max_retries)
+        cache.put(key, response, {"provider": self.provider, "model": self.model})
+        return response
+
+    def _send_rate_limited(self, send: Callable[[], Any], system_prompt: str, user_prompt: str) -> Any:
+        """
+        SDK 호출 1건을 rate limit 예산 안에서 실행
+
+        요청 전 예상 토큰(프롬프트 길이/4 + 응답 예상치)으로 슬롯을 예약하고,
+        429 응답이면 지터가 섞인 지수 백오프로 provider 전체를 잠시 멈춘 뒤 재시도한다.
+        응답의 실제 토큰 사용량으로 토큰 예산을 보정.
+        """
+        estimated_tokens = (len(system_prompt) + len(user_prompt)) // 4 + self.expected_output_tokens
+        limiter = self.rate_limiter
+
+        for attempt in range(self.max_rate_limit_retries + 1):
+            if limiter:
+                limiter.acquire(self.provider, estimated_tokens)
+            try:
+                response = send()
+            except self.rate_limit_errors as e:
+                if attempt >= self.max_rate_limit_retries:
+                    raise
+                retry_after = self._retry_after(e)
+                if limiter:
+                    delay = limiter.backoff(self.provider, attempt, retry_after)
+                else:
+                    delay = jittered_backoff(attempt, retry_after)
+                    time.sleep(delay)
+                print(f"  ⚠️  Rate limit 응답(429), {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_rate_limit_retries})")
+                continue
+
+            if limiter:
+                actual_tokens = self._response_tokens(response)
+                if actual_tokens is not None:
+                    limiter.record_usage(self.provider, estimated_tokens, actual_tokens)
+            return response
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """SDK 예외의 HTTP 응답에서 Retry-After(초) 추출"""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+
+    def _response_tokens(self, response: Any) -> Optional[int]:
+        """SDK 응답의 실제 토큰 사용량 (알 수 없으면 None)"""
+        return None
+
+    @abstractmethod
+    def _request_api(self, system_prompt: str, user_prompt: str, max_retries: int = 3) -> Dict[str, Any]:
+        """
+        실제 API 호출 후 JSON 응답 파싱 (각 클라이언트가 구현)
+
+        Args:
+            system_prompt: System instruction
+            user_prompt: User query
+            max_retries: Maximum number of retry attempts for JSON parsing failures
+
+        Returns:
+            Parsed JSON response
+        """
+        pass
+
     @abstractmethod
     def generate_behavior_pattern(
         self,
@@ -115,3 +213,27 @@ class BaseAIClient(ABC):
             - generation_strategy: How to generate each property (ai-contextual, rule-based, random-simple)
         """
         pass
+
+    def analyze_update_patterns(
+        self,
+        prompt: str,
+        taxonomy: Optional[EventTaxonomy] = None,
+        product_info: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Analyze how user properties should be updated when each event occurs.
+
+        Args:
+            prompt: Analysis prompt built by PropertyUpdateEngine (events, user properties, product context)
+            taxonomy: Event taxonomy (used by clients that analyze the taxonomy directly)
+            product_info: Product/app information
+
+        Returns:
+            Dictionary mapping event names to update rules
+            (event_type, updates{increment, add_from_event, set, formula}, probability, description)
+        """
+        system_prompt = """You are an expert in data modeling and event-driven user property updates.
+Analyze event taxonomy and determine how user properties should be updated when specific events occur.
+Return your response as a JSON object only, without any markdown formatting."""
+
+        return self._call_api(system_prompt, prompt)
@@ -4,16 +4,29 @@ Claude (Anthropic) client for AI-powered data generation.
 import os
 import json
 from typing import Dict, Any, Optional, List
-from anthropic import Anthropic
+from anthropic import Anthropic, RateLimitError
 
 from .base_client import BaseAIClient
-from ..utils.rate_limiter import RateLimiter
+from ..utils.rate_limiter import get_shared_rate_limiter
+from ..utils.cache_manager import AIResponseCache
 
 
 class ClaudeClient(BaseAIClient):
     """Claude (Anthropic) implementation of AI client"""
 
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, enable_rate_limit: bool = True):
+    provider = "anthropic"
+    rate_limit_errors = (RateLimitError,)
+    expected_output_tokens = 4096  # max_tokens만큼 출력 토큰 예산을 예약
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        enable_rate_limit: bool = True,
+        response_cache: Optional[AIResponseCache] = None,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ):
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("Anthropic API key not provided and ANTHROPIC_API_KEY env var not set")
@@ -21,10 +34,17 @@ class ClaudeClient(BaseAIClient):
         self.client = Anthropic(api_key=self.api_key)
         self.model = model or "claude-sonnet-4-20250514"
 
-        # Rate limiter 초기화
-        self.rate_limiter = RateLimiter(max_requests=10, window_seconds=60) if enable_rate_limit else None
+        # Rate limiter (같은 provider의 모든 클라이언트/스레드가 요청·토큰 예산 공유)
+        self.rate_limiter = get_shared_rate_limiter(
+            'anthropic',
+            max_requests=requests_per_minute,
+            max_tokens=tokens_per_minute,
+        ) if enable_rate_limit else None
+
+        # AI 응답 캐시 (같은 프롬프트는 네트워크 호출 없이 재사용)
+        self.response_cache = response_cache
 
-    def _call_api(self, system_prompt: str, user_prompt: str, max_retries: int = 3) -> Dict[str, Any]:
+    def _request_api(self, system_prompt: str, user_prompt: str, max_retries: int = 3) -> Dict[str, Any]:
         """
         Call Claude API and parse JSON response with retry logic
 
@@ -42,24 +62,24 @@ class ClaudeClient(BaseAIClient):
         last_error = None
 
         for attempt in range(max_retries):
-            # Rate limit 체크
-            if self.rate_limiter:
-                self.rate_limiter.wait_if_needed('anthropic')
-
             # 재시도 시 JSON 출력 강조
             current_user_prompt = user_prompt
             if attempt > 0:
                 current_user_prompt += "\n\n**CRITICAL: Your previous response had invalid JSON. Return ONLY valid JSON without any markdown formatting, explanations, or text outside the JSON object.**"
 
             try:
-                message = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=4096,
-                    system=system_prompt,
-                    messages=[
-                        {"role": "user", "content": current_user_prompt}
-                    ],
-                    temperature=0.7,
+                message = self._send_rate_limited(
+                    lambda: self.client.messages.create(
+                        model=self.model,
+                        max_tokens=4096,
+                        system=system_prompt,
+                        messages=[
+                            {"role": "user", "content": current_user_prompt}
+                        ],
+                        temperature=0.7,
+                    ),
+                    system_prompt,
+                    current_user_prompt,
                 )
 
                 content = message.content[0].text
@@ -84,6 +104,12 @@ class ClaudeClient(BaseAIClient):
         # Should never reach here, but just in case
         raise last_error if last_error else json.JSONDecodeError("Unknown error", "", 0)
 
+    def _response_tokens(self, message) -> Optional[int]:
+        usage = getattr(message, "usage", None)
+        if usage is None:
+            return None
+        return usage.input_tokens + usage.output_tokens
+
     def generate_behavior_pattern(
         self,
         product_info: Dict[str, Any],
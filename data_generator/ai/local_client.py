@@ -0,0 +1,602 @@
+"""
+Local rule-based AI stand-in client.
+네트워크/API 키 없이 택소노미와 속성명 휴리스틱으로 AI 분석 결과를 합성하거나,
+실제 AI 실행에서 기록한 응답을 파일에서 재생 (성능 측정, 오프라인 대량 생성용)
+"""
+import json
+import re
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from .base_client import BaseAIClient
+from ..models.taxonomy import EventTaxonomy
+from ..patterns.scenarios import ScenarioPattern
+
+
+# 세그먼트별 수치 범위 위치 (0.0 = 최소값, 1.0 = 최대값)와 세그먼트에 대응하는 시나리오
+_SEGMENT_PROFILES = {
+    "NEW_USER": {"scale": 0.05, "scenario": "new_user_onboarding", "engagement": 0.3, "conversion": 0.03},
+    "ACTIVE_USER": {"scale": 0.3, "scenario": "normal", "engagement": 0.5, "conversion": 0.08},
+    "POWER_USER": {"scale": 0.8, "scenario": "power_user", "engagement": 0.8, "conversion": 0.2},
+    "CHURNING_USER": {"scale": 0.25, "scenario": "churning_user", "engagement": 0.2, "conversion": 0.02},
+    "CHURNED_USER": {"scale": 0.15, "scenario": "churned_user", "engagement": 0.05, "conversion": 0.001},
+    "RETURNING_USER": {"scale": 0.35, "scenario": "returning_user", "engagement": 0.45, "conversion": 0.1},
+}
+
+# 숫자 속성 이름 키워드 → (min, max, typical). 위에서부터 처음 매칭된 규칙 사용
+_NUMERIC_RANGE_RULES: List[Tuple[Tuple[str, ...], Tuple[int, int, int]]] = [
+    (("rate", "ratio", "percent", "probability"), (0, 100, 10)),
+    (("seconds", "duration", "sec"), (1, 3600, 300)),
+    (("minutes", "playtime", "online"), (1, 600, 60)),
+    (("days", "day"), (0, 365, 14)),
+    (("price", "amount", "revenue", "spent", "usd", "payment"), (0, 100, 10)),
+    (("gold", "coin", "currency", "balance", "gem", "crystal", "diamond", "cash"), (0, 100000, 5000)),
+    (("xp", "exp", "experience"), (0, 100000, 5000)),
+    (("level", "lv", "tier", "grade"), (1, 100, 20)),
+    (("power", "attack", "defense", "hp", "stat", "damage"), (100, 50000, 5000)),
+    (("point", "score"), (0, 10000, 500)),
+    (("count", "quantity", "num", "times", "total"), (0, 100, 10)),
+    (("speed",), (1, 10, 3)),
+    (("stamina", "energy"), (0, 100, 50)),
+]
+_DEFAULT_NUMERIC_RANGE = (0, 1000, 100)
+
+# 문자열 속성 이름 키워드 → 예시 값 (없으면 IntelligentPropertyGenerator의 Faker 폴백)
+_STRING_EXAMPLES = [
+    (("channel",), ["organic", "google_play", "app_store", "facebook_ads", "google_ads", "tiktok_ads"]),
+    (("server",), ["kr-1", "kr-2", "asia-1", "global-1"]),
+    (("currency_local", "currency_code"), ["KRW", "USD", "JPY", "EUR"]),
+    (("transaction_type",), ["earn", "spend"]),
+    (("source_or_sink",), ["source", "sink"]),
+    (("platform",), ["android", "ios"]),
+    (("gender",), ["male", "female", "unknown"]),
+]
+
+# 불리언 속성 이름 접두어/키워드 → True 확률
+_BOOLEAN_PROBABILITIES = [
+    ("is_test", 0.02),
+    ("is_first", 0.1),
+    ("is_new", 0.2),
+    ("has_", 0.2),
+    ("opt_in", 0.6),
+]
+
+# 이벤트 분류 키워드
+_ONBOARDING_KEYWORDS = ("install", "instell", "new_device", "register", "signup", "sign_up", "tutorial", "intro", "onboard", "guide")
+_SESSION_KEYWORDS = ("app_start", "app_end", "app_open", "login", "logout", "session")
+_CONVERSION_KEYWORDS = ("purchase", "iap", "pay", "subscribe", "checkout", "order")
+_FAILURE_KEYWORDS = ("fail", "error", "crash", "cancel", "attempt")
+
+# 속성명 토큰 중 이벤트 매칭에 쓰지 않는 일반 단어
+_STOPWORDS = {"te", "total", "count", "num", "current", "last", "time", "timestamp", "lifetime", "max", "min",
+              "is", "has", "first", "the", "of", "in", "info", "id", "tmp", "amount", "spent", "earned"}
+_VALUE_TOKENS = ("amount", "spent", "revenue", "earned", "value", "sum")
+# 이벤트마다 +1 하는 카운터형 속성 토큰 (rate, balance 같은 값은 증가시키지 않음)
+_COUNTER_TOKENS = ("total", "count", "num", "times", "level", "lv", "watched", "owned", "played")
+
+
+def _tokens(name: str) -> List[str]:
+    """snake_case 이름을 토큰으로 분리 (복수형 s 제거)"""
+    tokens = []
+    for token in re.split(r"[^a-z0-9]+", name.lower()):
+        if len(token) > 3 and token.endswith("s"):
+            token = token[:-1]
+        if token:
+            tokens.append(token)
+    return tokens
+
+
+def _keywords_overlap(prop_tokens: List[str], event_tokens: List[str]) -> bool:
+    """속성명과 이벤트명이 의미 있는 토큰을 공유하는지 (levelup ⊃ level 같은 포함 관계 허용)"""
+    for p in prop_tokens:
+        if p in _STOPWORDS or len(p) < 2:
+            continue
+        for e in event_tokens:
+            if e in _STOPWORDS:
+                continue
+            if p == e or (len(p) >= 4 and p in e) or (len(e) >= 4 and e in p):
+                return True
+    return False
+
+
+def _matches(name: str, keywords) -> bool:
+    lower = name.lower()
+    return any(keyword in lower for keyword in keywords)
+
+
+class LocalRuleClient(BaseAIClient):
+    """
+    로컬 규칙 기반 AI 클라이언트 (네트워크 호출 없음, 결정적)
+
+    - 합성 모드: 택소노미의 속성/이벤트 이름과 ScenarioPattern 기본값으로
+      segment_analysis, value_ranges, generation_strategy, 행동 패턴, 업데이트 규칙을 생성
+    - 재생 모드: replay_file에 기록된 실제 AI 응답이 있으면 그대로 반환 (record_ai_responses로 기록)
+    """
+
+    provider = "local"
+
+    def __init__(
+        self,
+        taxonomy: Optional[EventTaxonomy] = None,
+        replay_file: Optional[str] = None,
+        model: Optional[str] = None,
+    ):
+        """
+        Args:
+            taxonomy: 업데이트 규칙 합성에 사용할 택소노미 (analyze_update_patterns에서 전달되면 생략 가능)
+            replay_file: record_ai_responses로 기록한 JSON 파일 경로
+            model: 캐시 키에 쓰이는 모델 이름
+        """
+        self.taxonomy = taxonomy
+        self.model = model or "local-rules-v1"
+        self.replay_file = replay_file
+        self.recorded: Dict[str, Any] = {}
+        if replay_file:
+            with open(replay_file, 'r', encoding='utf-8') as f:
+                self.recorded = json.load(f)
+            print(f"  ✓ 기록된 AI 응답 재생: {replay_file}")
+
+    def _request_api(self, system_prompt: str, user_prompt: str, max_retries: int = 3) -> Dict[str, Any]:
+        """
+        자유 형식 프롬프트는 해석할 수 없으므로 호출 자체를 거부
+
+        분석 메서드들은 모두 오버라이드되어 프롬프트 없이 직접 합성(또는 replay_file 재생)하므로,
+        여기까지 왔다면 새 BaseAIClient 메서드에 대응하는 규칙 기반 구현이 빠진 것이다.
+        """
+        raise NotImplementedError(
+            "LocalRuleClient cannot answer free-form prompts; "
+            "override the calling BaseAIClient method with a rule-based implementation"
+        )
+
+    def _replayed(self, section: str, key: Optional[str] = None) -> Optional[Any]:
+        """기록된 응답 조회 (없으면 None → 규칙 기반 합성)"""
+        recorded = self.recorded.get(section)
+        if recorded is None:
+            return None
+        if key is None:
+            return recorded
+        return recorded.get(key) if isinstance(recorded, dict) else None
+
+    # ------------------------------------------------------------------
+    # 행동 패턴
+    # ------------------------------------------------------------------
+
+    def generate_behavior_pattern(
+        self,
+        product_info: Dict[str, Any],
+        scenario: str,
+        event_taxonomy: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """시나리오 기본 특성(ScenarioPattern) + 이벤트 우선순위"""
+        replayed = self._replayed("behavior_patterns", scenario)
+        if replayed is not None:
+            return replayed
+
+        pattern = dict(ScenarioPattern.get_scenario_characteristics(scenario))
+        pattern["event_priorities"] = ScenarioPattern.get_event_priority_for_scenario(scenario)
+        return pattern
+
+    def generate_custom_behavior_pattern(
+        self,
+        product_info: Dict[str, Any],
+        custom_scenario_description: str,
+        event_taxonomy: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """시나리오 설명의 키워드로 기본 시나리오를 고른 뒤 시간대/강도를 조정"""
+        replayed = self._replayed("custom_behavior_patterns", custom_scenario_description)
+        if replayed is not None:
+            return replayed
+
+        text = custom_scenario_description.lower()
+        if _matches(text, ("이탈", "churn", "leave", "quit", "drop")):
+            scenario = "churning_user"
+        elif _matches(text, ("파워", "헤비", "heavy", "power", "whale", "hardcore")):
+            scenario = "power_user"
+        elif _matches(text, ("신규", "튜토리얼", "new", "onboard", "tutorial", "d1")):
+            scenario = "new_user_onboarding"
+        elif _matches(text, ("복귀", "return", "comeback")):
+            scenario = "returning_user"
+        elif _matches(text, ("구매", "결제", "purchase", "buy", "pay", "convert")):
+            scenario = "converting_user"
+        else:
+            scenario = "normal"
+
+        pattern = self.generate_behavior_pattern(product_info, scenario, event_taxonomy)
+        pattern = dict(pattern)
+
+        if _matches(text, ("주말", "weekend")):
+            pattern["activity_probability"] = round(pattern["activity_probability"] * 2 / 7, 3)
+        for keywords, time_pattern in (
+            (("아침", "morning", "출근"), "morning"),
+            (("점심", "오후", "afternoon", "lunch"), "afternoon"),
+            (("저녁", "evening", "퇴근"), "evening"),
+            (("새벽", "밤", "night", "late"), "night"),
+        ):
+            if _matches(text, keywords):
+                pattern["time_pattern"] = time_pattern
+                break
+
+        if _matches(text, ("긴", "오래", "long")):
+            low, high = pattern["session_duration_range"]
+            pattern["session_duration_range"] = (low * 2, high * 2)
+        elif _matches(text, ("짧", "short", "quick")):
+            low, high = pattern["session_duration_range"]
+            pattern["session_duration_range"] = (max(1, low // 2), max(2, high // 2))
+
+        low, high = pattern["daily_session_range"]
+        pattern["daily_session_count"] = (low + high) / 2
+        low, high = pattern["session_duration_range"]
+        pattern["session_duration_minutes"] = (low + high) / 2
+        return pattern
+
+    # ------------------------------------------------------------------
+    # 속성 값 생성 (규칙 기반 클라이언트는 IntelligentPropertyGenerator 폴백에 맡김)
+    # ------------------------------------------------------------------
+
+    def generate_event_properties(
+        self,
+        event_name: str,
+        event_schema: Dict[str, Any],
+        user_context: Dict[str, Any],
+        product_info: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        return {}
+
+    def generate_user_properties(
+        self,
+        user_segment: str,
+        product_info: Dict[str, Any],
+        user_schema: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        return {}
+
+    # ------------------------------------------------------------------
+    # 택소노미 분석
+    # ------------------------------------------------------------------
+
+    def analyze_property_relationships(
+        self,
+        taxonomy_properties: List[Dict[str, Any]],
+        product_info: Dict[str, Any],
+        event_names: List[str] = None,
+    ) -> Dict[str, Any]:
+        """속성명/이벤트명 휴리스틱으로 AI 분석 결과와 같은 구조를 합성"""
+        replayed = self._replayed("property_relationships")
+        if replayed is not None:
+            return replayed
+
+        if event_names is None:
+            event_names = self.taxonomy.get_all_event_names() if self.taxonomy else []
+
+        value_ranges: Dict[str, Any] = {}
+        generation_strategy: Dict[str, str] = {}
+        numeric_ranges: Dict[str, Tuple[int, int, int]] = {}
+        property_names = set()
+
+        for prop in taxonomy_properties:
+            name = prop.get("name")
+            prop_type = prop.get("property_type", "string")
+            if not name or name in property_names:
+                continue
+            property_names.add(name)
+
+            if prop_type == "number":
+                low, high, typical = self._numeric_range(name)
+                numeric_ranges[name] = (low, high, typical)
+                value_ranges[name] = {"min": low, "max": high, "typical": typical}
+                generation_strategy[name] = "rule-based"
+            elif prop_type == "boolean":
+                value_ranges[name] = {"typical": self._boolean_probability(name)}
+                generation_strategy[name] = "rule-based"
+            elif prop_type in ("string", "list"):
+                examples = self._string_examples(name)
+                if examples:
+                    value_ranges[name] = {"example_values": examples}
+                generation_strategy[name] = "random-simple"
+            else:
+                generation_strategy[name] = "random-simple"
+
+        # max_X는 current_X(또는 X)에 의존
+        property_relationships = {}
+        for name in numeric_ranges:
+            if name.startswith("max_"):
+                base = name[len("max_"):]
+                for candidate in ("current_" + base, base):
+                    if candidate in numeric_ranges:
+                        property_relationships[name] = {
+                            "depends_on": [candidate],
+                            "relationship": f"{name} >= {candidate}",
+                        }
+                        break
+
+        event_structure = self._event_structure(event_names)
+        segment_analysis = {
+            segment: self._segment_analysis(segment, profile, event_names, event_structure, numeric_ranges)
+            for segment, profile in _SEGMENT_PROFILES.items()
+        }
+
+        return {
+            "event_structure": event_structure,
+            "value_ranges": value_ranges,
+            "property_relationships": property_relationships,
+            "segment_analysis": segment_analysis,
+            "generation_strategy": generation_strategy,
+        }
+
+    def analyze_update_patterns(
+        self,
+        prompt: str,
+        taxonomy: Optional[EventTaxonomy] = None,
+        product_info: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """이벤트명과 유저 속성명의 토큰이 겹치면 카운터 증가/금액 누적/시각 갱신 규칙 생성"""
+        replayed = self._replayed("update_patterns")
+        if replayed is not None:
+            return replayed
+
+        taxonomy = taxonomy or self.taxonomy
+        if taxonomy is None:
+            return {}
+
+        mappings: Dict[str, Any] = {}
+        for event in taxonomy.events:
+            event_name = event.event_name
+            if _matches(event_name, _FAILURE_KEYWORDS):
+                continue
+            event_tokens = _tokens(event_name)
+            numeric_event_props = [
+                p.name for p in (event.properties or [])
+                if p.property_type.value == "number" and "." not in p.name
+            ]
+
+            increment: List[str] = []
+            add_from_event: Dict[str, str] = {}
+            set_values: Dict[str, str] = {}
+
+            for prop in taxonomy.user_properties:
+                prop_tokens = _tokens(prop.name)
+                if not _keywords_overlap(prop_tokens, event_tokens):
+                    continue
+                prop_type = prop.property_type.value
+
+                if prop_type == "number":
+                    if any(token in _VALUE_TOKENS for token in prop_tokens):
+                        source = next(
+                            (p for p in numeric_event_props if _matches(p, ("price", "amount", "usd", "value", "quantity"))),
+                            None,
+                        )
+                        if source:
+                            add_from_event[prop.name] = source
+                    elif any(token in _COUNTER_TOKENS for token in prop_tokens):
+                        increment.append(prop.name)
+                elif prop_type == "time" and "first" not in prop_tokens:
+                    set_values[prop.name] = "current_time"
+
+            updates: Dict[str, Any] = {}
+            if increment:
+                updates["increment"] = increment
+            if add_from_event:
+                updates["add_from_event"] = add_from_event
+            if set_values:
+                updates["set"] = set_values
+            if not updates:
+                continue
+
+            mappings[event_name] = {
+                "event_type": self._event_type(event_name),
+                "updates": updates,
+                "probability": 1.0,
+                "description": "property name heuristic",
+            }
+
+        return mappings
+
+    # ------------------------------------------------------------------
+    # 휴리스틱 헬퍼
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _numeric_range(name: str) -> Tuple[int, int, int]:
+        tokens = _tokens(name)
+        for keywords, value_range in _NUMERIC_RANGE_RULES:
+            if any(token in keywords for token in tokens):
+                return value_range
+        return _DEFAULT_NUMERIC_RANGE
+
+    @staticmethod
+    def _boolean_probability(name: str) -> float:
+        lower = name.lower()
+        for keyword, probability in _BOOLEAN_PROBABILITIES:
+            if keyword in lower:
+                return probability
+        return 0.5
+
+    @staticmethod
+    def _string_examples(name: str) -> Optional[List[str]]:
+        lower = name.lower()
+        for keywords, examples in _STRING_EXAMPLES:
+            if any(keyword in lower for keyword in keywords):
+                return list(examples)
+        return None
+
+    @staticmethod
+    def _event_type(event_name: str) -> str:
+        if _matches(event_name, _CONVERSION_KEYWORDS):
+            return "conversion"
+        if _matches(event_name, ("register", "signup", "login", "logout", "new_device")):
+            return "identity"
+        if _matches(event_name, _SESSION_KEYWORDS):
+            return "session"
+        if _matches(event_name, ("friend", "guild", "chat", "share", "invite", "follow")):
+            return "social"
+        return "progression"
+
+    @staticmethod
+    def _event_structure(event_names: List[str]) -> Dict[str, Any]:
+        """순차 이벤트 그룹(숫자 접미사), 구매 퍼널, 신규 유저 여정 추정"""
+        # 1. 숫자 접미사만 다른 이벤트 묶음 (tutorial_step1, tutorial_step2, ...)
+        groups: Dict[str, List[Tuple[int, str]]] = {}
+        for name in event_names:
+            match = re.match(r"^(.*?)(\d+)$", name)
+            if match:
+                groups.setdefault(match.group(1).rstrip("_"), []).append((int(match.group(2)), name))
+        sequential_events = [
+            {
+                "group_name": prefix,
+                "events": [name for _, name in sorted(items)],
+                "description": "Numbered events occur in order",
+            }
+            for prefix, items in groups.items() if len(items) > 1
+        ]
+
+        # 2. 구매 퍼널 (단계별 키워드에 처음 매칭되는 이벤트)
+        funnel_steps = []
+        for keywords in (
+            ("view", "browse", "shop_entered", "enter"),
+            ("cart", "select", "attempt"),
+            ("checkout",),
+            ("purchase_succeeded", "purchase_complete", "purchased", "iap_transaction", "purchase"),
+        ):
+            step = next(
+                (name for name in event_names
+                 if name not in funnel_steps and _matches(name, keywords) and not _matches(name, ("fail", "cancel"))),
+                None,
+            )
+            if step:
+                funnel_steps.append(step)
+        funnels = []
+        if len(funnel_steps) >= 2:
+            funnels.append({
+                "funnel_name": "purchase_funnel",
+                "steps": funnel_steps,
+                "description": "Conversion funnel inferred from event names",
+            })
+
+        # 3. 신규 유저 여정 (택소노미 순서 유지)
+        journey = [
+            name for name in event_names
+            if _matches(name, _ONBOARDING_KEYWORDS) or _matches(name, ("app_start", "app_open", "login"))
+        ]
+
+        return {
+            "sequential_events": sequential_events,
+            "funnels": funnels,
+            "prerequisites": {},
+            "lifecycle_progression": {
+                "new_user_journey": journey,
+                "description": "Onboarding-related events in taxonomy order",
+            },
+        }
+
+    @staticmethod
+    def _segment_analysis(
+        segment: str,
+        profile: Dict[str, Any],
+        event_names: List[str],
+        event_structure: Dict[str, Any],
+        numeric_ranges: Dict[str, Tuple[int, int, int]],
+    ) -> Dict[str, Any]:
+        """세그먼트별 속성 범위/이벤트 순서/이벤트 확률"""
+        if segment == "CHURNED_USER":
+            event_sequence: List[str] = []
+            event_probabilities: Dict[str, float] = {}
+        else:
+            journey = event_structure["lifecycle_progression"]["new_user_journey"]
+            # 세션 흐름 순서: 시작 → 일반 활동 → 전환 → 종료 (시퀀스 앞부분부터 선택되므로)
+            session_starts, engagement, conversions, session_ends = [], [], [], []
+            for name in event_names:
+                if _matches(name, _ONBOARDING_KEYWORDS) or _matches(name, _FAILURE_KEYWORDS):
+                    continue
+                if _matches(name, ("end", "logout", "close")):
+                    session_ends.append(name)
+                elif _matches(name, _SESSION_KEYWORDS):
+                    session_starts.append(name)
+                elif _matches(name, _CONVERSION_KEYWORDS):
+                    conversions.append(name)
+                else:
+                    engagement.append(name)
+
+            if segment == "NEW_USER":
+                event_sequence = journey + engagement[:5] + session_ends
+            elif segment == "CHURNING_USER":
+                event_sequence = session_starts + engagement[:max(2, len(engagement) // 2)] + session_ends
+            else:
+                event_sequence = session_starts + engagement + conversions + session_ends
+
+            event_probabilities = {}
+            for name in event_names:
+                if _matches(name, _ONBOARDING_KEYWORDS):
+                    probability = 0.9 if segment == "NEW_USER" else 0.05
+                elif _matches(name, _SESSION_KEYWORDS):
+                    probability = 0.9
+                elif _matches(name, _FAILURE_KEYWORDS):
+                    probability = 0.02
+                elif _matches(name, _CONVERSION_KEYWORDS):
+                    probability = profile["conversion"]
+                else:
+                    probability = profile["engagement"]
+                event_probabilities[name] = probability
+            # 유저 생성 시 전환 확률로 사용 (UserGenerator._sample_segment_characteristics)
+            event_probabilities.setdefault("purchase", profile["conversion"])
+
+        scale = profile["scale"]
+        property_ranges: Dict[str, Any] = {}
+        for name, (low, high, _) in numeric_ranges.items():
+            span = high - low
+            range_min = int(low + span * scale * 0.5)
+            range_max = max(range_min + 1, int(low + span * min(1.0, scale * 1.5)))
+            property_ranges[name] = {"min": range_min, "max": range_max, "mean": (range_min + range_max) / 2}
+
+        # 세션 수/세션 길이는 대응하는 시나리오의 기본값 사용
+        characteristics = ScenarioPattern.get_scenario_characteristics(profile["scenario"])
+        session_low, session_high = characteristics["daily_session_range"]
+        duration_low, duration_high = characteristics["session_duration_range"]
+        property_ranges["daily_session_count"] = {"min": max(1, session_low), "max": max(1, session_high)}
+        property_ranges["session_duration_minutes"] = {
+            "min": duration_low, "max": duration_high, "mean": (duration_low + duration_high) / 2,
+        }
+
+        return {
+            "property_ranges": property_ranges,
+            "event_sequence": event_sequence,
+            "event_probabilities": event_probabilities,
+        }
+
+
+def record_ai_responses(
+    path: str,
+    intelligent_generator=None,
+    behavior_engine=None,
+    update_engine=None,
+):
+    """
+    실제 AI 분석 결과를 LocalRuleClient(replay_file=...)가 재생할 수 있는 JSON으로 저장
+
+    Args:
+        path: 저장할 파일 경로
+        intelligent_generator: analyze_properties()가 끝난 IntelligentPropertyGenerator
+        behavior_engine: 행동 패턴이 캐시된 BehaviorEngine
+        update_engine: analyze_event_update_patterns()가 끝난 PropertyUpdateEngine
+    """
+    recording: Dict[str, Any] = {}
+    if intelligent_generator is not None and intelligent_generator.property_rules is not None:
+        recording["property_relationships"] = intelligent_generator.property_rules
+    if behavior_engine is not None:
+        behavior_patterns = {}
+        custom_behavior_patterns = {}
+        for scenario, pattern in behavior_engine.behavior_cache.items():
+            description = behavior_engine.custom_scenarios.get(scenario)
+            if scenario.startswith("custom_") and description:
+                custom_behavior_patterns[description] = pattern
+            else:
+                behavior_patterns[scenario] = pattern
+        recording["behavior_patterns"] = behavior_patterns
+        recording["custom_behavior_patterns"] = custom_behavior_patterns
+    if update_engine is not None and update_engine.update_mappings is not None:
+        recording["update_patterns"] = update_engine.update_mappings
+
+    output = Path(path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(recording, f, indent=2, ensure_ascii=False, default=list)
+    print(f"  ✓ AI 응답 기록 저장: {output}")
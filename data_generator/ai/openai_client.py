@@ -4,16 +4,28 @@ OpenAI client for AI-powered data generation.
 import os
 import json
 from typing import Dict, Any, Optional, List
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
 
 from .base_client import BaseAIClient
-from ..utils.rate_limiter import RateLimiter
+from ..utils.rate_limiter import get_shared_rate_limiter
+from ..utils.cache_manager import AIResponseCache
 
 
 class OpenAIClient(BaseAIClient):
     """OpenAI implementation of AI client"""
 
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, enable_rate_limit: bool = True):
+    provider = "openai"
+    rate_limit_errors = (RateLimitError,)
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        enable_rate_limit: bool = True,
+        response_cache: Optional[AIResponseCache] = None,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key not provided and OPENAI_API_KEY env var not set")
@@ -21,10 +33,17 @@ class OpenAIClient(BaseAIClient):
         self.client = OpenAI(api_key=self.api_key)
         self.model = model or "gpt-4o-mini"
 
-        # Rate limiter 초기화
-        self.rate_limiter = RateLimiter(max_requests=10, window_seconds=60) if enable_rate_limit else None
+        # Rate limiter (같은 provider의 모든 클라이언트/스레드가 요청·토큰 예산 공유)
+        self.rate_limiter = get_shared_rate_limiter(
+            'openai',
+            max_requests=requests_per_minute,
+            max_tokens=tokens_per_minute,
+        ) if enable_rate_limit else None
+
+        # AI 응답 캐시 (같은 프롬프트는 네트워크 호출 없이 재사용)
+        self.response_cache = response_cache
 
-    def _call_api(self, system_prompt: str, user_prompt: str, max_retries: int = 3) -> Dict[str, Any]:
+    def _request_api(self, system_prompt: str, user_prompt: str, max_retries: int = 3) -> Dict[str, Any]:
         """
         Call OpenAI API and parse JSON response with retry logic
 
@@ -42,24 +61,24 @@ class OpenAIClient(BaseAIClient):
         last_error = None
 
         for attempt in range(max_retries):
-            # Rate limit 체크
-            if self.rate_limiter:
-                self.rate_limiter.wait_if_needed('openai')
-
             # 재시도 시 JSON 출력 강조
             current_user_prompt = user_prompt
             if attempt > 0:
                 current_user_prompt += "\n\n**CRITICAL: Your previous response had invalid JSON. Return ONLY valid JSON without any markdown formatting, explanations, or text outside the JSON object.**"
 
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": current_user_prompt}
-                    ],
-                    response_format={"type": "json_object"},
-                    temperature=0.7,
+                response = self._send_rate_limited(
+                    lambda: self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": current_user_prompt}
+                        ],
+                        response_format={"type": "json_object"},
+                        temperature=0.7,
+                    ),
+                    system_prompt,
+                    current_user_prompt,
                 )
 
                 content = response.choices[0].message.content
@@ -76,6 +95,10 @@ class OpenAIClient(BaseAIClient):
         # Should never reach here, but just in case
         raise last_error if last_error else json.JSONDecodeError("Unknown error", "", 0)
 
+    def _response_tokens(self, response) -> Optional[int]:
+        usage = getattr(response, "usage", None)
+        return getattr(usage, "total_tokens", None)
+
     def generate_behavior_pattern(
         self,
         product_info: Dict[str, Any],
@@ -92,9 +92,17 @@ class DataGeneratorConfig(BaseModel):
     )
 
     # AI Configuration
-    ai_provider: str = Field(default="openai", description="AI provider (openai or anthropic)")
+    ai_provider: str = Field(default="openai", description="AI provider (openai, anthropic or local)")
     ai_model: Optional[str] = Field(None, description="AI model name (if None, use default)")
     ai_api_key: Optional[str] = Field(None, description="AI API key (if None, read from env)")
+    ai_concurrency: int = Field(default=4, ge=1, description="AI 분석 프리페치 시 동시에 진행할 최대 호출 수")
+    ai_requests_per_minute: Optional[int] = Field(None, gt=0, description="provider별 분당 최대 요청 수 (None이면 기본값)")
+    ai_tokens_per_minute: Optional[int] = Field(None, gt=0, description="provider별 분당 최대 토큰 수 (None이면 기본값)")
+    refresh_ai: bool = Field(default=False, description="True면 AI 캐시를 무시하고 새로 분석 (결과로 캐시 갱신)")
+    ai_cache_ttl_hours: float = Field(default=24 * 30, gt=0, description="AI 응답 캐시 유효 시간 (시간)")
+    ai_cache_max_mb: float = Field(default=200, gt=0, description="AI 응답 캐시 최대 크기 (MB, 초과 시 오래 사용하지 않은 응답부터 삭제)")
+    ai_replay_file: Optional[str] = Field(None, description="local provider가 재생할 AI 응답 기록 파일 (없으면 규칙 기반 합성)")
+    ai_record_file: Optional[str] = Field(None, description="AI 분석 결과를 재생용으로 기록할 파일 경로")
 
     # Additional context for AI
     product_description: Optional[str] = Field(None, description="앱/제품의 특성 및 비고 (AI 컨텍스트)")
@@ -111,10 +119,21 @@ class DataGeneratorConfig(BaseModel):
     # Output configuration
     output_dir: str = Field(default="./data_generator/output", description="Output directory")
     output_filename: Optional[str] = Field(None, description="Output filename (if None, auto-generated)")
+    flush_size: int = Field(default=10000, gt=0, description="스트리밍 기록 시 버퍼에 쌓을 최대 라인 수")
+    json_backend: str = Field(default="json", description="JSON 직렬화 백엔드 (json, orjson, ujson - json 외에는 compact 형식)")
+    validate_events: bool = Field(default=False, description="True면 pydantic 이벤트 모델로 검증 후 직렬화 (느림)")
+    output_compression: str = Field(default="none", description="출력 파일 압축 (none, gzip, zstd - zstd 모듈이 없으면 gzip)")
+    compression_level: Optional[int] = Field(None, ge=1, le=22, description="압축 레벨 (None이면 gzip 6, zstd 3)")
+    max_file_mb: Optional[float] = Field(None, gt=0, description="출력 파일 1개의 최대 크기 (MB, 넘으면 .001, .002 ... 파일로 분할)")
+    split_by_hour: bool = Field(default=False, description="True면 하루치 로그를 이벤트 시각의 시(hour)별 파일로 분할")
 
     # Advanced options
     timezone: str = Field(default="Asia/Seoul", description="Timezone for timestamps")
     seed: Optional[int] = Field(None, description="Random seed for reproducibility")
+    workers: int = Field(default=1, ge=1, description="로그 생성 프로세스 수 (1이면 단일 프로세스, 2 이상이면 유저 샤딩)")
+    profile_stages: bool = Field(default=False, description="True면 단계별(세션 계획, 속성 생성, 직렬화, 파일 I/O) 시간 측정")
+    profile_day: Optional[date] = Field(None, description="이 날짜의 생성 구간만 프로파일링 (None이면 프로파일 없음)")
+    profile_output: Optional[str] = Field(None, description="프로파일 저장 경로 (.html이면 pyinstrument, 그 외는 cProfile)")
 
     @field_validator("scenarios")
     @classmethod
@@ -133,6 +152,22 @@ class DataGeneratorConfig(BaseModel):
             raise ValueError("end_date must be after start_date")
         return end_date
 
+    @field_validator("output_compression")
+    @classmethod
+    def validate_output_compression(cls, compression: str) -> str:
+        """Validate that compression is one of none, gzip, zstd"""
+        if compression not in ("none", "gzip", "zstd"):
+            raise ValueError(f"output_compression must be none, gzip or zstd, got {compression}")
+        return compression
+
+    @field_validator("compression_level")
+    @classmethod
+    def validate_compression_level(cls, level: Optional[int], info) -> Optional[int]:
+        """Validate that gzip level is between 1 and 9"""
+        if level is not None and info.data.get("output_compression") == "gzip" and level > 9:
+            raise ValueError("gzip compression_level must be between 1 and 9")
+        return level
+
     def get_date_range_days(self) -> int:
         """Get number of days in date range"""
         return (self.end_date - self.start_date).days + 1
@@ -2,20 +2,26 @@
 Core orchestrator for data generation workflow.
 전체 데이터 생성 프로세스를 조율하는 핵심 모듈
 """
-from typing import List, Dict, Any
+import asyncio
+from functools import partial
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 from ..config.config_schema import DataGeneratorConfig
 from ..models.taxonomy import EventTaxonomy
-from ..models.user import User
+from ..models.user_store import UserStore
 from ..readers.taxonomy_reader import TaxonomyReader
 from ..generators.user_generator import UserGenerator
 from ..generators.behavior_engine import BehaviorEngine
 from ..generators.log_generator import LogGenerator
-from ..ai.openai_client import OpenAIClient
-from ..ai.claude_client import ClaudeClient
+from ..generators.intelligent_property_generator import IntelligentPropertyGenerator
+from ..generators.property_update_engine import PropertyUpdateEngine
+from ..ai.async_client import AsyncAIClient
+from ..ai.local_client import LocalRuleClient, record_ai_responses
 from ..ai.base_client import BaseAIClient
-from ..utils.cache_manager import CacheManager
+from ..utils.cache_manager import CacheManager, AIResponseCache
+from ..utils.rng import RandomStreams
+from ..writers.report import GenerationReport
 
 
 class DataGenerationOrchestrator:
@@ -25,10 +31,12 @@ class DataGenerationOrchestrator:
         self.config = config
         self.taxonomy: EventTaxonomy = None
         self.ai_client: BaseAIClient = None
-        self.users: List[User] = None
+        self.users: UserStore = None
         self.behavior_engine: BehaviorEngine = None
         self.log_generator: LogGenerator = None
-        self.intelligent_generator = None  # 공유 IntelligentPropertyGenerator
+        self.intelligent_generator: Optional[IntelligentPropertyGenerator] = None  # 공유 IntelligentPropertyGenerator
+        self.update_engine: Optional[PropertyUpdateEngine] = None  # 프리페치 단계에서 분석한 업데이트 엔진
+        self.rng = RandomStreams(config.seed)  # 모든 생성기가 공유하는 난수 스트림
 
     def execute(self) -> Dict[str, Any]:
         """
@@ -37,8 +45,9 @@ class DataGenerationOrchestrator:
         Returns:
             결과 정보 딕셔너리
         """
-        # 0. 캐시 초기화 (매 실행마다 새로운 AI 분석 보장)
-        self._clear_cache()
+        # 0. --refresh-ai면 분석 캐시 초기화 (기본은 택소노미/프롬프트가 같으면 캐시 재사용)
+        if self.config.refresh_ai:
+            self._clear_cache()
 
         # 1. 택소노미 로드
         self.taxonomy = self._load_taxonomy()
@@ -46,17 +55,20 @@ class DataGenerationOrchestrator:
         # 2. AI 클라이언트 초기화
         self.ai_client = self._initialize_ai_client()
 
-        # 3. 유저 생성
-        self.users = self._generate_users()
-
-        # 4. 행동 엔진 초기화
+        # 3. AI 분석 프리페치 (속성 관계, 업데이트 규칙, 시나리오별 행동 패턴을 동시에 요청)
+        self.intelligent_generator = self._create_intelligent_generator()
         self.behavior_engine = self._initialize_behavior_engine()
+        self.update_engine = self._create_update_engine()
+        self._prefetch_ai_analysis()
+
+        # 4. 유저 생성 (분석 결과 재사용)
+        self.users = self._generate_users()
 
-        # 5. 로그 생성
-        logs = self._generate_logs()
+        # 5. 로그 생성 (일별 파일로 스트리밍 저장)
+        report = self._generate_logs()
 
-        # 6. 파일 저장
-        output_path = self._save_logs(logs)
+        # 6. 출력 경로 확인
+        output_path = self._save_logs(self.log_generator.get_generated_files())
 
         return {
             "success": True,
@@ -66,8 +78,10 @@ class DataGenerationOrchestrator:
                 "user_properties": len(self.taxonomy.user_properties),
             },
             "users": len(self.users),
-            "logs": len(logs),
+            "logs": report.total_lines,
+            "bytes": report.total_bytes,
             "output_path": str(output_path),
+            "report": report,
         }
 
     def _load_taxonomy(self) -> EventTaxonomy:
@@ -77,22 +91,45 @@ class DataGenerationOrchestrator:
 
     def _initialize_ai_client(self) -> BaseAIClient:
         """AI 클라이언트 초기화"""
+        if self.config.ai_provider == "local":
+            # 네트워크 없이 규칙 기반 합성 또는 기록된 응답 재생
+            return LocalRuleClient(
+                taxonomy=self.taxonomy,
+                replay_file=self.config.ai_replay_file,
+                model=self.config.ai_model,
+            )
+
+        # provider SDK(openai, anthropic)는 임포트만 수백 ms~초 단위라 선택된 것만 로드
+        response_cache = self._create_response_cache()
         if self.config.ai_provider == "openai":
+            from ..ai.openai_client import OpenAIClient
             return OpenAIClient(
                 api_key=self.config.ai_api_key,
-                model=self.config.ai_model
+                model=self.config.ai_model,
+                response_cache=response_cache,
+                requests_per_minute=self.config.ai_requests_per_minute,
+                tokens_per_minute=self.config.ai_tokens_per_minute,
             )
         else:
+            from ..ai.claude_client import ClaudeClient
             return ClaudeClient(
                 api_key=self.config.ai_api_key,
-                model=self.config.ai_model
+                model=self.config.ai_model,
+                response_cache=response_cache,
+                requests_per_minute=self.config.ai_requests_per_minute,
+                tokens_per_minute=self.config.ai_tokens_per_minute,
             )
 
-    def _generate_users(self) -> List[User]:
-        """가상 유저 생성 (AI 기반 속성 생성)"""
-        # AI 기반 속성 생성기 초기화 (한번만!)
-        from ..generators.intelligent_property_generator import IntelligentPropertyGenerator
+    def _create_response_cache(self) -> AIResponseCache:
+        """AI 응답 캐시 (프롬프트 내용 해시 기반, 실행 간 유지)"""
+        return AIResponseCache(
+            ttl_seconds=self.config.ai_cache_ttl_hours * 3600,
+            max_bytes=int(self.config.ai_cache_max_mb * 1024 * 1024),
+            refresh=self.config.refresh_ai,
+        )
 
+    def _create_intelligent_generator(self) -> IntelligentPropertyGenerator:
+        """AI 기반 속성 생성기 생성 (분석은 _prefetch_ai_analysis 또는 _generate_users에서)"""
         # 택소노미에서 모든 속성 수집
         all_properties = []
         all_properties.extend(self.taxonomy.common_properties)
@@ -113,23 +150,77 @@ class DataGenerationOrchestrator:
         # 이벤트 이름 추출
         event_names = [event.event_name for event in self.taxonomy.events]
 
-        # 지능형 속성 생성기 생성 및 인스턴스 변수에 저장 (재사용)
-        self.intelligent_generator = IntelligentPropertyGenerator(
+        return IntelligentPropertyGenerator(
             ai_client=self.ai_client,
             taxonomy_properties=all_properties,
             product_info=product_info,
-            event_names=event_names
+            event_names=event_names,
+            enable_cache=self._uses_remote_ai(),
+            rng=self.rng,
+        )
+
+    def _create_update_engine(self) -> PropertyUpdateEngine:
+        """속성 업데이트 엔진 생성 (LogGenerator에 전달해 재사용)"""
+        return PropertyUpdateEngine(
+            ai_client=self.ai_client,
+            taxonomy=self.taxonomy,
+            product_info=LogGenerator.product_info_for(self.config),
+            enable_cache=self._uses_remote_ai(),
+            rng=self.rng,
         )
 
-        # AI 분석 수행 (단 한번만!)
-        print("  🤖 유저 속성 생성을 위한 AI 분석 중...")
-        self.intelligent_generator.analyze_properties()
+    def _prefetch_ai_analysis(self):
+        """
+        생성 전에 필요한 AI 분석을 모두 동시에 실행
+
+        속성 관계 분석, 이벤트별 업데이트 규칙 분석, 시나리오별 행동 패턴 생성은 서로 독립적이므로
+        스레드에서 동시에 호출한다 (각 호출은 클라이언트의 RateLimiter를 거침).
+        첫 이벤트까지 걸리는 시간이 호출 시간의 합이 아니라 가장 느린 호출 1개로 줄어든다.
+        """
+        scenario_keys = []
+        for scenario_config in self.config.scenarios:
+            scenario_key = scenario_config.get_scenario_key()
+            if scenario_key not in scenario_keys:
+                scenario_keys.append(scenario_key)
+
+        calls = [self.intelligent_generator.analyze_properties]
+        if self.update_engine:
+            calls.append(self.update_engine.analyze_event_update_patterns)
+        calls.extend(partial(self.behavior_engine.get_behavior_pattern, key) for key in scenario_keys)
+
+        print(f"  🤖 AI 분석 {len(calls)}건 동시 요청 중 (최대 {self.config.ai_concurrency}개 동시 실행)...")
+        async_client = AsyncAIClient(self.ai_client, max_concurrency=self.config.ai_concurrency)
+        asyncio.run(async_client.gather(calls))
+
+        if self.config.ai_record_file:
+            record_ai_responses(
+                self.config.ai_record_file,
+                intelligent_generator=self.intelligent_generator,
+                behavior_engine=self.behavior_engine,
+                update_engine=self.update_engine,
+            )
+
+    def _uses_remote_ai(self) -> bool:
+        """원격 AI 호출 여부 (로컬 클라이언트는 즉시 계산되므로 분석 결과 캐시를 쓰지 않음)"""
+        return self.config.ai_provider != "local"
+
+    def _generate_users(self) -> UserStore:
+        """가상 유저 생성 (AI 기반 속성 생성)"""
+        # AI 기반 속성 생성기 (프리페치에서 만들지 않았으면 여기서 생성)
+        if self.intelligent_generator is None:
+            self.intelligent_generator = self._create_intelligent_generator()
+
+        # AI 분석 수행 (단 한번만! 프리페치에서 이미 분석했으면 바로 반환)
+        if self.intelligent_generator.property_rules is None:
+            print("  🤖 유저 속성 생성을 위한 AI 분석 중...")
+            self.intelligent_generator.analyze_properties()
 
         # UserGenerator에 전달
         user_gen = UserGenerator(
             self.config,
             self.taxonomy,
-            intelligent_generator=self.intelligent_generator
+            intelligent_generator=self.intelligent_generator,
+            rng=self.rng,
         )
         return user_gen.generate_users()
 
@@ -158,10 +249,11 @@ class DataGenerationOrchestrator:
             self.taxonomy,
             product_info,
             custom_scenarios,
-            intelligent_generator=self.intelligent_generator  # AI 분석 결과 전달
+            intelligent_generator=self.intelligent_generator,  # AI 분석 결과 전달
+            rng=self.rng,
         )
 
-    def _generate_logs(self) -> List[str]:
+    def _generate_logs(self) -> GenerationReport:
         """로그 데이터 생성"""
         self.log_generator = LogGenerator(
             self.config,
@@ -169,22 +261,23 @@ class DataGenerationOrchestrator:
             self.behavior_engine,
             self.users,
             ai_client=self.ai_client,  # AI 기반 속성 생성 활성화
-            intelligent_generator=self.intelligent_generator  # 이미 분석된 인스턴스 재사용
+            intelligent_generator=self.intelligent_generator,  # 이미 분석된 인스턴스 재사용
+            rng=self.rng,
+            update_engine=self.update_engine,  # 프리페치에서 분석한 업데이트 규칙 재사용
         )
         return self.log_generator.generate()
 
-    def _save_logs(self, logs: List[str]) -> Path:
-        """로그를 파일로 저장"""
+    def _save_logs(self, generated_files: List[Path]) -> Path:
+        """출력 경로 반환 (일별 파일은 생성 중 이미 저장됨)"""
         return self.log_generator.save_to_file()
 
     def _clear_cache(self):
         """
-        캐시 초기화 - 매 실행마다 새로운 AI 분석 보장
+        분석 캐시 초기화 (--refresh-ai)
 
-        이유:
-        - 개선된 프롬프트로 재분석
-        - 오래된 캐시 방지
-        - 일관성 있는 결과
+        프롬프트가 바뀌면 응답 캐시 키도 바뀌므로 평소에는 필요 없고,
+        같은 입력으로 AI 분석을 다시 받고 싶을 때만 사용한다.
+        응답 캐시는 refresh 모드로 읽기만 건너뛰고 새 응답으로 덮어쓴다.
         """
         cache_manager = CacheManager()
 
@@ -1,15 +1,21 @@
 """
 Scenario-based behavior engine using AI.
 """
-import random
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+import numpy as np
+
 from ..ai.base_client import BaseAIClient
 from ..models.taxonomy import EventTaxonomy
-from ..models.user import User, UserSegment, LifecycleStage
-from ..patterns.time_patterns import TimePatternGenerator
+from ..models.user import UserSegment, LifecycleStage
+from ..models.user_store import UserRow, STAGE_CODES
+from ..patterns.time_patterns import TimePatternGenerator, DailySessionPlan
 from ..patterns.lifecycle_rules import LifecycleRulesEngine
+from ..patterns.scenarios import ScenarioPattern
+from ..patterns.session_model import SessionMarkovModel, SessionEventPlan, STEP_BITS
+from ..utils.rng import RandomStreams
+from ..utils.sampling import AliasSampler
 
 
 class BehaviorEngine:
@@ -22,6 +28,7 @@ class BehaviorEngine:
         product_info: Dict[str, Any],
         custom_scenarios: Optional[Dict[str, str]] = None,
         intelligent_generator=None,  # Optional[IntelligentPropertyGenerator]
+        rng: Optional[RandomStreams] = None,
     ):
         self.ai_client = ai_client
         self.taxonomy = taxonomy
@@ -29,9 +36,23 @@ class BehaviorEngine:
         self.behavior_cache: Dict[str, Dict[str, Any]] = {}
         self.custom_scenarios = custom_scenarios or {}  # {scenario_key: custom_behavior_text}
         self.intelligent_generator = intelligent_generator  # AI 분석 결과 접근용
-
-        # 생명주기 규칙 엔진 (하드코딩 + AI)
-        self.lifecycle_rules = LifecycleRulesEngine()
+        self.rng = rng or RandomStreams()  # 공유 난수 스트림 (LogGenerator가 유저-날짜마다 다시 시드)
+
+        # 생명주기 규칙 엔진 (하드코딩 + AI) - 택소노미 이벤트의 단계별 허용/전환 테이블을 미리 계산
+        self.lifecycle_rules = LifecycleRulesEngine(event_names=taxonomy.get_all_event_names())
+
+        # 세션 이벤트 선택에 쓰는 고정 정보 (택소노미는 생성 중에 바뀌지 않음)
+        event_names = [e.event_name for e in taxonomy.events]
+        self._start_event = next((name for name in event_names if "start" in name.lower()), None)
+        self._end_event = next((name for name in event_names if "end" in name.lower()), None)
+        self._session_event_names = [
+            e.event_name for e in taxonomy.events if not (e.event_tag and "시스템" in e.event_tag)  # 시스템 이벤트 제외
+        ]
+        # (단계, 세그먼트 확률 dict id) → (허용 테이블, 확률 dict, 후보 이벤트, alias 샘플러)
+        self._session_samplers: Dict[tuple, tuple] = {}
+        # (단계, 세그먼트 시퀀스 id, 확률 dict id) → (허용 테이블, 시퀀스, 확률 dict, 세션 마르코프 모델)
+        self._session_models: Dict[tuple, tuple] = {}
+        self._funnels = ScenarioPattern.get_funnel_sequences()
 
     def get_behavior_pattern(self, scenario_type: str) -> Dict[str, Any]:
         """
@@ -77,7 +98,7 @@ class BehaviorEngine:
 
     def generate_daily_sessions(
         self,
-        user: User,
+        user: UserRow,
         date: datetime,
         behavior_pattern: Dict[str, Any],
     ) -> List[tuple]:
@@ -87,69 +108,183 @@ class BehaviorEngine:
         Returns:
             List of (start_time, end_time) tuples
         """
-        # Check if user should be active today
-        if not TimePatternGenerator.should_user_be_active(
-            date=date,
-            user_segment=user.segment.value,
-            base_daily_probability=behavior_pattern.get("activity_probability", 0.7)
-        ):
-            return []
+        return self.generate_daily_sessions_batch([user], date, [behavior_pattern])[0]
 
-        # Get session count for the day
-        session_range = behavior_pattern.get("daily_session_range", (1, 3))
-        session_count = random.randint(session_range[0], session_range[1])
+    def generate_daily_sessions_batch(
+        self,
+        users: List[UserRow],
+        date: datetime,
+        behavior_patterns: List[Dict[str, Any]],
+        stream_ids: Optional[List[int]] = None,
+    ) -> List[List[tuple]]:
+        """
+        전체 유저의 하루 세션을 한 번에 생성 (TimePatternGenerator.plan_daily_sessions 사용)
 
-        if session_count == 0:
-            return []
+        Args:
+            users: 유저 리스트
+            date: 대상 날짜 (자정)
+            behavior_patterns: users와 같은 순서의 유저별 행동 패턴
+            stream_ids: 유저별 난수 스트림 id (None이면 user.stream_id 사용)
 
-        # Get session duration
-        duration_range = behavior_pattern.get("session_duration_range", (5, 15))
-        avg_duration = random.uniform(duration_range[0], duration_range[1])
+        Returns:
+            유저별 (start_time, end_time) 튜플 리스트
+        """
+        plan = self.plan_daily_sessions(users, date, behavior_patterns, stream_ids)
+        return [plan.sessions_for(i, date) if count else [] for i, count in enumerate(plan.session_counts.tolist())]
 
-        # Get time pattern
-        time_pattern_type = behavior_pattern.get("time_pattern", "normal")
-        hourly_dist = TimePatternGenerator.get_hourly_distribution(time_pattern_type)
+    def plan_daily_sessions(
+        self,
+        users: List[UserRow],
+        date: datetime,
+        behavior_patterns: List[Dict[str, Any]],
+        stream_ids: Optional[List[int]] = None,
+    ) -> DailySessionPlan:
+        """유저별 행동 패턴 파라미터를 모아 하루치 세션 계획을 배열로 샘플링"""
+        if stream_ids is None:
+            stream_ids = [user.stream_id for user in users]
+
+        # 같은 행동 패턴 객체는 파라미터를 한 번만 꺼냄
+        pattern_params: Dict[int, tuple] = {}
+        params = []
+        for behavior_pattern in behavior_patterns:
+            key = id(behavior_pattern)
+            if key not in pattern_params:
+                pattern_params[key] = (
+                    behavior_pattern.get("activity_probability", 0.7),
+                    tuple(behavior_pattern.get("daily_session_range", (1, 3))),
+                    tuple(behavior_pattern.get("session_duration_range", (5, 15))),
+                    behavior_pattern.get("time_pattern", "normal"),
+                )
+            params.append(pattern_params[key])
+
+        activity_probabilities, session_ranges, duration_ranges, time_patterns = (
+            zip(*params) if params else ((), (), (), ())
+        )
 
-        # Generate session times
-        sessions = TimePatternGenerator.generate_session_times(
+        return TimePatternGenerator.plan_daily_sessions(
             date=date,
-            session_count=session_count,
-            hourly_dist=hourly_dist,
-            session_duration_minutes=avg_duration,
+            stream_ids=stream_ids,
+            segments=[user.segment.value for user in users],
+            activity_probabilities=activity_probabilities,
+            session_ranges=session_ranges,
+            duration_ranges=duration_ranges,
+            time_patterns=time_patterns,
+            rng=self.rng,
         )
 
-        return sessions
+    def plan_session_events(
+        self,
+        users: List[UserRow],
+        day: int,
+        plan: DailySessionPlan,
+        stream_ids: Optional[List[int]] = None,
+    ) -> SessionEventPlan:
+        """
+        하루치 전체 세션의 이벤트 순서를 세션 마르코프 모델로 한 번에 샘플링
+
+        유저의 (세그먼트, 현재 생명주기 단계)별로 모델을 골라 같은 모델의 세션을 NumPy로 함께 진행한다.
+        모델이 없는 세그먼트/단계(AI 시퀀스 없음)의 세션은 비워 두고 select_events_for_session의 폴백이 처리한다.
+
+        Args:
+            users: 유저 리스트 (plan과 같은 순서)
+            day: 대상 날짜 (date.toordinal())
+            plan: plan_daily_sessions 결과
+            stream_ids: 유저별 난수 스트림 id (None이면 user.stream_id 사용)
+        """
+        if stream_ids is None:
+            stream_ids = [user.stream_id for user in users]
+
+        session_counts = plan.session_counts
+        owners = np.repeat(np.arange(len(users)), session_counts)
+        session_ids = np.asarray(stream_ids, dtype=np.uint64)[owners]
+        session_numbers = np.arange(len(owners), dtype=np.int64) - plan.session_offsets[owners]
+
+        # 세션이 있는 유저만 (세그먼트, 단계) 그룹으로 묶음
+        user_groups = np.full(len(users), -1, dtype=np.intp)
+        group_index: Dict[tuple, int] = {}
+        group_stages: List[LifecycleStage] = []
+        models: List[Optional[SessionMarkovModel]] = []
+        for i in np.flatnonzero(session_counts).tolist():
+            user = users[i]
+            key = (user.segment, user.lifecycle_stage)
+            group = group_index.get(key)
+            if group is None:
+                group = group_index[key] = len(models)
+                group_stages.append(user.lifecycle_stage)
+                models.append(self.get_session_model(*key))
+            user_groups[i] = group
+        session_groups = user_groups[owners]
+
+        stage_codes = [-1] * len(owners)
+        events: List[Optional[List[str]]] = [None] * len(owners)
+        for group, model in enumerate(models):
+            if model is None:
+                continue
+            members = np.flatnonzero(session_groups == group)
+            counts = model.event_counts(plan.duration_minutes[members])
+            uniforms = self._session_uniforms(session_ids[members], session_numbers[members], day, int(counts.max()))
+            group_events = model.decode_batch(model.walk(uniforms, counts), counts)
+            stage_code = STAGE_CODES[group_stages[group]]
+            for session_index, session_events in zip(members.tolist(), group_events):
+                stage_codes[session_index] = stage_code
+                events[session_index] = session_events
+
+        return SessionEventPlan(
+            day=day,
+            session_ids=session_ids,
+            session_numbers=session_numbers,
+            duration_minutes=plan.duration_minutes,
+            stage_codes=stage_codes,
+            events=events,
+        )
+
+    def _session_uniforms(self, session_ids: np.ndarray, session_numbers: np.ndarray, day: int, steps: int) -> np.ndarray:
+        """(세션, 걸음)별 균등 난수 - (유저, 날짜, 세션 번호, 걸음)으로만 정해져 샤딩/처리 순서와 무관"""
+        sub = (np.asarray(session_numbers, dtype=np.uint64)[:, None] << np.uint64(STEP_BITS)) | np.arange(
+            steps, dtype=np.uint64
+        )
+        return self.rng.counter_uniforms(
+            np.asarray(session_ids, dtype=np.uint64)[:, None], self.rng.SCOPE_SESSION_EVENTS, day, sub=sub
+        )
 
     def select_events_for_session(
         self,
-        user: User,
+        user: UserRow,
         session_duration_minutes: float,
         behavior_pattern: Dict[str, Any],
+        event_plan: Optional[SessionEventPlan] = None,
+        session_index: Optional[int] = None,
     ) -> List[str]:
         """
         Select which events should occur during a session.
-        AI가 분석한 event_sequence를 우선 사용하고, 없으면 확률 기반으로 폴백
+        AI가 분석한 event_sequence로 만든 세션 마르코프 모델을 우선 사용하고, 없으면 확률 기반으로 폴백
+
+        Args:
+            event_plan: plan_session_events 결과 (있으면 미리 샘플링한 세션을 사용)
+            session_index: event_plan 안에서 이 세션의 인덱스
 
         Returns:
             List of event names in order
         """
-        # AI 분석 결과에서 이벤트 시퀀스 가져오기
-        ai_event_sequence = self._get_ai_event_sequence(user.segment)
-
-        # AI 시퀀스가 있으면 우선 사용 (순서 보장)
-        if ai_event_sequence:
-            sequence_events = self._select_from_sequence(ai_event_sequence, session_duration_minutes, user)
-            if sequence_events:  # 유효한 시퀀스가 있으면 반환
-                return sequence_events
+        planned = event_plan is not None and session_index is not None
+        if planned:
+            events = event_plan.events_for(session_index, STAGE_CODES[user.lifecycle_stage])
+            if events is not None:
+                return events
+
+        model = self.get_session_model(user.segment, user.lifecycle_stage)
+        if model is not None:
+            if planned:
+                # 같은 날 앞선 세션에서 생명주기 단계가 바뀐 유저 - 같은 난수로 이 세션만 다시 샘플링
+                return self._resample_planned_session(model, event_plan, session_index)
+            return model.sample(self.rng, int(model.event_counts(session_duration_minutes)))
 
         # 폴백: 기존 확률 기반 방식
         events = []
 
         # Always start with app_start
-        if any("start" in e.event_name.lower() for e in self.taxonomy.events):
-            start_events = [e.event_name for e in self.taxonomy.events if "start" in e.event_name.lower()]
-            if start_events:
-                events.append(start_events[0])
+        if self._start_event:
+            events.append(self._start_event)
 
         # Calculate how many events based on session duration
         # Rough estimate: 1 event per 2-3 minutes
@@ -162,81 +297,81 @@ class BehaviorEngine:
         # AI 분석 결과에서 이벤트 확률 가져오기
         ai_event_probs = self._get_ai_event_probabilities(user.segment)
 
-        # Filter events (exclude system events + 생명주기 제약)
-        available_events = []
-        for e in self.taxonomy.events:
-            # 시스템 이벤트 제외
-            if e.event_tag and "시스템" in e.event_tag:
-                continue
-
-            # 생명주기 단계에서 허용되는 이벤트인지 확인
-            if self.lifecycle_rules.is_event_allowed_in_lifecycle(e.event_name, user.lifecycle_stage):
-                available_events.append(e)
+        # 생명주기 단계에서 허용되는 후보 이벤트와 가중치 샘플러 (세그먼트/단계별로 한 번만 계산)
+        available_events, sampler = self._get_session_sampler(user.lifecycle_stage, ai_event_probs)
 
         # 허용된 이벤트가 없으면 기본 이벤트만
         if not available_events:
             # app_end만 추가하고 반환
-            if any("end" in e.event_name.lower() for e in self.taxonomy.events):
-                end_events = [e.event_name for e in self.taxonomy.events if "end" in e.event_name.lower()]
-                if end_events:
-                    events.append(end_events[0])
+            if self._end_event:
+                events.append(self._end_event)
             return events
 
-        # Calculate weights based on AI event probabilities
-        weights = []
-        for event in available_events:
-            weight = 1.0
-
-            if ai_event_probs:
-                # 이벤트명 정확 매칭
-                if event.event_name in ai_event_probs:
-                    weight = ai_event_probs[event.event_name]
-                # 부분 매칭 (패턴)
-                else:
-                    matched = False
-                    for pattern, prob in ai_event_probs.items():
-                        if pattern.lower() in event.event_name.lower():
-                            weight = prob
-                            matched = True
-                            break
-                    # 매칭 안되면 기본 가중치 유지 (1.0)
-
-            weights.append(weight)
-
-        # Normalize weights
-        total_weight = sum(weights)
-        if total_weight > 0:
-            weights = [w / total_weight for w in weights]
-
-            # Select events
-            selected = random.choices(
-                available_events,
-                weights=weights,
-                k=min(event_count, len(available_events))
-            )
-
-            events.extend([e.event_name for e in selected])
+        if sampler is not None:
+            # Select events (alias method - 후보 수와 무관하게 추출당 O(1))
+            events.extend(sampler.sample(self.rng, min(event_count, len(available_events))))
 
         # Always end with app_end
-        if any("end" in e.event_name.lower() for e in self.taxonomy.events):
-            end_events = [e.event_name for e in self.taxonomy.events if "end" in e.event_name.lower()]
-            if end_events:
-                events.append(end_events[0])
+        if self._end_event:
+            events.append(self._end_event)
 
         return events
 
+    def _get_session_sampler(
+        self,
+        lifecycle_stage: LifecycleStage,
+        ai_event_probs: Optional[Dict[str, float]],
+    ) -> Tuple[List[str], Optional[AliasSampler]]:
+        """
+        폴백 선택에 쓰는 (후보 이벤트, alias 샘플러) - 가중치가 모두 0이면 샘플러는 None
+
+        가중치는 세그먼트의 AI 이벤트 확률과 생명주기 단계로만 정해지므로 그 조합마다 한 번만 만든다
+        (시나리오는 이벤트 수에만 영향). 생명주기 규칙 테이블이 다시 컴파일되거나 확률 dict가 바뀌면 새로 만든다.
+        """
+        allowed_table = self.lifecycle_rules.allowed_table
+        key = (lifecycle_stage, id(ai_event_probs))
+        cached = self._session_samplers.get(key)
+        if cached is not None and cached[0] is allowed_table and cached[1] is ai_event_probs:
+            return cached[2], cached[3]
+
+        # 생명주기 단계에서 허용되는 이벤트
+        is_allowed = self.lifecycle_rules.is_event_allowed_in_lifecycle
+        available_events = [name for name in self._session_event_names if is_allowed(name, lifecycle_stage)]
+
+        # Calculate weights based on AI event probabilities
+        weights = [self._event_weight(event_name, ai_event_probs) for event_name in available_events]
+
+        sampler = AliasSampler(available_events, weights) if sum(w for w in weights if w > 0) > 0 else None
+
+        self._session_samplers[key] = (allowed_table, ai_event_probs, available_events, sampler)
+        return available_events, sampler
+
+    @staticmethod
+    def _event_weight(event_name: str, ai_event_probs: Optional[Dict[str, float]]) -> float:
+        """AI 이벤트 확률에서 이벤트 가중치 (정확 매칭 → 부분 매칭 → 기본 1.0)"""
+        if not ai_event_probs:
+            return 1.0
+        # 이벤트명 정확 매칭
+        if event_name in ai_event_probs:
+            return ai_event_probs[event_name]
+        # 부분 매칭 (패턴) - 매칭 안되면 기본 가중치 유지 (1.0)
+        for pattern, prob in ai_event_probs.items():
+            if pattern.lower() in event_name.lower():
+                return prob
+        return 1.0
+
     def should_trigger_conversion(
         self,
-        user: User,
+        user: UserRow,
         behavior_pattern: Dict[str, Any],
     ) -> bool:
         """Determine if a conversion event should trigger"""
         conversion_prob = behavior_pattern.get("conversion_probability", 0.05)
-        return random.random() < conversion_prob
+        return self.rng.random() < conversion_prob
 
     def should_user_churn(
         self,
-        user: User,
+        user: UserRow,
         behavior_pattern: Dict[str, Any],
         days_since_start: int,
     ) -> bool:
@@ -247,7 +382,7 @@ class BehaviorEngine:
         if user.segment == UserSegment.CHURNING_USER:
             churn_prob = min(churn_prob * (1 + days_since_start * 0.1), 0.5)
 
-        return random.random() < churn_prob
+        return self.rng.random() < churn_prob
 
     def _get_ai_event_probabilities(self, user_segment: UserSegment) -> Optional[Dict[str, float]]:
         """
@@ -295,45 +430,60 @@ class BehaviorEngine:
 
         return event_sequence
 
-    def _select_from_sequence(
-        self,
-        base_sequence: List[str],
-        session_duration_minutes: float,
-        user: User
-    ) -> List[str]:
+    def get_session_model(self, user_segment: UserSegment, lifecycle_stage: LifecycleStage) -> Optional[SessionMarkovModel]:
         """
-        AI가 제공한 이벤트 시퀀스 기반으로 세션 이벤트 선택
-        약간의 변형을 추가하여 자연스러움 유지
-
-        Args:
-            base_sequence: AI가 분석한 기본 이벤트 순서
-            session_duration_minutes: 세션 지속 시간
-            user: 유저 객체
+        세그먼트/생명주기 단계의 세션 마르코프 모델 (AI 시퀀스가 없거나 단계에서 허용된 이벤트가 없으면 None)
 
-        Returns:
-            이벤트명 리스트 (순서 보장)
+        세그먼트의 event_sequence/event_probabilities와 퍼널 정의로 한 번만 컴파일해 모든 유저가 공유한다.
+        생명주기 규칙 테이블이 다시 컴파일되거나 AI 분석 결과가 바뀌면 새로 만든다.
         """
-        # 세션 시간에 따라 시퀀스에서 몇 개를 가져올지 결정
-        event_count = max(2, int(session_duration_minutes / 2.5))
-        event_count = min(event_count, len(base_sequence))
+        base_sequence = self._get_ai_event_sequence(user_segment)
+        if not base_sequence:
+            return None
+        ai_event_probs = self._get_ai_event_probabilities(user_segment)
+
+        allowed_table = self.lifecycle_rules.allowed_table
+        key = (lifecycle_stage, id(base_sequence), id(ai_event_probs))
+        cached = self._session_models.get(key)
+        if (
+            cached is not None and cached[0] is allowed_table
+            and cached[1] is base_sequence and cached[2] is ai_event_probs
+        ):
+            return cached[3]
 
         # 생명주기 단계에서 허용되는 이벤트만 필터링
-        allowed_sequence = []
-        for event_name in base_sequence:
-            if self.lifecycle_rules.is_event_allowed_in_lifecycle(event_name, user.lifecycle_stage):
-                allowed_sequence.append(event_name)
-
-        if not allowed_sequence:
-            # 허용된 이벤트가 없으면 빈 리스트 반환 (폴백 로직이 처리)
-            return []
-
-        # 시퀀스의 앞부분부터 선택 (자연스러운 흐름)
-        selected_events = allowed_sequence[:event_count]
+        is_allowed = self.lifecycle_rules.is_event_allowed_in_lifecycle
+        allowed_sequence = [event_name for event_name in base_sequence if is_allowed(event_name, lifecycle_stage)]
+
+        model = None
+        if allowed_sequence:
+            # 퍼널 단계로 추가할 수 있는 이벤트 = 폴백 후보와 같음 (단계에서 허용된 비시스템 이벤트)
+            candidates, _ = self._get_session_sampler(lifecycle_stage, ai_event_probs)
+            event_weights = {
+                event_name: self._event_weight(event_name, ai_event_probs)
+                for event_name in set(allowed_sequence).union(candidates)
+            }
+            model = SessionMarkovModel(
+                allowed_sequence,
+                event_weights=event_weights,
+                funnels=self._funnels,
+                candidates=candidates,
+                max_events=len(base_sequence),
+            )
 
-        # 30% 확률로 일부 이벤트를 스킵하거나 반복 (자연스러운 변형)
-        if random.random() < 0.3 and len(selected_events) > 2:
-            # 중간 이벤트 하나를 스킵
-            skip_idx = random.randint(1, len(selected_events) - 2)
-            selected_events = selected_events[:skip_idx] + selected_events[skip_idx + 1:]
+        self._session_models[key] = (allowed_table, base_sequence, ai_event_probs, model)
+        return model
 
-        return selected_events
+    def _resample_planned_session(
+        self,
+        model: SessionMarkovModel,
+        event_plan: SessionEventPlan,
+        session_index: int,
+    ) -> List[str]:
+        """계획의 세션 1개를 다른 모델로 다시 샘플링 (계획 때와 같은 난수 사용)"""
+        members = slice(session_index, session_index + 1)
+        counts = model.event_counts(event_plan.duration_minutes[members])
+        uniforms = self._session_uniforms(
+            event_plan.session_ids[members], event_plan.session_numbers[members], event_plan.day, int(counts[0])
+        )
+        return model.decode(model.walk(uniforms, counts)[0])
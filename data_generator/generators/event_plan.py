@@ -0,0 +1,32 @@
+"""
+이벤트별 속성 생성 계획 - AI 분석이 끝난 뒤 한 번만 컴파일해서 핫 루프에서 재사용
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..models.user_store import UserRow
+from ..utils.property_validator import PropertyKeyRemap
+from .intelligent_property_generator import PropertyBatchGenerator
+
+
+# (user, session_events, additional_context) -> 속성값
+PropertyGeneratorFn = Callable[[Optional[UserRow], Optional[List[str]], Optional[Dict[str, Any]]], Any]
+
+
+@dataclass(frozen=True)
+class PropertyPlan:
+    """속성 1개의 생성 계획"""
+    name: str  # 택소노미 원본 속성명 (출력 키 정제는 EventPlan.key_remap이 담당)
+    prop_type: str  # string, number, boolean, time, list, object ...
+    generate: PropertyGeneratorFn  # 미리 결정된 생성 함수
+    generate_batch: Optional[PropertyBatchGenerator] = None  # 일괄 생성 함수 (값이 난수만으로 정해지는 속성)
+    batch_key: int = 0  # 일괄 생성 난수 스트림 키 (이벤트명 + 속성명의 stable_hash64)
+
+
+@dataclass(frozen=True)
+class EventPlan:
+    """이벤트 1개의 속성 생성 계획"""
+    event_name: str
+    properties: Tuple[PropertyPlan, ...]
+    key_remap: PropertyKeyRemap  # 이 이벤트의 속성 키 정제 테이블 (처음 보는 프리셋 키는 실행 중 추가)
+    batched: Tuple[int, ...] = ()  # generate_batch가 있는 속성의 properties 인덱스
@@ -2,19 +2,45 @@
 AI 기반 지능형 속성값 생성기
 택소노미와 제품 정보를 분석하여 현실적인 값을 생성
 """
-import random
-from typing import Dict, Any, Optional, List
+from collections import ChainMap
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Callable, Mapping, Sequence, Tuple
 from datetime import datetime
-from faker import Faker
+
+import numpy as np
 
 from ..ai.base_client import BaseAIClient
-from ..models.user import User
+from ..models.user_store import UserRow
 from ..utils.cache_manager import CacheManager
+from ..utils.rng import RandomStreams
+from ..utils.faker_pool import FakerPool
+from ..utils.formula import try_compile_formula
+
+
+@dataclass(frozen=True)
+class PropertyBatchGenerator:
+    """
+    (이벤트, 속성) 쌍의 일괄 생성 함수 (IntelligentPropertyGenerator.compile_property_batch 결과)
+
+    generate(uniforms, tiers)는 행마다 [0, 1) 균등 난수 draws개 (uniforms: (count, draws))로 값 count개를 만든다.
+    tiers는 행별 engagement_tier (None이면 모두 medium)이며 rule-based 숫자 속성의 평균 위치에만 쓰인다.
+    """
+    draws: int
+    generate: Callable[[np.ndarray, Optional[Sequence[str]]], List[Any]]
 
 
 class IntelligentPropertyGenerator:
     """AI 분석 기반 속성값 생성기"""
 
+    # engagement_tier별 정규분포 평균 위치 (범위 내 비율)
+    TIER_ADJUSTMENTS = {
+        "very_low": 0.1,   # 최소값 근처 (10%)
+        "low": 0.3,        # 하위 (30%)
+        "medium": 0.5,     # 중간 (50%)
+        "high": 0.7,       # 상위 (70%)
+        "very_high": 0.9   # 최상위 (90%)
+    }
+
     def __init__(
         self,
         ai_client: BaseAIClient,
@@ -22,6 +48,7 @@ class IntelligentPropertyGenerator:
         product_info: Dict[str, Any],
         enable_cache: bool = True,
         event_names: List[str] = None,
+        rng: Optional[RandomStreams] = None,
     ):
         self.ai_client = ai_client
         self.product_info = product_info
@@ -39,15 +66,21 @@ class IntelligentPropertyGenerator:
                 "description": getattr(prop, 'description', '')
             })
 
-        # Faker 인스턴스 초기화 (다양한 locale 지원)
-        self.faker_instances = {
-            "ko_KR": Faker('ko_KR'),
-            "en_US": Faker('en_US'),
-            "ja_JP": Faker('ja_JP'),
-            "zh_CN": Faker('zh_CN'),
-        }
-        # 기본 Faker (영어)
-        self.default_faker = self.faker_instances["en_US"]
+        # 공유 난수 스트림 (Faker도 같은 스트림 사용)
+        self.rng = rng or RandomStreams()
+
+        # locale별 Faker 인스턴스 (다양한 locale 지원, 폴백에서 처음 필요할 때 생성)
+        self.faker_instances = FakerPool(self.rng)
+
+    @property
+    def default_faker(self):
+        """기본 Faker (영어)"""
+        return self.faker_instances["en_US"]
+
+    def use_random_streams(self, rng: RandomStreams):
+        """난수 스트림 교체 (Faker 인스턴스도 같은 스트림을 쓰도록 연결)"""
+        self.rng = rng
+        self.faker_instances.rng = rng
 
     def analyze_properties(self):
         """
@@ -59,9 +92,15 @@ class IntelligentPropertyGenerator:
 
         # 캐시 확인
         if self.cache_manager:
-            taxonomy_hash = self.cache_manager.compute_taxonomy_hash(self.taxonomy_props_dict)
-            ai_provider = getattr(self.ai_client, 'model', 'unknown').split('-')[0]  # "claude" or "gpt"
-            cache_key = self.cache_manager.get_cache_key(taxonomy_hash, ai_provider, self.product_info)
+            # 분석 입력 전체(모델명, 이벤트명, 속성 이름/타입/설명, 제품 정보) 해시 - 하나라도 바뀌면 다른 키
+            ai_model = getattr(self.ai_client, 'model', None)
+            content_hash = self.cache_manager.compute_content_hash({
+                "model": ai_model,
+                "event_names": self.event_names,
+                "properties": self.taxonomy_props_dict,
+                "product_info": self.product_info,
+            })
+            cache_key = f"property_rules_{content_hash}"
 
             cached_rules = self.cache_manager.load(cache_key)
             if cached_rules:
@@ -87,7 +126,7 @@ class IntelligentPropertyGenerator:
             if self.cache_manager:
                 metadata = {
                     'taxonomy_properties_count': len(self.taxonomy_props_dict),
-                    'ai_provider': ai_provider,
+                    'ai_model': ai_model,
                     'product_info': self.product_info
                 }
                 self.cache_manager.save(cache_key, self.property_rules, metadata)
@@ -129,12 +168,20 @@ class IntelligentPropertyGenerator:
         # property_relationships 필터링
         if 'property_relationships' in ai_response:
             filtered_relationships = {}
+            invalid_formulas = []
             for prop_name, relationship in ai_response['property_relationships'].items():
                 if prop_name in valid_properties:
+                    # 허용되지 않는 공식 힌트는 로드 시점에 제거 (생성 시에는 범위 기반으로 폴백)
+                    formula_hint = relationship.get('formula_hint') if isinstance(relationship, dict) else None
+                    if formula_hint and try_compile_formula(formula_hint) is None:
+                        relationship = {k: v for k, v in relationship.items() if k != 'formula_hint'}
+                        invalid_formulas.append(prop_name)
                     filtered_relationships[prop_name] = relationship
                 else:
                     invalid_props_found.append(prop_name)
             filtered_response['property_relationships'] = filtered_relationships
+            if invalid_formulas:
+                print(f"  ⚠️  허용되지 않는 공식 힌트 {len(invalid_formulas)}개 제거됨: {', '.join(invalid_formulas[:5])}{'...' if len(invalid_formulas) > 5 else ''}")
 
         # generation_strategy 필터링
         if 'generation_strategy' in ai_response:
@@ -162,10 +209,10 @@ class IntelligentPropertyGenerator:
         self,
         prop_name: str,
         prop_type: str,
-        user: Optional[User],
+        user: Optional[UserRow],
         event_name: Optional[str] = None,
         session_events: Optional[List[str]] = None,
-        additional_context: Optional[Dict[str, Any]] = None
+        additional_context: Optional[Mapping[str, Any]] = None
     ) -> Any:
         """
         AI 분석 결과를 기반으로 현실적인 속성값 생성
@@ -195,23 +242,209 @@ class IntelligentPropertyGenerator:
             # 단순 랜덤 (AI 범위 정보 + 이벤트 컨텍스트 활용)
             return self._generate_simple(prop_name, prop_type, event_name, session_events, additional_context)
 
-    def _generate_with_rules(self, prop_name: str, prop_type: str, user: Optional[User], additional_context: Optional[Dict[str, Any]] = None) -> Any:
+    def get_value_range(self, prop_name: str) -> Dict[str, Any]:
+        """AI가 분석한 속성의 값 범위 정보"""
+        if self.property_rules is None:
+            self.analyze_properties()
+        return self.property_rules.get("value_ranges", {}).get(prop_name, {})
+
+    def get_event_constraint(self, prop_name: str, event_name: Optional[str]) -> Any:
+        """
+        이벤트별 속성 제약조건 (AI가 분석한 event_constraints)
+
+        이벤트 패턴은 정확한 매칭 또는 부분 매칭으로 찾으며, 처음 매칭된 패턴만 사용
+        """
+        if not event_name:
+            return None
+        if self.property_rules is None:
+            self.analyze_properties()
+
+        event_lower = event_name.lower()
+        for event_pattern, constraints in self.property_rules.get("event_constraints", {}).items():
+            if event_pattern in event_lower or event_lower in event_pattern:
+                return constraints.get(prop_name) if isinstance(constraints, dict) else None
+        return None
+
+    def compile_property_generator(
+        self,
+        prop_name: str,
+        prop_type: str,
+        event_name: Optional[str] = None,
+    ) -> Callable[[Optional[UserRow], Optional[List[str]], Optional[Mapping[str, Any]]], Any]:
+        """
+        속성 1개의 생성 함수를 미리 결정해서 반환 (generate_property_value와 같은 결과 분포)
+
+        생성 전략, 값 범위, 이벤트 제약조건 조회를 한 번만 수행하므로
+        이벤트마다 반복되는 조회 비용이 사라진다.
+
+        Returns:
+            (user, session_events, additional_context) -> 값
+        """
+        if self.property_rules is None:
+            self.analyze_properties()
+
+        strategy = self.property_rules.get("generation_strategy", {}).get(prop_name, "random-simple")
+
+        if strategy in ("ai-contextual", "rule-based"):
+            # ai-contextual도 현재는 규칙 기반으로 폴백 (_generate_with_ai_context 참고)
+            def generate_with_rules(user, session_events, additional_context):
+                return self._generate_with_rules(prop_name, prop_type, user, additional_context)
+            return generate_with_rules
+
+        def generate_simple(user, session_events, additional_context):
+            return self._generate_simple(prop_name, prop_type, event_name, session_events, additional_context)
+
+        value_range = self.get_value_range(prop_name)
+        example_values = value_range.get("example_values", [])
+        has_examples = bool(example_values) and isinstance(example_values, list)
+
+        if prop_type == "string":
+            if has_examples:
+                return lambda user, session_events, additional_context: self.rng.choice(example_values)
+            return lambda user, session_events, additional_context: self._generate_contextual_string(
+                prop_name, additional_context or {}
+            )
+        elif prop_type == "number":
+            bounds = self._simple_number_bounds(prop_name, event_name, value_range)
+            if bounds is None:
+                # 범위 값이 비정상이면 매번 원래 경로로 생성
+                return generate_simple
+            low, high = bounds
+            return lambda user, session_events, additional_context: self.rng.randint(low, high)
+        elif prop_type == "boolean":
+            return lambda user, session_events, additional_context: self.rng.choice([True, False])
+        elif prop_type == "list" and has_examples:
+            max_count = min(3, len(example_values))
+            return lambda user, session_events, additional_context: self.rng.sample(
+                example_values, self.rng.randint(1, max_count)
+            )
+        else:
+            return generate_simple
+
+    def compile_property_batch(
+        self,
+        prop_name: str,
+        prop_type: str,
+        event_name: Optional[str] = None,
+    ) -> Optional[PropertyBatchGenerator]:
+        """
+        속성 1개의 일괄 생성 함수 (compile_property_generator와 같은 결과 분포를 NumPy 배열로)
+
+        값이 균등 난수와 engagement_tier만으로 정해지는 경우에만 반환한다:
+        - random-simple: 숫자(randint), 불리언, example_values가 있는 문자열
+        - rule-based/ai-contextual: formula_hint가 없고 engagement_tier를 유저 상태에서 읽지 않는 숫자/불리언
+        그 밖의 속성(Faker 문자열, 공식, 리스트 등)은 None - compile_property_generator의 함수를 그대로 사용.
+        """
+        if self.property_rules is None:
+            self.analyze_properties()
+
+        strategy = self.property_rules.get("generation_strategy", {}).get(prop_name, "random-simple")
+        value_range = self.get_value_range(prop_name)
+
+        if strategy in ("ai-contextual", "rule-based"):
+            relationships = self.property_rules.get("property_relationships", {}).get(prop_name, {})
+            if relationships.get("formula_hint") or "engagement_tier" in relationships.get("depends_on", []):
+                return None
+            return self._compile_range_batch(prop_type, value_range)
+
+        example_values = value_range.get("example_values", [])
+        if prop_type == "string":
+            if not example_values or not isinstance(example_values, list):
+                return None
+            choices = np.empty(len(example_values), dtype=object)
+            choices[:] = example_values
+            last = len(example_values) - 1
+
+            def choose(uniforms, tiers=None):
+                indices = np.minimum((uniforms[:, 0] * len(choices)).astype(np.intp), last)
+                return choices[indices].tolist()
+            return PropertyBatchGenerator(draws=1, generate=choose)
+        elif prop_type == "number":
+            bounds = self._simple_number_bounds(prop_name, event_name, value_range)
+            if bounds is None:
+                return None
+            low, span = bounds[0], bounds[1] - bounds[0] + 1
+
+            def randint(uniforms, tiers=None):
+                return (low + np.minimum((uniforms[:, 0] * span).astype(np.int64), span - 1)).tolist()
+            return PropertyBatchGenerator(draws=1, generate=randint)
+        elif prop_type == "boolean":
+            return PropertyBatchGenerator(draws=1, generate=lambda uniforms, tiers=None: (uniforms[:, 0] < 0.5).tolist())
+        return None
+
+    def _compile_range_batch(self, prop_type: str, value_range: Mapping[str, Any]) -> Optional[PropertyBatchGenerator]:
+        """_generate_with_range의 숫자/불리언 경로를 배열로 (범위 값이 숫자가 아니면 None)"""
+        if prop_type == "number":
+            min_val = value_range.get("min", 0)
+            max_val = value_range.get("max", 1000)
+            if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (min_val, max_val)):
+                return None
+            if not max_val > min_val:
+                typical = value_range.get("typical", (min_val + max_val) / 2)
+                return PropertyBatchGenerator(draws=0, generate=lambda uniforms, tiers=None: [typical] * len(uniforms))
+
+            integral = isinstance(min_val, int) and isinstance(max_val, int)
+            std_dev = (max_val - min_val) / 6
+            tier_adjustments = self.TIER_ADJUSTMENTS
+
+            def gauss_in_range(uniforms, tiers=None):
+                if tiers is None:
+                    adjustment = tier_adjustments["medium"]
+                else:
+                    adjustment = np.array([tier_adjustments.get(tier, 0.5) for tier in tiers])
+                # tier에 따라 평균 위치를 조정한 정규분포 (Box-Muller) 후 범위 제한
+                normal = np.sqrt(-2.0 * np.log1p(-uniforms[:, 0])) * np.cos(2.0 * np.pi * uniforms[:, 1])
+                values = np.clip(min_val + (max_val - min_val) * adjustment + normal * std_dev, min_val, max_val)
+                if integral:
+                    return np.rint(values).astype(np.int64).tolist()
+                return np.round(values, 2).tolist()
+            return PropertyBatchGenerator(draws=2, generate=gauss_in_range)
+
+        if prop_type == "boolean":
+            probability = value_range.get("typical", 0.5)
+            if not isinstance(probability, (int, float)):
+                return None
+            return PropertyBatchGenerator(
+                draws=1, generate=lambda uniforms, tiers=None: (uniforms[:, 0] < probability).tolist()
+            )
+        return None
+
+    def _simple_number_bounds(
+        self, prop_name: str, event_name: Optional[str], value_range: Mapping[str, Any]
+    ) -> Optional[Tuple[int, int]]:
+        """random-simple 숫자 속성의 randint 범위 (이벤트 제약조건 우선, 비정상이면 None)"""
+        event_constraint = self.get_event_constraint(prop_name, event_name)
+        if event_constraint and isinstance(event_constraint, dict):
+            min_val = event_constraint.get("min", value_range.get("min", 1))
+            max_val = event_constraint.get("max", value_range.get("max", 1000))
+        else:
+            min_val = value_range.get("min", 1)
+            max_val = value_range.get("max", 1000)
+        try:
+            low, high = int(min_val), int(max_val)
+        except (TypeError, ValueError):
+            return None
+        return (low, high) if low <= high else None
+
+    def _generate_with_rules(self, prop_name: str, prop_type: str, user: Optional[UserRow], additional_context: Optional[Mapping[str, Any]] = None) -> Any:
         """규칙 기반 생성 (AI가 파악한 관계 활용)"""
         relationships = self.property_rules.get("property_relationships", {}).get(prop_name, {})
         depends_on = relationships.get("depends_on", [])
         formula_hint = relationships.get("formula_hint", "")
 
         # 의존하는 속성들의 값 가져오기
-        context_values = {}
+        dependency_values = {}
         if user is not None:
             for dep_prop in depends_on:
                 value = user.get_state(dep_prop)
                 if value is not None:
-                    context_values[dep_prop] = value
+                    dependency_values[dep_prop] = value
 
-        # additional_context 병합 (preset properties 등)
+        # additional_context 병합 (preset properties 등) - 복사 없이 additional_context가 우선하도록 겹쳐 봄
         if additional_context:
-            context_values.update(additional_context)
+            context_values = ChainMap(additional_context, dependency_values)
+        else:
+            context_values = dependency_values
 
         # AI가 제안한 공식 힌트 활용
         if formula_hint and context_values:
@@ -226,7 +459,7 @@ class IntelligentPropertyGenerator:
         # 공식 적용 실패 시 범위 기반 생성
         return self._generate_with_range(prop_name, prop_type, context_values)
 
-    def _generate_with_range(self, prop_name: str, prop_type: str, context: Dict[str, Any]) -> Any:
+    def _generate_with_range(self, prop_name: str, prop_type: str, context: Mapping[str, Any]) -> Any:
         """AI가 제공한 범위 정보 + 컨텍스트(engagement_tier)를 활용한 생성"""
         value_range = self.property_rules.get("value_ranges", {}).get(prop_name, {})
 
@@ -235,29 +468,18 @@ class IntelligentPropertyGenerator:
             max_val = value_range.get("max", 1000)
             typical = value_range.get("typical", (min_val + max_val) / 2)
 
-            # engagement_tier에 따라 범위 조정
+            # engagement_tier에 따라 범위 조정 (tier별 계수는 TIER_ADJUSTMENTS)
             engagement_tier = context.get("engagement_tier", "medium")
-
-            # tier별 범위 조정 계수
-            tier_adjustments = {
-                "very_low": 0.1,   # 최소값 근처 (10%)
-                "low": 0.3,        # 하위 (30%)
-                "medium": 0.5,     # 중간 (50%)
-                "high": 0.7,       # 상위 (70%)
-                "very_high": 0.9   # 최상위 (90%)
-            }
-
-            adjustment = tier_adjustments.get(engagement_tier, 0.5)
+            adjustment = self.TIER_ADJUSTMENTS.get(engagement_tier, 0.5)
 
             # 정규분포를 사용하되, 평균을 tier에 맞게 조정
-            import random
             if max_val > min_val:
                 # tier에 따라 평균 위치 조정
                 adjusted_mean = min_val + (max_val - min_val) * adjustment
 
                 # 표준편차를 범위의 1/6로 설정
                 std_dev = (max_val - min_val) / 6
-                value = random.gauss(adjusted_mean, std_dev)
+                value = self.rng.gauss(adjusted_mean, std_dev)
                 value = max(min_val, min(max_val, value))  # 범위 제한
 
                 # 정수형이면 반올림
@@ -273,12 +495,12 @@ class IntelligentPropertyGenerator:
         elif prop_type == "boolean":
             # AI 범위 정보에 확률이 있으면 활용
             probability = value_range.get("typical", 0.5)
-            return random.random() < probability
+            return self.rng.random() < probability
 
         else:
             return self._generate_simple(prop_name, prop_type, additional_context=context)
 
-    def _generate_contextual_string(self, prop_name: str, context: Dict[str, Any]) -> str:
+    def _generate_contextual_string(self, prop_name: str, context: Mapping[str, Any]) -> str:
         """
         컨텍스트를 고려한 현실적인 문자열 생성
         AI example_values 우선, 없으면 Faker 기반 폴백
@@ -291,7 +513,7 @@ class IntelligentPropertyGenerator:
 
         # AI가 제공한 예시 값이 있으면 그 중에서 랜덤 선택
         if example_values and isinstance(example_values, list) and len(example_values) > 0:
-            return random.choice(example_values)
+            return self.rng.choice(example_values)
 
         # Faker 폴백: 컨텍스트에서 국가 정보 추출하여 locale 선택
         faker = self._select_faker_by_context(context)
@@ -349,7 +571,7 @@ class IntelligentPropertyGenerator:
             return faker.sentence()
 
         elif "title" in prop_lower or "subject" in prop_lower:
-            return faker.sentence(nb_words=random.randint(3, 8)).rstrip('.')
+            return faker.sentence(nb_words=self.rng.randint(3, 8)).rstrip('.')
 
         # 6. 날짜/시간 관련 (문자열로)
         elif "date" in prop_lower and "time" not in prop_lower:
@@ -365,8 +587,8 @@ class IntelligentPropertyGenerator:
                 return faker.uuid4()
             # 컨텍스트 기반 ID
             else:
-                level = context.get("level", context.get("tmp_level", random.randint(1, 50)))
-                return f"{prop_name}_{level}_{random.randint(1000, 9999)}"
+                level = context.get("level", context.get("tmp_level", self.rng.randint(1, 50)))
+                return f"{prop_name}_{level}_{self.rng.randint(1000, 9999)}"
 
         # 8. 색상
         elif "color" in prop_lower or "colour" in prop_lower:
@@ -376,18 +598,18 @@ class IntelligentPropertyGenerator:
         elif "category" in prop_lower or "tag" in prop_lower or "type" in prop_lower:
             # 산업 무관하게 범용적인 카테고리명
             categories = ["category_a", "category_b", "category_c", "premium", "standard", "basic", "featured", "popular"]
-            return random.choice(categories)
+            return self.rng.choice(categories)
 
         # 10. 채널/소스 (마케팅 관련)
         elif "channel" in prop_lower or "source" in prop_lower or "medium" in prop_lower:
             channels = ["organic", "direct", "referral", "social", "email", "paid_search", "display", "affiliate"]
-            return random.choice(channels)
+            return self.rng.choice(channels)
 
         # 11. 기타 - 범용 포맷
         else:
-            return f"{prop_name}_{random.randint(1, 100)}"
+            return f"{prop_name}_{self.rng.randint(1, 100)}"
 
-    def _select_faker_by_context(self, context: Dict[str, Any]) -> Faker:
+    def _select_faker_by_context(self, context: Mapping[str, Any]):
         """
         컨텍스트에서 국가/지역 정보를 추출하여 적절한 Faker locale 선택
         """
@@ -411,29 +633,22 @@ class IntelligentPropertyGenerator:
         prop_type: str,
         event_name: Optional[str] = None,
         session_events: Optional[List[str]] = None,
-        additional_context: Optional[Dict[str, Any]] = None
+        additional_context: Optional[Mapping[str, Any]] = None
     ) -> Any:
         """단순 랜덤 생성 (AI 범위 정보 + 이벤트 컨텍스트 활용)"""
         value_range = self.property_rules.get("value_ranges", {}).get(prop_name, {})
 
         # 이벤트별 제약조건 확인 (AI가 분석한 결과)
-        event_constraint = None
-        if event_name:
-            event_constraints = self.property_rules.get("event_constraints", {})
-            # 이벤트 이름 매칭 (정확한 매칭 또는 부분 매칭)
-            for event_pattern, constraints in event_constraints.items():
-                if event_pattern in event_name.lower() or event_name.lower() in event_pattern:
-                    event_constraint = constraints.get(prop_name)
-                    break
-
-        # 컨텍스트 준비 (additional_context 포함)
-        context = additional_context.copy() if additional_context else {}
+        event_constraint = self.get_event_constraint(prop_name, event_name)
+
+        # 컨텍스트 준비 (additional_context 포함, 읽기만 하므로 복사하지 않음)
+        context = additional_context if additional_context else {}
 
         if prop_type == "string":
             # 예시 값 확인
             example_values = value_range.get("example_values", [])
             if example_values and isinstance(example_values, list) and len(example_values) > 0:
-                return random.choice(example_values)
+                return self.rng.choice(example_values)
             return self._generate_contextual_string(prop_name, context)
         elif prop_type == "number":
             # 이벤트 제약조건이 있으면 우선 적용
@@ -443,19 +658,19 @@ class IntelligentPropertyGenerator:
             else:
                 min_val = value_range.get("min", 1)
                 max_val = value_range.get("max", 1000)
-            return random.randint(int(min_val), int(max_val))
+            return self.rng.randint(int(min_val), int(max_val))
         elif prop_type == "boolean":
-            return random.choice([True, False])
+            return self.rng.choice([True, False])
         elif prop_type == "time":
-            return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            return self.rng.now().strftime("%Y-%m-%d %H:%M:%S")
         elif prop_type == "list":
             # AI 예시 값이 있으면 그 중에서 1-3개 선택
             example_values = value_range.get("example_values", [])
             if example_values and isinstance(example_values, list) and len(example_values) > 0:
-                count = random.randint(1, min(3, len(example_values)))
-                return random.sample(example_values, count)
+                count = self.rng.randint(1, min(3, len(example_values)))
+                return self.rng.sample(example_values, count)
             # 폴백: 간단한 리스트
-            return [self._generate_simple(f"{prop_name}_item", "string") for _ in range(random.randint(1, 3))]
+            return [self._generate_simple(f"{prop_name}_item", "string") for _ in range(self.rng.randint(1, 3))]
         elif prop_type == "object":
             return {"field_1": "value_1", "field_2": "value_2"}
         else:
@@ -465,9 +680,9 @@ class IntelligentPropertyGenerator:
         self,
         prop_name: str,
         prop_type: str,
-        user: Optional[User],
+        user: Optional[UserRow],
         event_name: Optional[str],
-        additional_context: Optional[Dict[str, Any]] = None
+        additional_context: Optional[Mapping[str, Any]] = None
     ) -> Any:
         """
         AI에게 컨텍스트를 제공하고 값을 생성 요청
@@ -477,50 +692,22 @@ class IntelligentPropertyGenerator:
         # 실제 운영에서는 배치로 여러 속성을 한 번에 요청하는 것이 효율적
         return self._generate_with_rules(prop_name, prop_type, user, additional_context)
 
-    def _safe_eval_formula(self, formula: str, context: Dict[str, Any]) -> Optional[float]:
+    def _safe_eval_formula(self, formula: str, context: Mapping[str, Any]) -> Optional[float]:
         """
         안전하게 공식 평가
         예: "level * 1000" -> context["level"] * 1000
-        """
-        try:
-            # 허용된 변수와 연산만 사용
-            allowed_vars = {k: v for k, v in context.items() if isinstance(v, (int, float))}
-
-            # 간단한 산술 연산만 허용
-            # eval 대신 ast.literal_eval 사용하거나 파싱
-            import ast
-            import operator
-
-            # 지원하는 연산자
-            ops = {
-                ast.Add: operator.add,
-                ast.Sub: operator.sub,
-                ast.Mult: operator.mul,
-                ast.Div: operator.truediv,
-            }
-
-            # 공식에서 변수 치환
-            for var_name, var_value in allowed_vars.items():
-                if var_name in formula:
-                    formula = formula.replace(var_name, str(var_value))
-
-            # 단순 계산
-            try:
-                result = eval(formula, {"__builtins__": {}}, {})
-                if isinstance(result, (int, float)):
-                    return result
-            except:
-                pass
-
-        except Exception:
-            pass
 
-        return None
+        공식은 utils.formula로 한 번만 컴파일되어 캐시되며, 허용되지 않는 공식이나 숫자가 아닌 변수는 None
+        """
+        compiled = try_compile_formula(formula)
+        if compiled is None:
+            return None
+        return compiled(context.get)
 
     def should_update_user_property(
         self,
         event_name: str,
-        user: User,
+        user: UserRow,
         event_properties: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
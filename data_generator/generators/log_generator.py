@@ -1,60 +1,121 @@
 """
 Log generator - generates ThinkingEngine format JSON logs.
 """
-import random
+import os
+import queue
+import time
+import traceback
+import dataclasses
+import itertools
+import multiprocessing
+from types import MappingProxyType
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Tuple, Mapping, Sequence, Union
 from pathlib import Path
 import json
 
+import numpy as np
+
 from ..models.user import User, LifecycleStage
-from ..models.event import TrackEvent, UserSetEvent, UserSetOnceEvent, UserAddEvent
+from ..models.user_store import UserStore, UserRow
+from ..models.event import TrackEvent, UserSetEvent, UserSetOnceEvent, UserAddEvent, EventLineEncoder
 from ..models.taxonomy import EventTaxonomy, UpdateMethod
 from ..config.config_schema import DataGeneratorConfig
 from ..generators.behavior_engine import BehaviorEngine
 from ..generators.preset_properties import PresetPropertiesGenerator
 from ..generators.intelligent_property_generator import IntelligentPropertyGenerator
 from ..generators.property_update_engine import PropertyUpdateEngine
+from ..generators.event_plan import EventPlan, PropertyPlan
+from ..patterns.session_model import SessionEventPlan, STEP_BITS
 from ..ai.base_client import BaseAIClient
-from ..utils.property_validator import PropertyNameValidator
+from ..utils.property_validator import PropertyNameValidator, PropertyKeyRemap
+from ..utils.rng import RandomStreams, stable_hash64
+from ..utils.telemetry import (
+    Telemetry, STAGE_USER_DAY, STAGE_SESSION_PLANNING, STAGE_PROPERTY_GENERATION,
+    STAGE_SANITIZE, STAGE_SERIALIZATION, STAGE_FILE_IO,
+)
+from ..writers.jsonl_writer import JsonlStreamWriter, open_compressed, output_file_path, parse_line_header
+from ..writers.report import FileStats, GenerationReport
+
+
+# 일괄 생성하지 않은 속성 자리 (이벤트 로그 생성 시 속성별 생성 함수로 채움)
+_PENDING = object()
 
 
 class LogGenerator:
     """Generates realistic log data in ThinkingEngine JSON format"""
 
+    # 이벤트 속성값을 (이벤트, 속성)별로 한 번에 생성하는 유저 묶음 크기 (메모리와 NumPy 호출 수의 절충)
+    PROPERTY_BLOCK_USERS = 512
+
     def __init__(
         self,
         config: DataGeneratorConfig,
         taxonomy: EventTaxonomy,
         behavior_engine: BehaviorEngine,
-        users: List[User],
+        users: Union[UserStore, Sequence[User]],
         ai_client: Optional[BaseAIClient] = None,
         intelligent_generator: Optional[IntelligentPropertyGenerator] = None,
+        rng: Optional[RandomStreams] = None,
+        update_engine: Optional[PropertyUpdateEngine] = None,
+        telemetry: Optional[Telemetry] = None,
+        on_file_complete: Optional[Callable[[FileStats], None]] = None,
     ):
         self.config = config
         self.taxonomy = taxonomy
         self.behavior_engine = behavior_engine
-        self.users = users
+        # 유저 집단은 열 저장소로 보관 (User 리스트가 전달되면 변환)
+        self.users = users if isinstance(users, UserStore) else UserStore.from_users(users)
+        self.user_indices: np.ndarray = np.arange(len(self.users))  # 이 프로세스가 담당하는 유저 (샤드면 일부)
         self.logs: List[str] = []
 
+        # 공유 난수 스트림 - 유저-날짜마다 다시 시드해서 샤딩 여부와 무관하게 같은 결과를 만듦
+        self.rng = rng or RandomStreams(config.seed)
+        self.behavior_engine.rng = self.rng
+        self.user_stream_ids: np.ndarray = self.users.stream_ids  # user_indices 순서의 난수 스트림 id
+
+        # 완성된 출력 파일을 바로 넘겨받을 콜백 (생성과 동시에 업로드하는 파이프라인 등)
+        # 생성 스레드에서 호출되므로 콜백이 막히면 생성도 멈춤 (백프레셔)
+        self.on_file_complete = on_file_complete
+
+        # 생성된 로그는 self.logs에 모으지 않고 writer로 바로 흘려보냄
+        self.writer = JsonlStreamWriter(
+            flush_size=config.flush_size,
+            compression=config.output_compression,
+            compression_level=config.compression_level,
+            max_file_bytes=int(config.max_file_mb * 1024 * 1024) if config.max_file_mb else None,
+            split_by_hour=config.split_by_hour,
+            on_file_closed=on_file_complete,
+        )
+        self.report = GenerationReport(output_dir=Path(config.output_dir))
+
+        # 기본은 pydantic 모델을 거치지 않고 바로 직렬화 (validate_events=True면 모델 검증 경로 사용)
+        self.event_encoder = EventLineEncoder(config.json_backend)
+
+        # 진행률/단계별 시간 계측 (profile_stages가 아니면 유저-날짜 카운터만 갱신)
+        self.telemetry = telemetry or Telemetry.from_config(config)
+
         # 유저별 캐싱
-        self.user_preset_cache: Dict[str, Dict[str, Any]] = {}
-        self.user_set_generated: set = set()  # 이미 user_set 생성된 유저 추적
+        self.user_preset_cache: Dict[int, Mapping[str, Any]] = {}  # 유저 인덱스 -> 읽기 전용 매핑 (복사 없이 컨텍스트로 전달)
 
         # 프리셋 속성 생성기는 나중에 초기화 (intelligent_generator 필요)
         self.preset_generator = None
 
+        # 이벤트별 속성 생성 계획 (AI 분석 후 _compile_event_plans에서 생성)
+        self.event_plans: Dict[str, EventPlan] = {}
+        self.common_property_plans: Tuple[PropertyPlan, ...] = ()
+        self.user_set_key_remap = PropertyKeyRemap()
+
         # 제품 정보 (AI 생성기들에서 공통 사용)
-        self.product_info = {
-            "industry": config.industry,
-            "platform": config.platform,
-            "product_name": config.product_name,
-            "product_description": config.product_description or ""
-        }
+        self.product_info = self.product_info_for(config)
 
         # AI 기반 지능형 속성 생성기 (외부에서 전달받거나 직접 생성)
         self.intelligent_generator: Optional[IntelligentPropertyGenerator] = intelligent_generator
-        self.update_engine: Optional[PropertyUpdateEngine] = None
+        if self.intelligent_generator:
+            self.intelligent_generator.use_random_streams(self.rng)
+        self.update_engine: Optional[PropertyUpdateEngine] = update_engine  # 외부에서 미리 분석된 엔진 재사용
+        if self.update_engine:
+            self.update_engine.rng = self.rng
         self._intelligent_generator_needs_analysis = False  # 분석이 필요한지 추적
 
         # intelligent_generator가 외부에서 전달되지 않았고 ai_client가 있으면 직접 생성 (레거시 지원)
@@ -70,26 +131,47 @@ class LogGenerator:
             self.intelligent_generator = IntelligentPropertyGenerator(
                 ai_client=ai_client,
                 taxonomy_properties=all_properties,
-                product_info=self.product_info
+                product_info=self.product_info,
+                rng=self.rng,
             )
             self._intelligent_generator_needs_analysis = True  # 방금 생성했으므로 분석 필요
 
-        # 속성 업데이트 엔진 초기화 (ai_client 있을 때만)
-        if ai_client:
+        # 속성 업데이트 엔진 초기화 (전달받지 않았고 ai_client 있을 때만)
+        if not self.update_engine and ai_client:
             self.update_engine = PropertyUpdateEngine(
                 ai_client=ai_client,
                 taxonomy=taxonomy,
-                product_info=self.product_info
+                product_info=self.product_info,
+                rng=self.rng,
             )
 
         # 생성된 파일 경로 리스트
         self.generated_files: List[Path] = []
 
-    def generate(self) -> List[str]:
+    @staticmethod
+    def product_info_for(config: DataGeneratorConfig) -> Dict[str, Any]:
+        """AI 생성기들에 전달하는 제품 정보 (PropertyUpdateEngine 캐시 키/프롬프트에 사용)"""
+        return {
+            "industry": config.industry,
+            "platform": config.platform,
+            "product_name": config.product_name,
+            "product_description": config.product_description or ""
+        }
+
+    @property
+    def total_logs(self) -> int:
+        """지금까지 기록된 전체 로그 수"""
+        return self.report.total_lines
+
+    def generate(self) -> GenerationReport:
         """
         Generate all logs for the configured period (daily file split mode)
         각 날짜별로 파일을 생성하고 바로 저장
+
+        Returns:
+            파일별 라인/바이트/이벤트 수를 담은 GenerationReport (기록 중에 집계)
         """
+        started_at = time.perf_counter()
         total_days = (self.config.end_date - self.config.start_date).days + 1
         print(f"Generating logs for {len(self.users)} users from {self.config.start_date} to {self.config.end_date} ({total_days} days)")
 
@@ -107,13 +189,82 @@ class LogGenerator:
             self.preset_generator = PresetPropertiesGenerator(
                 platform=self.config.platform,
                 product_name=self.config.product_name,
-                intelligent_generator=self.intelligent_generator
+                intelligent_generator=self.intelligent_generator,
+                rng=self.rng,
             )
 
+        # 이벤트별 속성 생성 계획 컴파일 (핫 루프에서는 계획만 실행)
+        self._compile_event_plans()
+        self._instrument()
+
         # 출력 디렉토리 생성
         output_dir = Path(self.config.output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
+        self.telemetry.start(len(self.users) * total_days)
+        if self.config.workers > 1 and len(self.users) > 1:
+            self._generate_sharded(total_days)
+        else:
+            self._generate_serial(total_days)
+        self.telemetry.finish()
+
+        self.report.users = len(self.users)
+        self.report.days = total_days
+        self.report.elapsed_seconds = time.perf_counter() - started_at
+        self.report.stage_seconds = {stage: round(seconds, 4) for stage, seconds in self.telemetry.seconds.items()}
+
+        print(f"\n✓ Generation complete!")
+        print(f"  Total days: {total_days}")
+        print(f"  Log files: {len(self.generated_files)}")
+        print(f"  Total logs: {self.report.total_lines:,} ({self.report.total_bytes / 1024 / 1024:.1f} MB)")
+        print(f"  Files: {output_dir}")
+        if self.telemetry.detailed:
+            print("  단계별 시간:")
+            for line in self.telemetry.summary_lines():
+                print(f"    {line}")
+
+        return self.report
+
+    def _instrument(self):
+        """
+        단계별 시간 측정 대상 메서드를 감쌈 (telemetry.detailed일 때만, 아니면 아무것도 안 함)
+
+        속성 생성 함수와 키 정제 테이블은 컴파일된 계획마다 감싸므로 _compile_event_plans 이후에 호출.
+        """
+        telemetry = self.telemetry
+        if not telemetry.detailed:
+            return
+
+        telemetry.instrument(self, "_generate_user_day_logs", STAGE_USER_DAY)
+        telemetry.instrument(self.behavior_engine, "plan_daily_sessions", STAGE_SESSION_PLANNING)
+        telemetry.instrument(self.behavior_engine, "plan_session_events", STAGE_SESSION_PLANNING)
+        telemetry.instrument(self, "_prefetch_property_values", STAGE_PROPERTY_GENERATION)
+        telemetry.instrument(self.behavior_engine, "select_events_for_session", STAGE_SESSION_PLANNING)
+        telemetry.instrument(self.preset_generator, "generate_event_specific_properties", STAGE_PROPERTY_GENERATION)
+        if self.intelligent_generator:
+            telemetry.instrument(self.intelligent_generator, "generate_property_value", STAGE_PROPERTY_GENERATION)
+        telemetry.instrument(self.user_set_key_remap, "apply", STAGE_SANITIZE)
+        for plan in self.event_plans.values():
+            telemetry.instrument(plan.key_remap, "apply", STAGE_SANITIZE)
+        telemetry.instrument(self.event_encoder, "track", STAGE_SERIALIZATION)
+        telemetry.instrument(self.event_encoder, "user", STAGE_SERIALIZATION)
+        telemetry.instrument(self.writer, "flush", STAGE_FILE_IO)
+
+        # 계획에 들어 있는 속성 생성 함수 교체 (PropertyPlan은 불변이므로 새로 만듦)
+        def timed_plans(plans):
+            return tuple(
+                dataclasses.replace(plan, generate=telemetry.timed(STAGE_PROPERTY_GENERATION, plan.generate))
+                for plan in plans
+            )
+
+        self.common_property_plans = timed_plans(self.common_property_plans)
+        self.event_plans = {
+            event_name: dataclasses.replace(plan, properties=timed_plans(plan.properties))
+            for event_name, plan in self.event_plans.items()
+        }
+
+    def _generate_serial(self, total_days: int):
+        """단일 프로세스에서 날짜별로 순차 생성"""
         current_date = self.config.start_date
         day_count = 0
 
@@ -121,61 +272,302 @@ class LogGenerator:
             day_count += 1
             print(f"\n[{day_count}/{total_days}] Generating logs for {current_date}...")
 
-            # 해당 날짜의 로그 생성
-            self.logs = []  # 메모리 초기화
+            # 해당 날짜의 로그를 일별 파일로 바로 스트리밍
+            daily_file = self._get_daily_file_path(current_date)
+            self.writer.open(daily_file)
             self._generate_day_logs(current_date)
+            file_stats = self.writer.close()
 
-            # 즉시 파일로 저장
-            if self.logs:
-                daily_file = self._save_daily_logs(current_date)
-                self.generated_files.append(daily_file)
-                print(f"  ✓ Saved {len(self.logs):,} logs to {daily_file.name}")
+            if file_stats:
+                self._record_files(file_stats)
             else:
                 print(f"  ⚠ No logs generated for {current_date}")
 
             current_date += timedelta(days=1)
 
-        total_logs = sum(self._count_lines_in_file(f) for f in self.generated_files)
-        print(f"\n✓ Generation complete!")
-        print(f"  Total days: {len(self.generated_files)}")
-        print(f"  Total logs: {total_logs:,}")
-        print(f"  Files: {output_dir}")
+    def _generate_sharded(self, total_days: int):
+        """
+        유저를 워커 수만큼 샤드로 나눠 프로세스별로 생성한 뒤 일별 파일로 병합
 
-        # 마지막 날짜의 로그를 반환 (하위 호환성)
-        return self.logs
+        각 샤드는 전체 기간 동안 같은 유저만 담당하므로 유저별 상태
+        (current_state, lifecycle_stage, user_preset_cache)는 소유 샤드 안에서만 갱신된다.
+        샤드는 하루를 끝낼 때마다 부분 파일을 보고하고, 모든 샤드가 끝낸 날짜부터 순서대로 병합한다.
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            print("  ⚠ 이 플랫폼은 fork를 지원하지 않아 단일 프로세스로 생성합니다")
+            self._generate_serial(total_days)
+            return
 
-    def _generate_day_logs(self, date: datetime):
-        """Generate logs for all users for a single day"""
-        # Shuffle users to randomize order
-        daily_users = self.users.copy()
-        random.shuffle(daily_users)
+        ctx = multiprocessing.get_context("fork")
+        shard_count = min(self.config.workers, len(self.users))
+        print(f"  ⚙ {shard_count}개 프로세스로 유저 샤딩 생성")
 
-        for user in daily_users:
-            self._generate_user_day_logs(user, date)
+        # 워커마다 같은 AI 호출을 반복하지 않도록 fork 전에 행동 패턴을 캐싱
+        self._prefetch_behavior_patterns()
 
-    def _generate_user_day_logs(self, user: User, date: datetime):
-        """Generate logs for a single user for a single day"""
-        # Get behavior pattern - use scenario_key if available, otherwise use segment
-        scenario_key = user.metadata.get("scenario_key", user.segment.value)
-        behavior_pattern = self.behavior_engine.get_behavior_pattern(scenario_key)
+        result_queue = ctx.Queue()
+        workers = [
+            ctx.Process(target=self._run_shard, args=(shard_index, shard_count, result_queue), daemon=True)
+            for shard_index in range(shard_count)
+        ]
+        for worker in workers:
+            worker.start()
 
-        # Generate session times
-        sessions = self.behavior_engine.generate_daily_sessions(
-            user=user,
-            date=datetime.combine(date, datetime.min.time()),
-            behavior_pattern=behavior_pattern,
-        )
+        dates = [self.config.start_date + timedelta(days=i) for i in range(total_days)]
+        completed: Dict[int, Dict[int, Tuple[FileStats, np.ndarray]]] = {}
+        next_day = 0
+        finished = 0
+
+        try:
+            while finished < shard_count:
+                try:
+                    shard_index, day_index, payload = result_queue.get(timeout=1.0)
+                except queue.Empty:
+                    dead = [w for w in workers if not w.is_alive() and w.exitcode not in (0, None)]
+                    if dead:
+                        raise RuntimeError(f"샤드 워커가 비정상 종료되었습니다 (exitcode={dead[0].exitcode})")
+                    continue
+
+                if day_index is None:
+                    # 종료 메시지: 실패면 traceback 문자열, 성공이면 워커의 단계별 측정 결과
+                    if isinstance(payload, str):
+                        raise RuntimeError(f"샤드 {shard_index} 생성 실패:\n{payload}")
+                    self.telemetry.merge(payload)
+                    finished += 1
+                    continue
+
+                completed.setdefault(day_index, {})[shard_index] = payload
+                while len(completed.get(next_day, {})) == shard_count:
+                    print(f"\n[{next_day + 1}/{total_days}] Merging shards for {dates[next_day]}...")
+                    day_parts = completed.pop(next_day)
+                    with self.telemetry.stage(STAGE_FILE_IO):
+                        self._merge_shard_parts(dates[next_day], day_parts, shard_count)
+                    self.telemetry.advance(len(self.users), sum(stats.lines for stats, _ in day_parts.values()))
+                    next_day += 1
+        finally:
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+
+    def _run_shard(self, shard_index: int, shard_count: int, result_queue):
+        """
+        워커 프로세스: 담당 샤드의 유저만으로 전체 기간을 생성하고
+        날짜별 부분 파일 통계와 유저별 라인 수(그날 처리 순서대로)를 보고
+        """
+        try:
+            self.user_indices = self.user_indices[shard_index::shard_count]
+            self.user_stream_ids = self.users.stream_ids[self.user_indices]
+
+            # 부분 파일은 병합 후 지우는 임시 파일이므로 압축/분할 없이 기록 (병합할 때 적용)
+            self.writer = JsonlStreamWriter(flush_size=self.config.flush_size)
+            self.telemetry.instrument(self.writer, "flush", STAGE_FILE_IO)
+
+            # 진행률은 부모가 병합 시점에 보고하고, 프로파일은 첫 샤드만 남김
+            self.telemetry.on_progress = None
+            if shard_index != 0:
+                self.telemetry.profile_day = None
+
+            output_dir = Path(self.config.output_dir)
+            current_date = self.config.start_date
+            day_index = 0
+
+            while current_date <= self.config.end_date:
+                part_path = output_dir / f".logs_{current_date.strftime('%Y%m%d')}.shard{shard_index:03d}.part.jsonl"
+                self.writer.open(part_path)
+                line_counts = self._generate_day_logs(current_date)
+                part_stats = self.writer.close()
+                part_stats = part_stats[0] if part_stats else FileStats(path=part_path)
+                result_queue.put((shard_index, day_index, (part_stats, np.asarray(line_counts, dtype=np.int64))))
+
+                current_date += timedelta(days=1)
+                day_index += 1
+
+            result_queue.put((shard_index, None, self.telemetry.snapshot()))
+        except Exception:
+            result_queue.put((shard_index, None, traceback.format_exc()))
+
+    def _prefetch_behavior_patterns(self):
+        """모든 시나리오의 행동 패턴을 미리 로드"""
+        scenario_keys = {self.users.scenario_keys[code] for code in np.unique(self.users.scenario_codes).tolist()}
+        for scenario_key in sorted(scenario_keys):
+            self.behavior_engine.get_behavior_pattern(scenario_key)
+
+    def _merge_shard_parts(self, date, parts: Dict[int, Tuple[FileStats, np.ndarray]], shard_count: int):
+        """
+        샤드별 부분 파일을 합쳐 logs_YYYYMMDD.jsonl 생성
+
+        그날의 전체 유저 처리 순서(_day_order)대로 각 유저의 라인 블록을 담당 샤드의 부분 파일에서
+        꺼내 이어 붙이므로, 단일 프로세스로 생성한 파일과 바이트 단위로 같다.
+        크기/시간 분할이 켜져 있으면 라인마다 writer를 거쳐 단일 프로세스와 같은 규칙으로 나눈다.
+        """
+        output_path = self._get_daily_file_path(date)
+        part_stats = [parts[shard_index][0] for shard_index in range(shard_count)]
+
+        if sum(stats.lines for stats in part_stats) == 0:
+            print(f"  ⚠ No logs generated for {date}")
+            return
+
+        # 유저 i는 샤드 i % shard_count 담당 (_run_shard의 슬라이싱과 동일)
+        order = self._day_order(self.user_stream_ids, date.toordinal())
+        owner_shards = (order % shard_count).tolist()
+        line_counts = [iter(parts[shard_index][1].tolist()) for shard_index in range(shard_count)]
+
+        # 라인이 없는 샤드는 부분 파일을 만들지 않음
+        part_files = [open(stats.path, 'rb') if stats.lines else None for stats in part_stats]
+        try:
+            if self.writer.split_by_hour or self.writer.max_file_bytes:
+                self.writer.open(output_path)
+                write = self.writer.write
+                for shard_index in owner_shards:
+                    count = next(line_counts[shard_index])
+                    for line in itertools.islice(part_files[shard_index], count):
+                        log_type, hour, event_name = parse_line_header(line)
+                        write(line[:-1].decode('utf-8'), log_type, event_name, hour)
+                file_stats = self.writer.close()
+            else:
+                day_stats = FileStats.merged(
+                    output_file_path(output_path, self.writer.compression), part_stats,
+                )
+                out, raw = open_compressed(day_stats.path, self.writer.compression, self.writer.compression_level)
+                try:
+                    for shard_index in owner_shards:
+                        count = next(line_counts[shard_index])
+                        if count:
+                            out.writelines(itertools.islice(part_files[shard_index], count))
+                finally:
+                    out.close()
+                    if raw is not out:
+                        raw.close()
+                day_stats.disk_bytes = os.path.getsize(day_stats.path)
+                file_stats = [day_stats]
+                if self.on_file_complete is not None:
+                    self.on_file_complete(day_stats)
+        finally:
+            for part_file in part_files:
+                if part_file is not None:
+                    part_file.close()
+
+        for stats in part_stats:
+            if stats.lines:
+                os.remove(stats.path)
+
+        self._record_files(file_stats)
+
+    def _record_files(self, file_stats: List[FileStats]):
+        """완성된 하루치 파일들을 생성 목록과 리포트에 반영"""
+        for stats in file_stats:
+            self.generated_files.append(stats.path)
+            self.report.files.append(stats)
+
+        lines = sum(stats.lines for stats in file_stats)
+        if len(file_stats) == 1:
+            print(f"  ✓ Saved {lines:,} logs to {file_stats[0].path.name}")
+        else:
+            print(f"  ✓ Saved {lines:,} logs to {len(file_stats)} files ({file_stats[0].path.name} ...)")
+
+    def _day_order(self, stream_ids: np.ndarray, day: int) -> np.ndarray:
+        """
+        하루 안의 유저 처리 순서 (인덱스 배열)
+
+        (seed, day, 유저 스트림 id)로 정해지는 키로 정렬하므로 유저 목록 일부(샤드)만 정렬해도
+        전체 순서에서의 상대 순서가 유지된다.
+        """
+        keys = self.rng.counter_bits(stream_ids, RandomStreams.SCOPE_DAY_ORDER, day)
+        return np.lexsort((stream_ids, keys))
+
+    def _generate_day_logs(self, date: datetime) -> List[int]:
+        """
+        Generate logs for all users for a single day
+
+        Returns:
+            처리 순서대로의 유저별 기록 라인 수 (샤드 병합에 사용)
+        """
+        with self.telemetry.profile(date):
+            return self._generate_day_logs_for(date)
+
+    def _generate_day_logs_for(self, date: datetime) -> List[int]:
+        """_generate_day_logs 본체 (프로파일 구간 밖에서 분리)"""
+        day = date.toordinal()
+
+        # 유저 처리 순서를 날짜마다 섞음 (전체 유저 기준으로 결정적인 순서)
+        order = self._day_order(self.user_stream_ids, day)
+        indices = self.user_indices[order]
+        daily_users = self.users.rows(indices)
+        stream_ids = self.user_stream_ids[order].tolist()
+
+        # Get behavior pattern - 시나리오 키별로 한 번만 조회
+        scenario_patterns = [
+            self.behavior_engine.get_behavior_pattern(scenario_key) for scenario_key in self.users.scenario_keys
+        ]
+        behavior_patterns = [scenario_patterns[code] for code in self.users.scenario_codes[indices].tolist()]
+
+        # 전체 유저의 세션을 한 번에 계획 (활동 여부, 세션 수, 시작 시각, 길이)
+        day_start = datetime.combine(date, datetime.min.time())
+        plan = self.behavior_engine.plan_daily_sessions(daily_users, day_start, behavior_patterns, stream_ids)
+        # 전체 세션의 이벤트 순서도 세그먼트/단계별 세션 모델로 한 번에 샘플링
+        event_plan = self.behavior_engine.plan_session_events(daily_users, day, plan, stream_ids)
+        session_counts = plan.session_counts.tolist()
+        session_offsets = plan.session_offsets.tolist()
 
         # Generate logs for each session
-        for session_start, session_end in sessions:
-            self._generate_session_logs(user, session_start, session_end, behavior_pattern)
+        line_counts = []
+        advance = self.telemetry.advance
+        block_end = 0
+        property_values: Dict[int, List[Optional[tuple]]] = {}
+        for i, (user, stream_id, behavior_pattern) in enumerate(zip(daily_users, stream_ids, behavior_patterns)):
+            if i >= block_end:
+                # 다음 유저 묶음의 세션에서 일괄 생성 가능한 속성값을 미리 생성
+                block_end = min(i + self.PROPERTY_BLOCK_USERS, len(daily_users))
+                property_values = self._prefetch_property_values(
+                    event_plan, session_offsets[i], session_offsets[block_end]
+                )
+            lines_before = self.writer.lines_written
+            if session_counts[i]:
+                self._generate_user_day_logs(
+                    user, stream_id, day, behavior_pattern, plan.sessions_for(i, day_start),
+                    event_plan, session_offsets[i], property_values,
+                )
+            lines = self.writer.lines_written - lines_before
+            line_counts.append(lines)
+            advance(1, lines)
+
+        return line_counts
+
+    def _generate_user_day_logs(
+        self,
+        user: UserRow,
+        stream_id: int,
+        day: int,
+        behavior_pattern: Dict[str, Any],
+        sessions: List[Tuple[datetime, datetime]],
+        event_plan: Optional[SessionEventPlan] = None,
+        first_session_index: int = 0,
+        property_values: Optional[Mapping[int, List[Optional[tuple]]]] = None,
+    ):
+        """
+        유저 1명의 하루치 세션 로그 생성
+
+        event_plan이 있으면 세션 i의 이벤트는 event_plan의 first_session_index + i번째 세션을 사용하고,
+        property_values(_prefetch_property_values 결과)에 미리 생성된 속성값이 있으면 그 값을 쓴다.
+        """
+        # 유저-날짜 단위 난수 스트림 (다른 유저의 생성 여부/순서와 무관)
+        self.rng.seed_user_day(stream_id, day)
+        for session_index, (session_start, session_end) in enumerate(sessions, first_session_index):
+            self._generate_session_logs(
+                user, session_start, session_end, behavior_pattern,
+                event_plan, session_index if event_plan is not None else None, property_values,
+            )
 
     def _generate_session_logs(
         self,
-        user: User,
+        user: UserRow,
         session_start: datetime,
         session_end: datetime,
         behavior_pattern: Dict[str, Any],
+        event_plan: Optional[SessionEventPlan] = None,
+        session_index: Optional[int] = None,
+        property_values: Optional[Mapping[int, List[Optional[tuple]]]] = None,
     ):
         """Generate logs for a single session"""
         session_duration = (session_end - session_start).total_seconds() / 60  # minutes
@@ -185,11 +577,18 @@ class LogGenerator:
             user=user,
             session_duration_minutes=session_duration,
             behavior_pattern=behavior_pattern,
+            event_plan=event_plan,
+            session_index=session_index,
         )
 
         if not event_names:
             return
 
+        # 계획대로 샘플링된 세션이면 미리 생성된 속성값 사용 (생명주기 전환으로 다시 샘플링된 세션은 제외)
+        session_values = None
+        if property_values and event_plan is not None and event_names is event_plan.events[session_index]:
+            session_values = property_values.get(session_index)
+
         # Distribute events across session duration
         event_times = self._distribute_event_times(session_start, session_end, len(event_names))
 
@@ -197,16 +596,17 @@ class LogGenerator:
         session_context = {
             "session_start": session_start,
             "session_duration": int((session_end - session_start).total_seconds()),
-            "is_resume": random.random() < 0.3,  # 30% 확률로 백그라운드에서 재시작
-            "background_duration": random.randint(10, 300),
+            "is_resume": self.rng.random() < 0.3,  # 30% 확률로 백그라운드에서 재시작
+            "background_duration": self.rng.randint(10, 300),
         }
 
         # 세션 이벤트 시퀀스 추적 (이벤트 컨텍스트 기반 속성 생성에 활용)
         session_events = []
 
         # Generate each event
-        for event_name, event_time in zip(event_names, event_times):
-            self._generate_event_log(user, event_name, event_time, session_context, session_events)
+        for position, (event_name, event_time) in enumerate(zip(event_names, event_times)):
+            prefetched = session_values[position] if session_values is not None else None
+            self._generate_event_log(user, event_name, event_time, session_context, session_events, prefetched)
             session_events.append(event_name)
 
     def _distribute_event_times(
@@ -227,26 +627,25 @@ class LogGenerator:
 
         times = []
         for i in range(count):
-            offset = i * interval + random.uniform(-interval * 0.2, interval * 0.2)
+            offset = i * interval + self.rng.uniform(-interval * 0.2, interval * 0.2)
             offset = max(0, min(offset, duration))
             times.append(start + timedelta(seconds=offset))
 
         return sorted(times)
 
-    def _generate_initial_user_set(self, user: User, event_time: datetime):
+    def _generate_initial_user_set(self, user: UserRow, event_time: datetime):
         """
         Generate initial user_set event with USER properties
         Called on user's first event to set all user properties from taxonomy
         """
-        # Get user_properties from user metadata (generated by user_generator)
-        user_props = user.metadata.get("user_properties", {})
+        # Get user_properties (generated by user_generator on first access)
+        user_props = user.user_properties
 
         if not user_props:
             return
 
-        # preset properties를 context로 준비
-        preset_props = self._get_user_preset_properties(user)
-        additional_context = preset_props.copy()
+        # preset properties를 context로 준비 (읽기 전용이므로 복사하지 않음)
+        additional_context = self._get_user_preset_properties(user)
 
         # For None values, try to generate using intelligent_generator
         final_props = {}
@@ -274,50 +673,112 @@ class LogGenerator:
             return
 
         # Sanitize property names
-        final_props = PropertyNameValidator.sanitize_properties(final_props)
+        final_props = self.user_set_key_remap.apply(final_props)
 
         # Create user_set event
-        user_set = UserSetEvent(
-            **{
-                "#type": "user_set",
-                "#account_id": user.account_id,
-                "#distinct_id": user.distinct_id,
-                "#time": self._format_time(event_time),
-                "properties": final_props,
-            }
-        )
-        self.logs.append(user_set.to_json_line())
+        self._emit_user_set(user, event_time, final_props)
 
         # Update user's internal state
         user.update_state(final_props)
 
-    def _generate_event_log(self, user: User, event_name: str, event_time: datetime, session_context: Optional[Dict[str, Any]] = None, session_events: Optional[List[str]] = None):
-        """Generate a track event log"""
+    def _prefetch_property_values(
+        self,
+        event_plan: SessionEventPlan,
+        begin: int,
+        end: int,
+    ) -> Dict[int, List[Optional[tuple]]]:
+        """
+        세션 [begin, end)에 계획된 이벤트의 일괄 생성 가능한 속성값을 (이벤트, 속성)별로 한 번에 생성
+
+        난수는 (유저, 날짜, 세션 번호, 이벤트 위치, 이벤트/속성)으로만 정해지므로 샤딩/처리 순서와 무관하다.
+
+        Returns:
+            세션 인덱스 → 이벤트 위치별 값 튜플 (plan.properties 순서, 일괄 생성하지 않는 속성은 _PENDING,
+            일괄 생성할 속성이 없는 이벤트는 None)
+        """
+        batched_plans = self._batched_event_plans
+        occurrences: Dict[str, List[Tuple[int, int]]] = {}
+        if batched_plans:
+            for session_index in range(begin, end):
+                for step, event_name in enumerate(event_plan.events[session_index] or ()):
+                    if event_name in batched_plans:
+                        occurrences.setdefault(event_name, []).append((session_index, step))
+
+        values: Dict[int, List[Optional[tuple]]] = {}
+        for event_name, positions in occurrences.items():
+            plan = batched_plans[event_name]
+            session_indices, steps = np.array(positions, dtype=np.int64).T
+            session_ids = event_plan.session_ids[session_indices]
+            session_numbers = event_plan.session_numbers[session_indices].astype(np.uint64)
+            sub = (session_numbers << np.uint64(STEP_BITS)) | steps.astype(np.uint64)
+
+            columns: List[Any] = [itertools.repeat(_PENDING)] * len(plan.properties)
+            for k in plan.batched:
+                prop_plan = plan.properties[k]
+                batch = prop_plan.generate_batch
+                uniforms = np.empty((len(positions), batch.draws))
+                for draw in range(batch.draws):
+                    uniforms[:, draw] = self.rng.counter_uniforms(
+                        session_ids, RandomStreams.SCOPE_PROPERTY_VALUES, event_plan.day, prop_plan.batch_key, draw,
+                        sub=sub,
+                    )
+                columns[k] = batch.generate(uniforms, None)
+
+            for (session_index, step), row in zip(positions, zip(*columns)):
+                session_values = values.get(session_index)
+                if session_values is None:
+                    session_values = values[session_index] = [None] * len(event_plan.events[session_index])
+                session_values[step] = row
+        return values
+
+    def _generate_event_log(
+        self,
+        user: UserRow,
+        event_name: str,
+        event_time: datetime,
+        session_context: Optional[Dict[str, Any]] = None,
+        session_events: Optional[List[str]] = None,
+        prefetched: Optional[tuple] = None,
+    ):
+        """
+        Generate a track event log
+
+        prefetched: 이벤트 고유 속성값 (plan.properties 순서, 일괄 생성하지 않은 속성은 _PENDING)
+        """
+        # "time" 타입 속성/current_time 업데이트는 이벤트 시각 기준
+        self.rng.current_time = event_time
+
         # 첫 이벤트 발생 시 USER properties를 user_set으로 설정
-        user_key = user.account_id or user.distinct_id
-        if user_key not in self.user_set_generated:
+        user_set_done = self.users.user_set_done
+        if not user_set_done[user.index]:
             self._generate_initial_user_set(user, event_time)
-            self.user_set_generated.add(user_key)
+            user_set_done[user.index] = True
 
-        # Get event schema
-        event = self.taxonomy.get_event_by_name(event_name)
-        if not event:
+        # Get event plan (택소노미에 없는 이벤트는 건너뜀)
+        plan = self.event_plans.get(event_name)
+        if plan is None:
             return
 
-        # Build properties
-        properties = {}
-
         # 1. Add preset properties (플랫폼별 필수 프리셋 속성)
-        preset_props = self._get_user_preset_properties(user)
-        properties.update(preset_props)
+        additional_context = self._get_user_preset_properties(user)
+        properties = dict(additional_context)
 
         # 2. Add common properties (snapshot of user state at event time)
-        properties.update(self._get_common_properties(user, event_time))
+        for prop_plan in self.common_property_plans:
+            value = user.get_state(prop_plan.name)
+            if value is None:
+                value = prop_plan.generate(user, None, additional_context)
+            properties[prop_plan.name] = value
 
         # 3. Add event-specific properties (택소노미 정의)
-        if event.properties:
-            event_props = self._generate_event_properties(user, event, session_events)
-            properties.update(event_props)
+        if prefetched is None:
+            for prop_plan in plan.properties:
+                properties[prop_plan.name] = prop_plan.generate(user, session_events, additional_context)
+        else:
+            for prop_plan, value in zip(plan.properties, prefetched):
+                if value is _PENDING:
+                    value = prop_plan.generate(user, session_events, additional_context)
+                properties[prop_plan.name] = value
 
         # 4. Add event-specific preset properties (이벤트별 전용 속성: ta_app_start, ta_app_end 등)
         event_preset_props = self.preset_generator.generate_event_specific_properties(
@@ -326,22 +787,11 @@ class LogGenerator:
         )
         properties.update(event_preset_props)
 
-        # Validate and sanitize property names
-        properties = PropertyNameValidator.sanitize_properties(properties)
+        # Validate and sanitize property names (이벤트별 키 정제 테이블 사용)
+        properties = plan.key_remap.apply(properties)
 
         # Create track event
-        track_event = TrackEvent(
-            **{
-                "#type": "track",
-                "#account_id": user.account_id,
-                "#distinct_id": user.distinct_id,
-                "#time": self._format_time(event_time),
-                "#event_name": event_name,
-                "properties": properties,
-            }
-        )
-
-        self.logs.append(track_event.to_json_line())
+        self._emit_track(user, event_name, event_time, properties)
 
         # Generate corresponding user updates if needed
         self._generate_user_updates(user, event_name, event_time, properties)
@@ -349,76 +799,113 @@ class LogGenerator:
         # 생명주기 단계 전환 확인 (이벤트 기반)
         self._check_lifecycle_transition(user, event_name, event_time)
 
-    def _get_user_preset_properties(self, user: User) -> Dict[str, Any]:
-        """
-        유저별 프리셋 속성 반환 (캐싱 사용)
-        디바이스 ID, OS 등은 유저별로 일관되어야 하므로 캐싱
+    def _compile_event_plans(self):
         """
-        user_key = user.account_id or user.distinct_id
+        이벤트/공통 속성의 생성 계획을 한 번만 컴파일
 
-        if user_key not in self.user_preset_cache:
-            # 처음 생성 - 유저의 가입일을 install_date로 사용
-            install_date = user.metadata.get("created_at")
-            preset_props = self.preset_generator.generate(
-                user_id=user_key,
-                install_date=install_date
+        생성 전략, 값 범위, 이벤트 제약조건, 정제된 출력 키를 미리 결정해두므로
+        이벤트마다 택소노미를 선형 탐색하거나 속성 타입/전략을 다시 조회하지 않는다.
+        """
+        # 택소노미 속성명의 정제 결과를 미리 캐싱
+        PropertyNameValidator.register_names(prop.name for prop in self.taxonomy.common_properties)
+        PropertyNameValidator.register_names(prop.name for prop in self.taxonomy.user_properties)
+        for event in self.taxonomy.events:
+            PropertyNameValidator.register_names(prop.name for prop in event.properties)
+
+        self.common_property_plans = tuple(
+            self._compile_common_property(prop) for prop in self.taxonomy.common_properties
+        )
+        self.user_set_key_remap = PropertyKeyRemap(prop.name for prop in self.taxonomy.user_properties)
+
+        event_plans: Dict[str, EventPlan] = {}
+        for event in self.taxonomy.events:
+            # 같은 이름이 여러 번 정의되어 있으면 첫 정의 사용 (get_event_by_name과 동일)
+            if event.event_name in event_plans:
+                continue
+            property_plans = tuple(
+                self._compile_event_property(prop, event.event_name) for prop in event.properties
             )
-            self.user_preset_cache[user_key] = preset_props
-
-        return self.user_preset_cache[user_key].copy()
-
-    def _get_common_properties(self, user: User, event_time: datetime) -> Dict[str, Any]:
-        """Get common event properties (user state snapshot)"""
-        properties = {}
+            # 프리셋 키는 유저별로 처음 생성될 때 알 수 있으므로 실행 중에 테이블에 추가됨
+            key_remap = PropertyKeyRemap(
+                [plan.name for plan in self.common_property_plans] + [plan.name for plan in property_plans]
+            )
+            event_plans[event.event_name] = EventPlan(
+                event_name=event.event_name,
+                properties=property_plans,
+                key_remap=key_remap,
+                batched=tuple(i for i, plan in enumerate(property_plans) if plan.generate_batch is not None),
+            )
+        self.event_plans = event_plans
+        # 일괄 생성할 속성이 있는 이벤트만 (_prefetch_property_values에서 사용)
+        self._batched_event_plans = {name: plan for name, plan in event_plans.items() if plan.batched}
 
-        # preset properties를 context로 준비 (국가, 디바이스 정보 등)
-        preset_props = self._get_user_preset_properties(user)
-        additional_context = preset_props.copy()
+    def _compile_event_property(self, prop, event_name: str) -> PropertyPlan:
+        """이벤트 고유 속성 1개의 생성 계획"""
+        prop_type = prop.property_type.value
 
-        for prop in self.taxonomy.common_properties:
-            # Get current value from user state
-            value = user.get_state(prop.name)
+        if self.intelligent_generator:
+            generate = self.intelligent_generator.compile_property_generator(prop.name, prop_type, event_name)
+            generate_batch = self.intelligent_generator.compile_property_batch(prop.name, prop_type, event_name)
+        else:
+            # 폴백: 기본 랜덤 생성 (AI 없을 때만)
+            def generate(user, session_events, additional_context, _prop=prop):
+                return self._generate_property_value(user, _prop, event_name, session_events)
+            generate_batch = None
+
+        return PropertyPlan(
+            name=prop.name,
+            prop_type=prop_type,
+            generate=generate,
+            generate_batch=generate_batch,
+            batch_key=stable_hash64(f"{event_name}\x00{prop.name}"),
+        )
 
-            # If not set, generate a value
-            if value is None:
-                # name 같은 중요한 속성은 intelligent generator 사용
-                if "name" in prop.name.lower() and self.intelligent_generator:
-                    value = self.intelligent_generator.generate_property_value(
-                        prop_name=prop.name,
-                        prop_type=prop.property_type.value,
-                        user=user,
-                        event_name=None,
-                        session_events=None,
-                        additional_context=additional_context
-                    )
-                else:
-                    # 기타 속성은 기본값 사용
-                    value = self._generate_default_value(prop.property_type.value)
+    def _compile_common_property(self, prop) -> PropertyPlan:
+        """공통 속성 1개의 생성 계획 (유저 상태에 값이 없을 때만 사용)"""
+        prop_type = prop.property_type.value
 
-            properties[prop.name] = value
+        # name 같은 중요한 속성은 intelligent generator 사용
+        if "name" in prop.name.lower() and self.intelligent_generator:
+            generate = self.intelligent_generator.compile_property_generator(prop.name, prop_type)
+        else:
+            # 기타 속성은 기본값 사용
+            def generate(user, session_events, additional_context):
+                return self._generate_default_value(prop_type)
+
+        return PropertyPlan(
+            name=prop.name,
+            prop_type=prop_type,
+            generate=generate,
+        )
 
-        return properties
+    def _get_user_preset_properties(self, user: UserRow) -> Mapping[str, Any]:
+        """
+        유저별 프리셋 속성 반환 (캐싱 사용)
+        디바이스 ID, OS 등은 유저별로 일관되어야 하므로 캐싱
 
-    def _generate_event_properties(self, user: User, event, session_events: Optional[List[str]] = None) -> Dict[str, Any]:
-        """Generate event-specific properties"""
-        properties = {}
+        읽기 전용 매핑(MappingProxyType)을 그대로 반환하므로 수정이 필요하면 dict()로 복사해서 사용
+        """
+        preset_props = self.user_preset_cache.get(user.index)
 
-        for prop in event.properties:
-            # Generate value based on property type
-            value = self._generate_property_value(user, prop, event.event_name, session_events)
-            properties[prop.name] = value
+        if preset_props is None:
+            # 처음 생성 - 유저의 가입일을 install_date로 사용
+            install_date = user.metadata.get("created_at")
+            preset_props = MappingProxyType(self.preset_generator.generate(
+                user_id=user.user_key,
+                install_date=install_date
+            ))
+            self.user_preset_cache[user.index] = preset_props
 
-        return properties
+        return preset_props
 
-    def _generate_property_value(self, user: User, prop, event_name: Optional[str] = None, session_events: Optional[List[str]] = None) -> Any:
+    def _generate_property_value(self, user: UserRow, prop, event_name: Optional[str] = None, session_events: Optional[List[str]] = None) -> Any:
         """Generate a realistic value for a property"""
         prop_type = prop.property_type.value
 
         # AI 기반 생성기가 있으면 사용
         if self.intelligent_generator:
             # preset properties를 context로 전달
-            preset_props = self._get_user_preset_properties(user)
-            additional_context = preset_props.copy()
+            additional_context = self._get_user_preset_properties(user)
 
             return self.intelligent_generator.generate_property_value(
                 prop_name=prop.name,
@@ -435,11 +922,11 @@ class LogGenerator:
         elif prop_type == "number":
             return self._generate_number_value(prop.name)
         elif prop_type == "boolean":
-            return random.choice([True, False])
+            return self.rng.choice([True, False])
         elif prop_type == "time":
-            return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            return self.rng.now().strftime("%Y-%m-%d %H:%M:%S")
         elif prop_type == "list":
-            return [self._generate_string_value(prop.name) for _ in range(random.randint(1, 3))]
+            return [self._generate_string_value(prop.name) for _ in range(self.rng.randint(1, 3))]
         elif prop_type == "object":
             return {f"field_{i}": self._generate_string_value(f"{prop.name}_field") for i in range(2)}
         else:
@@ -448,12 +935,12 @@ class LogGenerator:
     def _generate_string_value(self, prop_name: str) -> str:
         """Generate string value (폴백 - AI 없을 때만)"""
         # 범용적인 포맷 사용
-        return f"{prop_name}_{random.randint(1, 1000)}"
+        return f"{prop_name}_{self.rng.randint(1, 1000)}"
 
     def _generate_number_value(self, prop_name: str) -> float:
         """Generate number value (폴백 - AI 없을 때만)"""
         # 범용적인 범위 사용
-        return random.randint(1, 1000)
+        return self.rng.randint(1, 1000)
 
     def _generate_default_value(self, prop_type: str) -> Any:
         """Generate default value for a property type"""
@@ -464,7 +951,7 @@ class LogGenerator:
         elif prop_type == "boolean":
             return False
         elif prop_type == "time":
-            return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            return self.rng.now().strftime("%Y-%m-%d %H:%M:%S")
         elif prop_type == "list":
             return []
         elif prop_type == "object":
@@ -474,7 +961,7 @@ class LogGenerator:
 
     def _generate_user_updates(
         self,
-        user: User,
+        user: UserRow,
         event_name: str,
         event_time: datetime,
         event_properties: Dict[str, Any],
@@ -503,7 +990,7 @@ class LogGenerator:
                             updates[prop_name.name] = event_properties[prop_name.name]
 
         # 3. 추가 폴백: intelligent_generator의 관계 기반 업데이트 (확률적)
-        if random.random() < 0.2 and self.intelligent_generator:
+        if self.rng.random() < 0.2 and self.intelligent_generator:
             fallback_updates = self.intelligent_generator.should_update_user_property(
                 event_name=event_name,
                 user=user,
@@ -517,53 +1004,57 @@ class LogGenerator:
         # updates가 있으면 user_set 이벤트 생성
         if updates:
             # Validate and sanitize property names
-            updates = PropertyNameValidator.sanitize_properties(updates)
+            updates = self.user_set_key_remap.apply(updates)
+
+            self._emit_user_set(user, event_time, updates)
+
+            # Update user's internal state
+            user.update_state(updates)
 
-            user_set = UserSetEvent(
+    def _emit_track(self, user: UserRow, event_name: str, event_time: datetime, properties: Dict[str, Any]):
+        """track 라인을 직렬화해서 writer로 기록"""
+        if self.config.validate_events:
+            line = TrackEvent(
                 **{
-                    "#type": "user_set",
+                    "#type": "track",
                     "#account_id": user.account_id,
                     "#distinct_id": user.distinct_id,
                     "#time": self._format_time(event_time),
-                    "properties": updates,
+                    "#event_name": event_name,
+                    "properties": properties,
                 }
+            ).to_json_line()
+        else:
+            line = self.event_encoder.track(
+                self._format_time(event_time), event_name, properties, user.account_id, user.distinct_id
             )
-            self.logs.append(user_set.to_json_line())
+        self.writer.write(line, "track", event_name, event_time.hour)
 
-            # Update user's internal state
-            user.update_state(updates)
+    def _emit_user_set(self, user: UserRow, event_time: datetime, properties: Dict[str, Any]):
+        """user_set 라인을 직렬화해서 writer로 기록"""
+        if self.config.validate_events:
+            line = UserSetEvent(
+                **{
+                    "#type": "user_set",
+                    "#account_id": user.account_id,
+                    "#distinct_id": user.distinct_id,
+                    "#time": self._format_time(event_time),
+                    "properties": properties,
+                }
+            ).to_json_line()
+        else:
+            line = self.event_encoder.user(
+                "user_set", self._format_time(event_time), properties, user.account_id, user.distinct_id
+            )
+        self.writer.write(line, "user_set", None, event_time.hour)
 
     def _format_time(self, dt: datetime) -> str:
         """Format datetime to ThinkingEngine format"""
         return dt.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]  # yyyy-MM-dd HH:mm:ss.SSS
 
-    def _save_daily_logs(self, date: datetime) -> Path:
-        """
-        일일 로그를 파일로 저장
-
-        Args:
-            date: 날짜
-
-        Returns:
-            저장된 파일 경로
-        """
-        output_dir = Path(self.config.output_dir)
-        filename = f"logs_{date.strftime('%Y%m%d')}.jsonl"
-        output_path = output_dir / filename
-
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for log in self.logs:
-                f.write(log + '\n')
-
-        return output_path
-
-    def _count_lines_in_file(self, file_path: Path) -> int:
-        """파일의 라인 수 카운트"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return sum(1 for _ in f)
-        except:
-            return 0
+    def _get_daily_file_path(self, date: datetime) -> Path:
+        """일별 로그 파일 경로 (logs_YYYYMMDD.jsonl)"""
+        return Path(self.config.output_dir) / f"logs_{date.strftime('%Y%m%d')}.jsonl"
 
     def save_to_file(self, output_path: Optional[str] = None) -> Path:
         """
@@ -594,7 +1085,7 @@ class LogGenerator:
         """생성된 파일 목록 반환"""
         return self.generated_files.copy()
 
-    def _check_lifecycle_transition(self, user: User, event_name: str, event_time: datetime):
+    def _check_lifecycle_transition(self, user: UserRow, event_name: str, event_time: datetime):
         """
         이벤트 발생 후 생명주기 단계 전환 확인
 
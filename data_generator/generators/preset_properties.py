@@ -1,10 +1,10 @@
 """
 프리셋 속성 생성기 - 플랫폼별 필수 프리셋 속성 자동 생성
 """
-import random
 from typing import Dict, Any, Optional
 from datetime import datetime
 from ..config.config_schema import PlatformType
+from ..utils.rng import RandomStreams, stable_hash64
 
 
 class PresetPropertiesGenerator:
@@ -157,17 +157,20 @@ class PresetPropertiesGenerator:
         self,
         platform: PlatformType,
         product_name: str,
-        intelligent_generator=None  # Optional[IntelligentPropertyGenerator]
+        intelligent_generator=None,  # Optional[IntelligentPropertyGenerator]
+        rng: Optional[RandomStreams] = None,
     ):
         """
         Args:
             platform: 플랫폼 유형
             product_name: 제품/앱 이름
             intelligent_generator: AI 기반 속성 생성기 (선택)
+            rng: 공유 난수 스트림 (None이면 새로 생성)
         """
         self.platform = platform
         self.product_name = product_name
         self.intelligent_generator = intelligent_generator
+        self.rng = rng or RandomStreams()
 
     def generate(self, user_id: str, install_date: Optional[datetime] = None) -> Dict[str, Any]:
         """
@@ -196,7 +199,7 @@ class PresetPropertiesGenerator:
             preset_props.update(self._generate_desktop_properties())
         elif self.platform == PlatformType.HYBRID:
             # 하이브리드는 웹 + 모바일 속성 조합
-            if random.random() < 0.7:  # 70% 모바일
+            if self.rng.random() < 0.7:  # 70% 모바일
                 preset_props.update(self._generate_mobile_properties(install_date, country_info))
             else:  # 30% 웹
                 preset_props.update(self._generate_web_properties())
@@ -206,9 +209,9 @@ class PresetPropertiesGenerator:
     def _generate_common_properties(self, user_id: str) -> Dict[str, Any]:
         """공통 프리셋 속성 생성 (논리적 일관성 보장)"""
         # 국가 선택 (이후 province, city, carrier가 이에 맞춰 선택됨)
-        country = random.choice(self.COUNTRIES)
-        province = random.choice(country["provinces"])
-        city = random.choice(province["cities"])
+        country = self.rng.choice(self.COUNTRIES)
+        province = self.rng.choice(country["provinces"])
+        city = self.rng.choice(province["cities"])
 
         return {
             "#ip": self._generate_fake_ip(),
@@ -220,38 +223,38 @@ class PresetPropertiesGenerator:
             "#lib_version": self._generate_lib_version(),
             "#zone_offset": country["zone_offset"],
             "#device_id": self._generate_device_id(user_id),
-            "#screen_height": random.choice([2400, 1920, 1440, 1080]),
-            "#screen_width": random.choice([1080, 1440, 720, 1920]),
+            "#screen_height": self.rng.choice([2400, 1920, 1440, 1080]),
+            "#screen_width": self.rng.choice([1080, 1440, 720, 1920]),
             "#system_language": country["language"],
             "_country_info": country,  # 임시 저장 (carrier, name locale 생성에 사용)
         }
 
     def _generate_mobile_properties(self, install_date: Optional[datetime], country_info: Optional[Dict] = None) -> Dict[str, Any]:
         """모바일 프리셋 속성 생성 (논리적 일관성 보장)"""
-        os = random.choice(self.MOBILE_OS)
-        manufacturer = random.choice(self.MANUFACTURERS[os])
+        os = self.rng.choice(self.MOBILE_OS)
+        manufacturer = self.rng.choice(self.MANUFACTURERS[os])
 
         # 국가에 맞는 carrier 선택
         if country_info and "carriers" in country_info:
-            carrier = random.choice(country_info["carriers"])
+            carrier = self.rng.choice(country_info["carriers"])
         else:
             # fallback: 임의 carrier (논리적 일관성은 보장되지 않음)
-            carrier = random.choice(["SKT", "Verizon"])
+            carrier = self.rng.choice(["SKT", "Verizon"])
 
         props = {
             "#os": os,
-            "#os_version": random.choice(self.ANDROID_VERSIONS if os == "Android" else self.IOS_VERSIONS),
+            "#os_version": self.rng.choice(self.ANDROID_VERSIONS if os == "Android" else self.IOS_VERSIONS),
             "#manufacturer": manufacturer,
-            "#device_model": random.choice(self.DEVICE_MODELS[manufacturer]),
-            "#device_type": "Phone" if random.random() < 0.8 else "Tablet",
+            "#device_model": self.rng.choice(self.DEVICE_MODELS[manufacturer]),
+            "#device_type": "Phone" if self.rng.random() < 0.8 else "Tablet",
             "#app_version": self._generate_app_version(),
             "#bundle_id": self._generate_bundle_id(os),
-            "#network_type": random.choice(self.NETWORK_TYPES),
+            "#network_type": self.rng.choice(self.NETWORK_TYPES),
             "#carrier": carrier,  # 국가에 맞는 carrier
             "#simulator": 0,  # 실제 디바이스
-            "#ram": f"{random.randint(2000, 4000)}/{random.randint(6000, 12000)}MB",
-            "#disk": f"{random.randint(5000, 20000)}/{random.randint(64000, 256000)}MB",
-            "#fps": random.randint(55, 60),
+            "#ram": f"{self.rng.randint(2000, 4000)}/{self.rng.randint(6000, 12000)}MB",
+            "#disk": f"{self.rng.randint(5000, 20000)}/{self.rng.randint(64000, 256000)}MB",
+            "#fps": self.rng.randint(55, 60),
         }
 
         if install_date:
@@ -261,8 +264,8 @@ class PresetPropertiesGenerator:
 
     def _generate_web_properties(self) -> Dict[str, Any]:
         """웹 프리셋 속성 생성"""
-        os = random.choice(self.WEB_OS)
-        browser = random.choice(self.BROWSERS)
+        os = self.rng.choice(self.WEB_OS)
+        browser = self.rng.choice(self.BROWSERS)
 
         # Safari는 macOS에서만
         if browser == "Safari":
@@ -270,51 +273,51 @@ class PresetPropertiesGenerator:
 
         return {
             "#os": os,
-            "#os_version": random.choice(self.WEB_OS_VERSIONS[os]),
+            "#os_version": self.rng.choice(self.WEB_OS_VERSIONS[os]),
             "#browser": browser,
-            "#browser_version": random.choice(self.BROWSER_VERSIONS[browser]),
+            "#browser_version": self.rng.choice(self.BROWSER_VERSIONS[browser]),
             "#ua": self._generate_user_agent(os, browser),
-            "#utm": "" if random.random() < 0.7 else self._generate_utm_params(),
+            "#utm": "" if self.rng.random() < 0.7 else self._generate_utm_params(),
         }
 
     def _generate_desktop_properties(self) -> Dict[str, Any]:
         """데스크톱 프리셋 속성 생성"""
-        os = random.choice(self.DESKTOP_OS)
+        os = self.rng.choice(self.DESKTOP_OS)
 
         return {
             "#os": os,
-            "#os_version": random.choice(self.WEB_OS_VERSIONS[os]),
+            "#os_version": self.rng.choice(self.WEB_OS_VERSIONS[os]),
             "#device_model": f"{os} Desktop",
         }
 
     def _get_lib_name(self) -> str:
         """SDK 이름 반환"""
         if self.platform == PlatformType.MOBILE_APP:
-            return random.choice(["Android", "iOS"])
+            return self.rng.choice(["Android", "iOS"])
         elif self.platform == PlatformType.WEB:
             return "JavaScript"
         elif self.platform == PlatformType.DESKTOP:
-            return random.choice(["Windows", "macOS", "Linux"])
+            return self.rng.choice(["Windows", "macOS", "Linux"])
         else:
             return "JavaScript"
 
     def _generate_lib_version(self) -> str:
         """SDK 버전 생성"""
-        return f"{random.randint(2, 4)}.{random.randint(0, 9)}.{random.randint(0, 20)}"
+        return f"{self.rng.randint(2, 4)}.{self.rng.randint(0, 9)}.{self.rng.randint(0, 20)}"
 
     def _generate_device_id(self, user_id: str) -> str:
         """디바이스 ID 생성 (user_id 기반으로 일관성 있게)"""
-        # user_id를 해시하여 일관된 device_id 생성
-        hash_val = abs(hash(user_id))
+        # user_id를 해시하여 일관된 device_id 생성 (내장 hash()는 실행마다 달라지므로 사용하지 않음)
+        hash_val = stable_hash64(user_id)
         return f"device_{hash_val:016x}"
 
     def _generate_fake_ip(self) -> str:
         """가짜 IP 주소 생성"""
-        return f"{random.randint(1, 255)}.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
+        return f"{self.rng.randint(1, 255)}.{self.rng.randint(0, 255)}.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}"
 
     def _generate_app_version(self) -> str:
         """앱 버전 생성"""
-        return f"{random.randint(1, 3)}.{random.randint(0, 9)}.{random.randint(0, 20)}"
+        return f"{self.rng.randint(1, 3)}.{self.rng.randint(0, 9)}.{self.rng.randint(0, 20)}"
 
     def _generate_bundle_id(self, os: str) -> str:
         """번들 ID 생성"""
@@ -338,8 +341,8 @@ class PresetPropertiesGenerator:
         campaigns = ["google_ads", "facebook_ads", "email_campaign", "organic"]
         sources = ["google", "facebook", "newsletter", "direct"]
 
-        campaign = random.choice(campaigns)
-        source = random.choice(sources)
+        campaign = self.rng.choice(campaigns)
+        source = self.rng.choice(sources)
 
         return f"utm_source={source}&utm_medium=cpc&utm_campaign={campaign}"
 
@@ -387,23 +390,23 @@ class PresetPropertiesGenerator:
         props = {}
 
         # 백그라운드에서 재시작 여부
-        is_resume = context.get("is_resume", False) if context else random.random() < 0.3
+        is_resume = context.get("is_resume", False) if context else self.rng.random() < 0.3
         props["#resume_from_background"] = is_resume
 
         # 백그라운드 지속 시간 (재시작인 경우에만)
         if is_resume:
-            bg_duration = context.get("background_duration", random.randint(10, 300)) if context else random.randint(10, 300)
+            bg_duration = context.get("background_duration", self.rng.randint(10, 300)) if context else self.rng.randint(10, 300)
             props["#background_duration"] = bg_duration
 
         # 시작 원인 (URL/Intent로 실행된 경우)
-        if random.random() < 0.2:  # 20% 확률로 딥링크 시작
+        if self.rng.random() < 0.2:  # 20% 확률로 딥링크 시작
             start_reasons = [
                 '{"url": "app://home"}',
                 '{"url": "app://product/123"}',
                 '{"url": "app://promotion"}',
                 '{"intent": "android.intent.action.VIEW"}',
             ]
-            props["#start_reason"] = random.choice(start_reasons)
+            props["#start_reason"] = self.rng.choice(start_reasons)
 
         return props
 
@@ -416,7 +419,7 @@ class PresetPropertiesGenerator:
             duration = context["session_duration"]
         else:
             # 일반적인 세션 시간: 30초 ~ 30분
-            duration = random.randint(30, 1800)
+            duration = self.rng.randint(30, 1800)
 
         props["#duration"] = duration
 
@@ -439,7 +442,7 @@ class PresetPropertiesGenerator:
                 event_name="app_view",
                 additional_context={"type": "screen_title"}
             )
-            props["#title"] = title if title else f"Screen_{random.randint(1, 10)}"
+            props["#title"] = title if title else f"Screen_{self.rng.randint(1, 10)}"
 
             if self.platform == PlatformType.MOBILE_APP:
                 # screen_name (AI가 산업에 맞는 화면명 생성)
@@ -450,29 +453,29 @@ class PresetPropertiesGenerator:
                     event_name="app_view",
                     additional_context={"type": "activity_class_name"}
                 )
-                props["#screen_name"] = screen_name if screen_name else f"Screen{random.randint(1, 10)}Activity"
+                props["#screen_name"] = screen_name if screen_name else f"Screen{self.rng.randint(1, 10)}Activity"
 
             # URL (범용 템플릿)
             url_paths = ["home", "detail", "list", "profile", "settings", "search"]
-            path = random.choice(url_paths)
+            path = self.rng.choice(url_paths)
             props["#url"] = f"https://example.com/{path}"
         else:
             # 폴백: 범용 템플릿 (산업 무관)
-            props["#title"] = f"Screen_{random.randint(1, 10)}"
+            props["#title"] = f"Screen_{self.rng.randint(1, 10)}"
 
             if self.platform == PlatformType.MOBILE_APP:
-                props["#screen_name"] = f"Screen{random.randint(1, 10)}Activity"
+                props["#screen_name"] = f"Screen{self.rng.randint(1, 10)}Activity"
 
             # 범용 URL
-            props["#url"] = f"https://example.com/screen_{random.randint(1, 10)}"
+            props["#url"] = f"https://example.com/screen_{self.rng.randint(1, 10)}"
 
         # 웹 전용: url_path
         if self.platform == PlatformType.WEB:
             props["#url_path"] = props["#url"].replace("https://example.com", "")
 
         # Referrer (범용 - 이전 URL)
-        if random.random() < 0.8:
-            props["#referrer"] = f"https://example.com/screen_{random.randint(1, 10)}"
+        if self.rng.random() < 0.8:
+            props["#referrer"] = f"https://example.com/screen_{self.rng.randint(1, 10)}"
             if self.platform == PlatformType.WEB:
                 props["#referrer_host"] = "example.com"
         else:
@@ -497,7 +500,7 @@ class PresetPropertiesGenerator:
                 event_name="app_click",
                 additional_context={"type": "screen_title"}
             )
-            props["#title"] = title if title else f"Screen_{random.randint(1, 10)}"
+            props["#title"] = title if title else f"Screen_{self.rng.randint(1, 10)}"
 
             if self.platform == PlatformType.MOBILE_APP:
                 # screen_name
@@ -508,7 +511,7 @@ class PresetPropertiesGenerator:
                     event_name="app_click",
                     additional_context={"type": "activity_class_name"}
                 )
-                props["#screen_name"] = screen_name if screen_name else f"Screen{random.randint(1, 10)}Activity"
+                props["#screen_name"] = screen_name if screen_name else f"Screen{self.rng.randint(1, 10)}Activity"
 
                 # element_content (버튼 텍스트 - AI가 산업에 맞게)
                 content = self.intelligent_generator.generate_property_value(
@@ -518,24 +521,24 @@ class PresetPropertiesGenerator:
                     event_name="app_click",
                     additional_context={"type": "button_label"}
                 )
-                props["#element_content"] = content if content else f"Button_{random.randint(1, 10)}"
+                props["#element_content"] = content if content else f"Button_{self.rng.randint(1, 10)}"
 
                 # 나머지는 범용 템플릿 (산업 무관)
-                props["#element_id"] = f"btn_{random.randint(1, 100)}"
-                props["#element_type"] = random.choice(["Button", "TextView", "ImageView", "LinearLayout"])
+                props["#element_id"] = f"btn_{self.rng.randint(1, 100)}"
+                props["#element_type"] = self.rng.choice(["Button", "TextView", "ImageView", "LinearLayout"])
                 props["#element_selector"] = f"Screen/Layout/Button"
-                props["#element_position"] = f"{random.randint(0, 500)},{random.randint(0, 1000)}"
+                props["#element_position"] = f"{self.rng.randint(0, 500)},{self.rng.randint(0, 1000)}"
         else:
             # 폴백: 범용 템플릿
-            props["#title"] = f"Screen_{random.randint(1, 10)}"
+            props["#title"] = f"Screen_{self.rng.randint(1, 10)}"
 
             if self.platform == PlatformType.MOBILE_APP:
-                props["#screen_name"] = f"Screen{random.randint(1, 10)}Activity"
-                props["#element_id"] = f"btn_{random.randint(1, 100)}"
+                props["#screen_name"] = f"Screen{self.rng.randint(1, 10)}Activity"
+                props["#element_id"] = f"btn_{self.rng.randint(1, 100)}"
                 props["#element_type"] = "Button"
                 props["#element_selector"] = "Screen/Layout/Button"
-                props["#element_position"] = f"{random.randint(0, 500)},{random.randint(0, 1000)}"
-                props["#element_content"] = f"Button_{random.randint(1, 10)}"
+                props["#element_position"] = f"{self.rng.randint(0, 500)},{self.rng.randint(0, 1000)}"
+                props["#element_content"] = f"Button_{self.rng.randint(1, 10)}"
 
         return props
 
@@ -552,6 +555,6 @@ class PresetPropertiesGenerator:
                 "Fatal Exception: NSInvalidArgumentException: unrecognized selector sent to instance",
                 "Fatal Exception: EXC_BAD_ACCESS: Attempted to dereference null pointer",
             ]
-            props["#app_crashed_reason"] = random.choice(crash_reasons)
+            props["#app_crashed_reason"] = self.rng.choice(crash_reasons)
 
         return props
@@ -3,14 +3,15 @@
 AI가 택소노미를 분석하여 이벤트 발생 시 유저 속성 업데이트 규칙을 파악
 게임, 이커머스, SaaS 등 모든 산업에서 동작
 """
-import random
 from typing import Dict, Any, Optional, List
 import json
 
 from ..ai.base_client import BaseAIClient
 from ..models.taxonomy import EventTaxonomy
-from ..models.user import User
+from ..models.user_store import UserRow
 from ..utils.cache_manager import CacheManager
+from ..utils.formula import try_compile_formula
+from ..utils.rng import RandomStreams
 
 
 class PropertyUpdateEngine:
@@ -28,7 +29,8 @@ class PropertyUpdateEngine:
         ai_client: BaseAIClient,
         taxonomy: EventTaxonomy,
         product_info: Dict[str, Any],
-        enable_cache: bool = True
+        enable_cache: bool = True,
+        rng: Optional[RandomStreams] = None,
     ):
         self.ai_client = ai_client
         self.taxonomy = taxonomy
@@ -36,6 +38,11 @@ class PropertyUpdateEngine:
         self.update_mappings: Optional[Dict[str, Any]] = None
         self.enable_cache = enable_cache
         self.cache_manager = CacheManager() if enable_cache else None
+        self.rng = rng or RandomStreams()
+        # 공식에서 유저 상태로 읽을 수 있는 속성명 (공통 속성 + 유저 속성)
+        self._state_properties = frozenset(
+            prop.name for prop in list(taxonomy.common_properties) + list(taxonomy.user_properties)
+        ) if taxonomy is not None else frozenset()
 
     def analyze_event_update_patterns(self):
         """
@@ -45,28 +52,31 @@ class PropertyUpdateEngine:
         if self.update_mappings is not None:
             return  # 이미 분석됨
 
+        # AI 프롬프트 구성 (이벤트/속성/제품 정보가 모두 들어가므로 캐시 키로도 사용)
+        prompt = self._build_analysis_prompt()
+
         # 캐시 확인
         if self.cache_manager:
-            # 택소노미 해시 계산 (간단하게 이벤트 수로)
-            cache_key = f"update_patterns_{len(self.taxonomy.events)}_{self.product_info.get('industry', 'unknown')}"
+            # 프롬프트 내용 + 모델 해시 (택소노미 내용이 바뀌면 다른 키)
+            content_hash = self.cache_manager.compute_content_hash({
+                "prompt": prompt,
+                "model": getattr(self.ai_client, 'model', None),
+            })
+            cache_key = f"update_patterns_{content_hash}"
             cached_mappings = self.cache_manager.load(cache_key)
             if cached_mappings:
                 self.update_mappings = cached_mappings
+                self._reject_invalid_formulas()
                 return
 
         # 캐시 미스 - AI 분석 수행
         print("  🤖 AI가 이벤트별 유저 속성 업데이트 패턴을 분석하고 있습니다...")
 
         try:
-            # AI 프롬프트 구성
-            prompt = self._build_analysis_prompt()
-
-            # AI 호출 (base_client의 공통 메서드 활용)
-            # TODO: AI client에 analyze_update_patterns 메서드 추가 필요
-            # 임시로 직접 호출
             response = self._call_ai_for_analysis(prompt)
 
             self.update_mappings = response
+            self._reject_invalid_formulas()
             print(f"  ✓ {len(self.update_mappings)}개 이벤트의 업데이트 규칙 파악 완료")
 
             # 캐시 저장
@@ -174,21 +184,11 @@ Return your analysis:
     def _call_ai_for_analysis(self, prompt: str) -> Dict[str, Any]:
         """AI 호출하여 이벤트별 업데이트 패턴 분석"""
         try:
-            # ClaudeClient나 OpenAIClient는 모두 _call_api 메서드를 가지고 있음
-            if hasattr(self.ai_client, '_call_api'):
-                # 프롬프트를 system과 user로 분리
-                system_prompt = """You are an expert in data modeling and event-driven user property updates.
-Analyze event taxonomy and determine how user properties should be updated when specific events occur.
-Return your response as a JSON object only, without any markdown formatting."""
-
-                # 기존 프롬프트는 user_prompt로 사용
-                response = self.ai_client._call_api(system_prompt, prompt)
-                return response
-            else:
-                # 폴백: 빈 결과
-                print("  ⚠️  AI client does not have _call_api method")
-                return {}
-
+            return self.ai_client.analyze_update_patterns(
+                prompt,
+                taxonomy=self.taxonomy,
+                product_info=self.product_info,
+            )
         except Exception as e:
             print(f"  ⚠️  AI 호출 실패: {e}")
             return {}
@@ -196,7 +196,7 @@ Return your response as a JSON object only, without any markdown formatting."""
     def get_updates_for_event(
         self,
         event_name: str,
-        user: User,
+        user: UserRow,
         event_properties: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
@@ -227,7 +227,7 @@ Return your response as a JSON object only, without any markdown formatting."""
 
         # 확률 체크
         probability = event_mapping.get("probability", 1.0)
-        if random.random() > probability:
+        if self.rng.random() > probability:
             return {}
 
         updates = {}
@@ -249,8 +249,7 @@ Return your response as a JSON object only, without any markdown formatting."""
         # 3. Set (고정값 또는 특수값)
         for prop_name, value in update_rules.get("set", {}).items():
             if value == "current_time":
-                from datetime import datetime
-                updates[prop_name] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                updates[prop_name] = self.rng.now().strftime("%Y-%m-%d %H:%M:%S")
             elif value == "event_name":
                 updates[prop_name] = event_name
             else:
@@ -269,10 +268,25 @@ Return your response as a JSON object only, without any markdown formatting."""
 
         return updates
 
+    def _reject_invalid_formulas(self):
+        """허용되지 않는 formula 업데이트 규칙을 로드 시점에 제거 (utils.formula로 컴파일되지 않는 공식)"""
+        rejected = []
+        for event_name, mapping in (self.update_mappings or {}).items():
+            updates = mapping.get("updates") if isinstance(mapping, dict) else None
+            formulas = updates.get("formula") if isinstance(updates, dict) else None
+            if not isinstance(formulas, dict):
+                continue
+            for prop_name, formula in list(formulas.items()):
+                if try_compile_formula(formula) is None:
+                    del formulas[prop_name]
+                    rejected.append(f"{event_name}.{prop_name}")
+        if rejected:
+            print(f"  ⚠️  허용되지 않는 공식 {len(rejected)}개 제거됨: {', '.join(rejected[:5])}{'...' if len(rejected) > 5 else ''}")
+
     def _evaluate_formula(
         self,
         formula: str,
-        user: User,
+        user: UserRow,
         event_properties: Dict[str, Any]
     ) -> Optional[Any]:
         """
@@ -280,44 +294,23 @@ Return your response as a JSON object only, without any markdown formatting."""
 
         예: "total_spent + purchase_amount"
             → user.get_state("total_spent") + event_properties["purchase_amount"]
-        """
-        try:
-            # 컨텍스트 준비
-            context = {}
-
-            # 유저 상태의 모든 속성
-            for prop in self.taxonomy.common_properties:
-                value = user.get_state(prop.name)
-                if value is not None:
-                    context[prop.name] = value
-
-            for prop in self.taxonomy.user_properties:
-                value = user.get_state(prop.name)
-                if value is not None:
-                    context[prop.name] = value
-
-            # 이벤트 속성 추가
-            context.update(event_properties)
 
-            # 허용된 변수만 사용 (숫자만)
-            allowed_vars = {k: v for k, v in context.items() if isinstance(v, (int, float))}
-
-            # 공식에서 변수 치환
-            eval_formula = formula
-            for var_name, var_value in allowed_vars.items():
-                if var_name in eval_formula:
-                    eval_formula = eval_formula.replace(var_name, str(var_value))
-
-            # 단순 계산 (eval 사용하되 안전하게)
-            result = eval(eval_formula, {"__builtins__": {}}, {})
+        공식은 한 번만 컴파일되어 캐시되고, 공식에 나오는 변수만 이벤트 속성 → 유저 상태(공통/유저 속성) 순으로 읽는다.
+        """
+        compiled = try_compile_formula(formula)
+        if compiled is None:
+            return None
 
-            if isinstance(result, (int, float)):
-                return result
+        state_properties = self._state_properties
 
-        except Exception:
-            pass
+        def lookup(name: str) -> Any:
+            if name in event_properties:
+                return event_properties[name]
+            if name in state_properties:
+                return user.get_state(name)
+            return None
 
-        return None
+        return compiled(lookup)
 
     def should_update_for_event(self, event_name: str) -> bool:
         """이 이벤트가 유저 속성 업데이트를 유발하는지 확인"""
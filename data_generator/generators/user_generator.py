@@ -1,15 +1,16 @@
 """
 User generator for creating virtual users.
 """
-import random
-import uuid
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from faker import Faker
+from datetime import datetime
+from typing import Dict, Any, Optional
+import numpy as np
 
-from ..models.user import User, UserSegment, LifecycleStage
+from ..models.user import UserSegment, LifecycleStage
+from ..models.user_store import UserStore, UserRow, SEGMENTS, SEGMENT_CODES, STAGE_CODES
 from ..models.taxonomy import EventTaxonomy
 from ..config.config_schema import DataGeneratorConfig, ScenarioType
+from ..utils.rng import RandomStreams
+from ..utils.faker_pool import FakerPool
 
 
 class UserGenerator:
@@ -19,54 +20,115 @@ class UserGenerator:
         self,
         config: DataGeneratorConfig,
         taxonomy: EventTaxonomy,
-        intelligent_generator=None  # Optional[IntelligentPropertyGenerator]
+        intelligent_generator=None,  # Optional[IntelligentPropertyGenerator]
+        rng: Optional[RandomStreams] = None,
     ):
         self.config = config
         self.taxonomy = taxonomy
         self.intelligent_generator = intelligent_generator  # AI 기반 속성 생성기
 
-        # 다양한 locale의 Faker 인스턴스 초기화
-        self.faker_instances = {
-            "ko_KR": Faker('ko_KR'),
-            "en_US": Faker('en_US'),
-            "ja_JP": Faker('ja_JP'),
-            "zh_CN": Faker('zh_CN'),
-        }
+        # 공유 난수 스트림 (config.seed로 시드, Faker도 같은 스트림 사용)
+        self.rng = rng or RandomStreams(config.seed)
+
+        # locale별 Faker는 처음 사용할 때 생성
+        self.faker_instances = FakerPool(self.rng)
+        if self.intelligent_generator:
+            self.intelligent_generator.use_random_streams(self.rng)
 
-        if config.seed:
-            random.seed(config.seed)
-            Faker.seed(config.seed)
+    def generate_users(self) -> UserStore:
+        """
+        Generate all users based on configuration
 
-    def generate_users(self) -> List[User]:
-        """Generate all users based on configuration"""
+        ID/세그먼트/가입 시각/행동 특성/생명주기 단계는 NumPy로 한 번에 샘플링해 UserStore 열에 저장하고,
+        공통 속성(current_state)과 유저 속성은 유저가 처음 활동할 때 (seed, 유저)로 시드해 생성한다.
+        """
         # AI 분석 초기화 (한 번만 실행)
         if self.intelligent_generator and self.intelligent_generator.property_rules is None:
             self.intelligent_generator.analyze_properties()
 
         total_users = self.config.get_total_users_estimate()
-        users = []
 
         # Calculate user counts per scenario
         scenario_counts = self._calculate_scenario_distribution(total_users)
 
-        # Generate users for each scenario
+        # 시나리오별 세그먼트/시나리오 키 코드
+        segments = []
+        scenario_keys = []
+        counts = []
         for scenario_config in self.config.scenarios:
-            count = scenario_counts[scenario_config.scenario_type]
-
-            # Determine segment based on scenario type or custom behavior
             if scenario_config.is_custom():
                 # For custom scenarios, use a default segment (can be customized later)
-                segment = UserSegment.ACTIVE_USER
+                segments.append(UserSegment.ACTIVE_USER)
             else:
-                segment = self._scenario_to_segment(scenario_config.scenario_type)
+                segments.append(self._scenario_to_segment(scenario_config.scenario_type))
+            scenario_keys.append(scenario_config.get_scenario_key())
+            counts.append(scenario_counts[scenario_config.scenario_type])
 
-            for _ in range(count):
-                user = self._create_user(segment)
-                # Store scenario key in user metadata for behavior engine
-                user.metadata["scenario_key"] = scenario_config.get_scenario_key()
-                users.append(user)
+        segment_codes = np.repeat(np.array([SEGMENT_CODES[s] for s in segments], dtype=np.uint8), counts)
+        scenario_codes = np.repeat(np.arange(len(scenario_keys), dtype=np.uint16), counts)
+        user_count = len(segment_codes)
 
-        return users
+        # 유저 생성 전용 numpy 스트림 (ID, 가입 시각, 행동 특성이 seed로 결정됨)
+        gen = self.rng.numpy(RandomStreams.SCOPE_USERS)
+
+        # Generate IDs (UUID4 앞 16자리와 같은 형식 - 버전 니블 고정)
+        distinct_keys = self._random_id_keys(gen, user_count)
+        account_keys = self._random_id_keys(gen, user_count)
+        has_account = segment_codes != SEGMENT_CODES[UserSegment.NEW_USER]
+
+        # Determine first seen time (데이터 생성 기간 이전에 가입)
+        days_before_start = self._sample_days_before_start(gen, segment_codes)
+        start_seconds = int((datetime.combine(self.config.start_date, datetime.min.time()) - datetime(1970, 1, 1)).total_seconds())
+        first_seen = start_seconds - days_before_start.astype(np.int64) * 86400 + gen.integers(0, 86400, size=user_count)
+
+        # Behavior characteristics based on segment
+        daily_session_count = np.zeros(user_count, dtype=np.float32)
+        session_duration_minutes = np.zeros(user_count, dtype=np.float32)
+        conversion_probability = np.zeros(user_count, dtype=np.float32)
+        for code in np.unique(segment_codes).tolist():
+            mask = segment_codes == code
+            characteristics = self._sample_segment_characteristics(SEGMENTS[code], gen, int(mask.sum()))
+            daily_session_count[mask] = characteristics["daily_session_count"]
+            session_duration_minutes[mask] = characteristics["session_duration_minutes"]
+            conversion_probability[mask] = characteristics["conversion_probability"]
+
+        # 생명주기 단계 결정 (segment 기반)
+        stage_codes = self._determine_initial_lifecycle_stages(gen, segment_codes, days_before_start)
+
+        # 유저별 난수 스트림 id (유저 키에서 파생 - 문자열 해시 없이 벡터 연산)
+        user_keys = np.where(has_account, account_keys, distinct_keys)
+        stream_ids = self.rng.counter_bits(user_keys, RandomStreams.SCOPE_USERS) >> np.uint64(1)
+
+        store = UserStore(
+            distinct_keys=distinct_keys,
+            account_keys=account_keys,
+            has_account=has_account,
+            segment_codes=segment_codes,
+            stage_codes=stage_codes,
+            scenario_codes=scenario_codes,
+            scenario_keys=scenario_keys,
+            first_seen=first_seen,
+            days_before_start=days_before_start,
+            daily_session_count=daily_session_count,
+            session_duration_minutes=session_duration_minutes,
+            conversion_probability=conversion_probability,
+            stream_ids=stream_ids,
+        )
+        store.state_factory = self._materialize_initial_state
+        store.user_properties_factory = self._materialize_user_properties
+        return store
+
+    def _materialize_initial_state(self, user: UserRow) -> Dict[str, Any]:
+        """유저의 공통 속성 초기값 생성 (UserStore가 처음 접근할 때 호출)"""
+        with self.rng.scoped(RandomStreams.SCOPE_USER_INIT, user.stream_id, 0):
+            self.rng.current_time = datetime.combine(self.config.start_date, datetime.min.time())
+            return self._generate_initial_state(user.segment, user.days_before_start)
+
+    def _materialize_user_properties(self, user: UserRow) -> Dict[str, Any]:
+        """유저의 USER 속성 생성 (초기 user_set 기록 시 호출)"""
+        with self.rng.scoped(RandomStreams.SCOPE_USER_INIT, user.stream_id, 1):
+            self.rng.current_time = datetime.combine(self.config.start_date, datetime.min.time())
+            return self._generate_user_properties(user.segment, user.days_before_start, user.first_seen_time)
 
     def _calculate_scenario_distribution(self, total_users: int) -> Dict[ScenarioType, int]:
         """Calculate how many users per scenario"""
@@ -98,56 +160,6 @@ class UserGenerator:
         }
         return mapping.get(scenario_type, UserSegment.ACTIVE_USER)
 
-    def _create_user(self, segment: UserSegment) -> User:
-        """Create a single user"""
-        # Generate IDs
-        distinct_id = self._generate_distinct_id()
-        account_id = self._generate_account_id() if segment != UserSegment.NEW_USER else None
-
-        # Determine first seen time
-        # Users should have appeared before the data generation period
-        days_before_start = self._get_days_before_start(segment)
-        first_seen = self.config.start_date - timedelta(days=days_before_start)
-
-        # Convert date to datetime
-        first_seen_dt = datetime.combine(first_seen, datetime.min.time())
-        first_seen_dt = first_seen_dt.replace(
-            hour=random.randint(0, 23),
-            minute=random.randint(0, 59),
-            second=random.randint(0, 59)
-        )
-
-        # Behavior characteristics based on segment
-        characteristics = self._get_segment_characteristics(segment)
-
-        # Initialize user state with realistic values (COMMON properties)
-        initial_state = self._generate_initial_state(segment, days_before_start)
-
-        # Generate USER properties (택소노미의 유저 속성)
-        user_properties = self._generate_user_properties(segment, days_before_start, first_seen_dt)
-
-        # 생명주기 단계 결정 (segment 기반)
-        lifecycle_stage = self._determine_initial_lifecycle_stage(segment, days_before_start)
-
-        user = User(
-            account_id=account_id,
-            distinct_id=distinct_id,
-            segment=segment,
-            lifecycle_stage=lifecycle_stage,
-            current_state=initial_state,
-            daily_session_count=characteristics["daily_session_count"],
-            session_duration_minutes=characteristics["session_duration_minutes"],
-            conversion_probability=characteristics["conversion_probability"],
-            first_seen_time=first_seen_dt,
-            last_seen_time=first_seen_dt,
-            metadata={
-                "days_before_start": days_before_start,
-                "user_properties": user_properties,  # USER properties 저장
-            }
-        )
-
-        return user
-
     def _generate_initial_state(self, segment: UserSegment, days_before_start: int) -> Dict[str, Any]:
         """
         Generate initial user state with realistic values based on taxonomy
@@ -217,24 +229,23 @@ class UserGenerator:
         elif prop_type == "list":
             return []
         elif prop_type == "time":
-            return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            return self.rng.now().strftime("%Y-%m-%d %H:%M:%S")
         elif prop_type == "object":
             return {}
         else:
             return None
 
-    def _generate_distinct_id(self) -> str:
-        """Generate a distinct ID (device ID)"""
-        # Format: device_uuid
-        return f"device_{uuid.uuid4().hex[:16]}"
+    def _random_id_keys(self, gen: np.random.Generator, count: int) -> np.ndarray:
+        """
+        64비트 ID 키 배열 생성 (format_distinct_id/format_account_id로 문자열 변환)
 
-    def _generate_account_id(self) -> str:
-        """Generate an account ID"""
-        # Format: user_uuid
-        return f"user_{uuid.uuid4().hex[:16]}"
+        uuid4().hex[:16]와 같은 형식이 되도록 13번째 hex 자리를 버전 4로 고정
+        """
+        keys = gen.integers(0, np.iinfo(np.uint64).max, size=count, dtype=np.uint64, endpoint=True)
+        return (keys & ~np.uint64(0xF000)) | np.uint64(0x4000)
 
-    def _get_days_before_start(self, segment: UserSegment) -> int:
-        """Get how many days before start date the user first appeared"""
+    def _sample_days_before_start(self, gen: np.random.Generator, segment_codes: np.ndarray) -> np.ndarray:
+        """Get how many days before start date each user first appeared"""
         ranges = {
             UserSegment.NEW_USER: (0, 3),  # Very recent
             UserSegment.ACTIVE_USER: (7, 90),  # Regular users
@@ -243,13 +254,13 @@ class UserGenerator:
             UserSegment.CHURNED_USER: (30, 180),  # Haven't been active
             UserSegment.RETURNING_USER: (60, 365),  # Older users coming back
         }
+        lows = np.array([ranges.get(segment, (7, 90))[0] for segment in SEGMENTS], dtype=np.int64)
+        highs = np.array([ranges.get(segment, (7, 90))[1] for segment in SEGMENTS], dtype=np.int64)
+        return gen.integers(lows[segment_codes], highs[segment_codes], endpoint=True).astype(np.int16)
 
-        min_days, max_days = ranges.get(segment, (7, 90))
-        return random.randint(min_days, max_days)
-
-    def _get_segment_characteristics(self, segment: UserSegment) -> Dict[str, Any]:
+    def _sample_segment_characteristics(self, segment: UserSegment, gen: np.random.Generator, count: int) -> Dict[str, Any]:
         """
-        Get behavior characteristics for a segment from AI analysis
+        Sample behavior characteristics for users of a segment from AI analysis
         AI 분석 결과 필수 - 없으면 에러
         """
         if not self.intelligent_generator or not self.intelligent_generator.property_rules:
@@ -262,8 +273,8 @@ class UserGenerator:
             # 세그먼트 분석 결과가 없으면 기본 범위 사용
             print(f"  ⚠️  Warning: No AI analysis for segment {segment_key}, using generic ranges")
             return {
-                "daily_session_count": random.randint(1, 3),
-                "session_duration_minutes": random.uniform(5, 15),
+                "daily_session_count": gen.integers(1, 3, size=count, endpoint=True),
+                "session_duration_minutes": gen.uniform(5, 15, size=count),
                 "conversion_probability": 0.05,
             }
 
@@ -271,11 +282,11 @@ class UserGenerator:
         property_ranges = ai_segment_data.get("property_ranges", {})
 
         # AI 분석 결과에서 세션/플레이타임 정보 추출
-        daily_session_count = self._extract_value_from_range(
-            property_ranges.get("daily_session_count", property_ranges.get("session_count", {}))
+        daily_session_count = self._sample_from_range(
+            property_ranges.get("daily_session_count", property_ranges.get("session_count", {})), gen, count
         )
-        session_duration_minutes = self._extract_value_from_range(
-            property_ranges.get("session_duration_minutes", property_ranges.get("playtime_minutes", {}))
+        session_duration_minutes = self._sample_from_range(
+            property_ranges.get("session_duration_minutes", property_ranges.get("playtime_minutes", {})), gen, count
         )
 
         # conversion/purchase 확률 추출
@@ -283,14 +294,14 @@ class UserGenerator:
         conversion_probability = event_probs.get("purchase", event_probs.get("conversion", 0.05))
 
         return {
-            "daily_session_count": daily_session_count if daily_session_count is not None else random.randint(1, 3),
-            "session_duration_minutes": session_duration_minutes if session_duration_minutes is not None else random.uniform(5, 15),
+            "daily_session_count": daily_session_count if daily_session_count is not None else gen.integers(1, 3, size=count, endpoint=True),
+            "session_duration_minutes": session_duration_minutes if session_duration_minutes is not None else gen.uniform(5, 15, size=count),
             "conversion_probability": conversion_probability,
         }
 
-    def _extract_value_from_range(self, range_dict: Dict[str, Any]) -> Optional[float]:
+    def _sample_from_range(self, range_dict: Dict[str, Any], gen: np.random.Generator, count: int) -> Optional[np.ndarray]:
         """
-        AI 분석 결과의 범위 정보에서 값을 추출
+        AI 분석 결과의 범위 정보에서 유저 수만큼 값을 샘플링
         range_dict: {"min": x, "max": y, "mean": z} 형태
         """
         if not range_dict or not isinstance(range_dict, dict):
@@ -304,14 +315,13 @@ class UserGenerator:
             # mean 값 주변에서 정규분포로 생성
             if min_val is not None and max_val is not None:
                 std_dev = (max_val - min_val) / 6
-                value = random.gauss(mean, std_dev)
-                return max(min_val, min(max_val, value))
-            return mean
+                return np.clip(gen.normal(mean, std_dev, size=count), min_val, max_val)
+            return np.full(count, mean, dtype=float)
         elif min_val is not None and max_val is not None:
             # min/max만 있으면 균등분포
             if isinstance(min_val, int) and isinstance(max_val, int):
-                return random.randint(min_val, max_val)
-            return random.uniform(min_val, max_val)
+                return gen.integers(min_val, max_val, size=count, endpoint=True)
+            return gen.uniform(min_val, max_val, size=count)
 
         return None
 
@@ -366,55 +376,46 @@ class UserGenerator:
 
         return user_props
 
-    def _determine_initial_lifecycle_stage(self, segment: UserSegment, days_before_start: int) -> LifecycleStage:
+    def _determine_initial_lifecycle_stages(
+        self,
+        gen: np.random.Generator,
+        segment_codes: np.ndarray,
+        days_before_start: np.ndarray,
+    ) -> np.ndarray:
         """
         유저 segment와 가입 시점에 따라 초기 생명주기 단계 결정
 
         Args:
-            segment: 유저 세그먼트
-            days_before_start: 데이터 생성 시작일 기준 과거 며칠
+            gen: 유저 생성용 numpy 난수 생성기
+            segment_codes: 유저별 세그먼트 코드
+            days_before_start: 유저별 데이터 생성 시작일 기준 과거 며칠
 
         Returns:
-            초기 생명주기 단계
+            유저별 초기 생명주기 단계 코드 (STAGES 인덱스)
         """
-        if segment == UserSegment.NEW_USER:
-            # 신규 유저: 설치만 했거나 첫 세션 시작
-            if days_before_start == 0:
-                return LifecycleStage.INSTALLED
-            elif days_before_start <= 1:
-                return LifecycleStage.FIRST_SESSION
-            else:
-                # 1일 이상 지났으면 온보딩 진행 중이거나 완료
-                return random.choice([
-                    LifecycleStage.ONBOARDING_STARTED,
-                    LifecycleStage.ONBOARDING_COMPLETED
-                ])
-
-        elif segment == UserSegment.ACTIVE_USER:
-            # 활성 유저: 온보딩 완료 또는 일반 활동
-            if days_before_start <= 7:
-                return LifecycleStage.ONBOARDING_COMPLETED
-            else:
-                return LifecycleStage.ACTIVE
-
-        elif segment == UserSegment.POWER_USER:
-            # 파워 유저: 온보딩 완료 후 고급 단계
-            if days_before_start <= 14:
-                return LifecycleStage.ACTIVE
-            else:
-                return LifecycleStage.ADVANCED
-
-        elif segment == UserSegment.CHURNING_USER:
-            # 이탈 위험 유저: 활성 단계였지만 이탈 중
-            return LifecycleStage.ACTIVE
+        # 기본값: 이탈 위험/이탈/복귀 유저도 과거에는 활성 단계
+        stages = np.full(len(segment_codes), STAGE_CODES[LifecycleStage.ACTIVE], dtype=np.uint8)
+
+        # 신규 유저: 설치만 했거나 첫 세션 시작, 1일 이상 지났으면 온보딩 진행 중이거나 완료
+        is_new = segment_codes == SEGMENT_CODES[UserSegment.NEW_USER]
+        onboarding = np.where(
+            gen.integers(0, 2, size=len(segment_codes)) == 0,
+            STAGE_CODES[LifecycleStage.ONBOARDING_STARTED],
+            STAGE_CODES[LifecycleStage.ONBOARDING_COMPLETED],
+        )
+        new_stages = np.select(
+            [days_before_start == 0, days_before_start <= 1],
+            [STAGE_CODES[LifecycleStage.INSTALLED], STAGE_CODES[LifecycleStage.FIRST_SESSION]],
+            onboarding,
+        )
+        stages[is_new] = new_stages[is_new]
 
-        elif segment == UserSegment.CHURNED_USER:
-            # 이탈 유저: 과거에는 활성이었음
-            return LifecycleStage.ACTIVE
+        # 활성 유저: 온보딩 완료 또는 일반 활동
+        is_active = segment_codes == SEGMENT_CODES[UserSegment.ACTIVE_USER]
+        stages[is_active & (days_before_start <= 7)] = STAGE_CODES[LifecycleStage.ONBOARDING_COMPLETED]
 
-        elif segment == UserSegment.RETURNING_USER:
-            # 복귀 유저: 과거에 활성이었고 다시 돌아옴
-            return LifecycleStage.ACTIVE
+        # 파워 유저: 온보딩 완료 후 고급 단계
+        is_power = segment_codes == SEGMENT_CODES[UserSegment.POWER_USER]
+        stages[is_power & (days_before_start > 14)] = STAGE_CODES[LifecycleStage.ADVANCED]
 
-        # 기본값
-        return LifecycleStage.ACTIVE
+        return stages
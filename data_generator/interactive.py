@@ -255,6 +255,7 @@ def interactive_mode():
         # 생성된 파일 정보
         generated_files = orchestrator.log_generator.get_generated_files() if orchestrator.log_generator else []
         total_logs = result.get("logs", 0)
+        total_mb = result.get("bytes", 0) / 1024 / 1024
         output_dir = result.get("output_path", "")
 
         console.print(Panel.fit(
@@ -262,7 +263,7 @@ def interactive_mode():
 
 [cyan]생성 결과[/cyan]
   • 총 일수: [bold]{len(generated_files)}[/bold]일
-  • 총 로그 수: [bold]{total_logs:,}[/bold]개
+  • 총 로그 수: [bold]{total_logs:,}[/bold]개 ({total_mb:.1f} MB)
   • 출력 디렉토리: [bold]{output_dir}[/bold]
   • 파일 개수: [bold]{len(generated_files)}[/bold]개
 
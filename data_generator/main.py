@@ -7,19 +7,13 @@ from pathlib import Path
 from typing import Optional
 import click
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from dotenv import load_dotenv
 
-from .config.config_schema import DataGeneratorConfig, IndustryType, PlatformType, ScenarioType, ScenarioConfig
-from .readers.taxonomy_reader import TaxonomyReader
-from .generators.user_generator import UserGenerator
-from .generators.behavior_engine import BehaviorEngine
-from .generators.log_generator import LogGenerator
-from .ai.openai_client import OpenAIClient
-from .ai.claude_client import ClaudeClient
-from .interactive import interactive_mode
-from .uploader.logbus_config import LogBusConfigGenerator
-from .uploader.logbus_runner import LogBusRunner
+# 옵션 선택지에 필요한 설정 스키마만 여기서 임포트
+# pandas, AI SDK(openai, anthropic), faker, 생성 엔진은 각 명령 안에서 임포트해서 --help, cache-stats 같은
+# 가벼운 명령이 무거운 의존성을 로드하지 않도록 함 (python -X importtime -m data_generator.main --help로 확인)
+from .config.config_schema import DataGeneratorConfig, IndustryType, PlatformType
+from .utils.cache_manager import CacheManager, AIResponseCache
 
 # Load environment variables
 load_dotenv()
@@ -36,6 +30,7 @@ def cli():
 @cli.command()
 def interactive():
     """대화형 모드로 데이터 생성 (추천)"""
+    from .interactive import interactive_mode
     interactive_mode()
 
 
@@ -69,7 +64,7 @@ def clear_settings():
 @click.option('--end-date', required=True, type=click.DateTime(formats=['%Y-%m-%d']), help='종료 날짜 (YYYY-MM-DD)')
 @click.option('--dau', required=True, type=int, help='일일 활성 사용자 수 (DAU)')
 @click.option('--total-users', type=int, default=None, help='전체 등록 유저 수 (기본값: DAU * 3.5)')
-@click.option('--ai-provider', type=click.Choice(['openai', 'anthropic']), default='openai', help='AI 제공자')
+@click.option('--ai-provider', type=click.Choice(['openai', 'anthropic', 'local']), default='openai', help='AI 제공자 (local: 네트워크 없이 규칙 기반)')
 @click.option('--ai-model', type=str, default=None, help='AI 모델 이름 (선택)')
 @click.option('--description', type=str, default=None, help='앱/제품 특성 및 비고 (AI 컨텍스트)')
 @click.option('--custom-scenario', type=str, default=None, help='커스텀 시나리오 (예: "D1 유저가 튜토리얼에서 많이 이탈")')
@@ -77,6 +72,22 @@ def clear_settings():
 @click.option('--avg-events-max', type=int, default=30, help='1인당 하루 평균 최대 이벤트 수')
 @click.option('--output-dir', '-o', type=click.Path(), default='./data_generator/output', help='출력 디렉토리')
 @click.option('--seed', type=int, default=None, help='재현성을 위한 랜덤 시드')
+@click.option('--workers', type=int, default=1, help='로그 생성 프로세스 수 (유저 샤딩, 기본값: 1)')
+@click.option('--refresh-ai', is_flag=True, default=False, help='AI 캐시를 무시하고 새로 분석 (결과로 캐시 갱신)')
+@click.option('--ai-replay', type=click.Path(exists=True), default=None, help='local provider가 재생할 AI 응답 기록 파일')
+@click.option('--ai-record', type=click.Path(), default=None, help='AI 분석 결과를 재생용 파일로 기록')
+@click.option('--compression', type=click.Choice(['none', 'gzip', 'zstd']), default='none', help='출력 파일 압축 (zstd 모듈이 없으면 gzip)')
+@click.option('--compression-level', type=int, default=None, help='압축 레벨 (기본값: gzip 6, zstd 3)')
+@click.option('--max-file-mb', type=float, default=None, help='출력 파일 1개의 최대 크기 (MB, 넘으면 .001, .002 ... 파일로 분할)')
+@click.option('--split-hourly', is_flag=True, default=False, help='하루치 로그를 시(hour)별 파일로 분할')
+@click.option('--profile-stages', is_flag=True, default=False, help='단계별(세션 계획, 속성 생성, 직렬화, 파일 I/O) 시간 측정')
+@click.option('--profile-day', type=click.DateTime(formats=['%Y-%m-%d']), default=None, help='이 날짜 생성 구간만 프로파일링 (YYYY-MM-DD)')
+@click.option('--profile-output', type=click.Path(), default=None, help='프로파일 저장 경로 (.html이면 pyinstrument, 그 외는 cProfile)')
+@click.option('--upload', 'upload_while_generating', is_flag=True, default=False, help='생성과 동시에 완성된 파일을 receiver로 직접 업로드')
+@click.option('--app-id', '-a', type=str, default=None, help='[--upload] ThinkingEngine APP ID (기본값: 설정 파일)')
+@click.option('--push-url', '-u', type=str, default=None, help='[--upload] ThinkingEngine Receiver URL (기본값: 설정 파일)')
+@click.option('--upload-concurrency', type=int, default=4, help='[--upload] 동시 전송 수')
+@click.option('--upload-queue', type=int, default=2, help='[--upload] 전송 대기 최대 파일 수 (넘으면 생성이 대기)')
 def generate(
     taxonomy: str,
     product_name: str,
@@ -94,8 +105,36 @@ def generate(
     avg_events_max: int,
     output_dir: str,
     seed: Optional[int],
+    workers: int,
+    refresh_ai: bool,
+    ai_replay: Optional[str],
+    ai_record: Optional[str],
+    compression: str,
+    compression_level: Optional[int],
+    max_file_mb: Optional[float],
+    split_hourly: bool,
+    profile_stages: bool,
+    profile_day,
+    profile_output: Optional[str],
+    upload_while_generating: bool,
+    app_id: Optional[str],
+    push_url: Optional[str],
+    upload_concurrency: int,
+    upload_queue: int,
 ):
     """Generate log data based on taxonomy and configuration"""
+    import asyncio
+    import contextlib
+    from functools import partial
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
+    from .readers.taxonomy_reader import TaxonomyReader
+    from .generators.user_generator import UserGenerator
+    from .generators.behavior_engine import BehaviorEngine
+    from .generators.log_generator import LogGenerator
+    from .ai.local_client import LocalRuleClient, record_ai_responses
+    from .ai.async_client import AsyncAIClient
+    from .utils.rng import RandomStreams
+    from .utils.telemetry import Telemetry
 
     console.print("\n[bold cyan]Demo Data Generator[/bold cyan]")
     console.print("=" * 60)
@@ -117,6 +156,17 @@ def generate(
         avg_events_per_user_per_day=(avg_events_min, avg_events_max),
         output_dir=output_dir,
         seed=seed,
+        workers=workers,
+        refresh_ai=refresh_ai,
+        ai_replay_file=ai_replay,
+        ai_record_file=ai_record,
+        output_compression=compression,
+        compression_level=compression_level,
+        max_file_mb=max_file_mb,
+        split_by_hour=split_hourly,
+        profile_stages=profile_stages,
+        profile_day=profile_day.date() if profile_day else None,
+        profile_output=profile_output,
     )
 
     console.print(f"\n[green]Configuration:[/green]")
@@ -127,11 +177,32 @@ def generate(
     console.print(f"  DAU: {config.dau:,}")
     console.print(f"  Total Users: {config.get_total_users_estimate():,}")
     console.print(f"  AI Provider: {config.ai_provider}")
+    if config.workers > 1:
+        console.print(f"  Workers: {config.workers}")
+
+    # 생성과 동시에 업로드 (진행 표시 전에 APP ID/URL 확인 - 없으면 대화형으로 입력받음)
+    pipeline = None
+    if upload_while_generating:
+        from .uploader.http_uploader import HttpUploader, UploadCheckpoint
+        from .uploader.pipeline import UploadPipeline
+
+        app_id, push_url = _resolve_te_target(app_id, push_url)
+        if not app_id or not push_url:
+            console.print("[red]✗ --upload에는 APP ID와 Receiver URL이 필요합니다 (--app-id, --push-url).[/red]")
+            return
+        checkpoint = UploadCheckpoint(Path(config.output_dir) / ".upload_checkpoint.json")
+        pipeline = UploadPipeline(
+            HttpUploader(push_url, app_id, concurrency=upload_concurrency, checkpoint=checkpoint),
+            max_pending_files=upload_queue,
+        )
+        console.print(f"  Upload: {push_url} (APP ID {app_id}, 동시 전송 {upload_concurrency})")
 
     try:
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TimeRemainingColumn(),
             console=console,
         ) as progress:
 
@@ -139,15 +210,27 @@ def generate(
             task = progress.add_task("[cyan]Loading taxonomy...", total=None)
             reader = TaxonomyReader(taxonomy)
             taxonomy_data = reader.read()
-            progress.update(task, completed=True, description=f"[green]✓ Loaded taxonomy ({len(taxonomy_data.events)} events)")
+            progress.update(task, total=1, completed=1, description=f"[green]✓ Loaded taxonomy ({len(taxonomy_data.events)} events)")
 
             # Step 2: Initialize AI client
             task = progress.add_task(f"[cyan]Initializing AI client ({ai_provider})...", total=None)
-            if ai_provider == 'openai':
-                ai_client = OpenAIClient(model=ai_model)
+            # AI 응답 캐시 (프롬프트가 같으면 네트워크 호출 없이 재사용, --refresh-ai면 새로 호출)
+            if config.refresh_ai:
+                CacheManager().clear()
+            response_cache = AIResponseCache(
+                ttl_seconds=config.ai_cache_ttl_hours * 3600,
+                max_bytes=int(config.ai_cache_max_mb * 1024 * 1024),
+                refresh=config.refresh_ai,
+            )
+            if ai_provider == 'local':
+                ai_client = LocalRuleClient(taxonomy=taxonomy_data, replay_file=ai_replay, model=ai_model)
+            elif ai_provider == 'openai':
+                from .ai.openai_client import OpenAIClient
+                ai_client = OpenAIClient(model=ai_model, response_cache=response_cache)
             else:
-                ai_client = ClaudeClient(model=ai_model)
-            progress.update(task, completed=True, description=f"[green]✓ AI client ready")
+                from .ai.claude_client import ClaudeClient
+                ai_client = ClaudeClient(model=ai_model, response_cache=response_cache)
+            progress.update(task, total=1, completed=1, description=f"[green]✓ AI client ready")
 
             # Step 2.5: Initialize IntelligentPropertyGenerator
             task = progress.add_task("[cyan]Analyzing taxonomy for AI-based generation...", total=None)
@@ -168,22 +251,18 @@ def generate(
                 "product_description": config.product_description,
             }
 
+            # 모든 생성기가 공유하는 난수 스트림 (seed가 같으면 샤딩 여부와 무관하게 같은 결과)
+            rng = RandomStreams(config.seed)
+
             intelligent_generator = IntelligentPropertyGenerator(
                 ai_client=ai_client,
                 taxonomy_properties=all_properties,
-                product_info=product_info
+                product_info=product_info,
+                event_names=taxonomy_data.get_all_event_names(),
+                enable_cache=ai_provider != 'local',  # 로컬 규칙은 즉시 계산되므로 캐시 불필요
+                rng=rng,
             )
-            intelligent_generator.analyze_properties()
-            progress.update(task, completed=True, description=f"[green]✓ AI analysis complete")
 
-            # Step 3: Generate users
-            task = progress.add_task("[cyan]Generating users...", total=None)
-            user_gen = UserGenerator(config, taxonomy_data, intelligent_generator=intelligent_generator)
-            users = user_gen.generate_users()
-            progress.update(task, completed=True, description=f"[green]✓ Generated {len(users):,} users")
-
-            # Step 4: Initialize behavior engine
-            task = progress.add_task("[cyan]Initializing behavior engine...", total=None)
             # Collect custom scenarios from config
             custom_scenarios = {}
             for scenario_config in config.scenarios:
@@ -196,24 +275,72 @@ def generate(
                 taxonomy_data,
                 product_info,
                 custom_scenarios,
-                intelligent_generator=intelligent_generator  # AI 분석 결과 전달
+                intelligent_generator=intelligent_generator,  # AI 분석 결과 전달
+                rng=rng,
             )
-            progress.update(task, completed=True, description=f"[green]✓ Behavior engine ready")
 
-            # Step 5: Generate logs
+            # 속성 관계 분석과 시나리오별 행동 패턴을 동시에 요청 (첫 이벤트까지 가장 느린 호출 1개만 대기)
+            scenario_keys = list(dict.fromkeys(s.get_scenario_key() for s in config.scenarios))
+            calls = [intelligent_generator.analyze_properties]
+            calls.extend(partial(behavior_engine.get_behavior_pattern, key) for key in scenario_keys)
+            asyncio.run(AsyncAIClient(ai_client, max_concurrency=config.ai_concurrency).gather(calls))
+            if ai_record:
+                record_ai_responses(ai_record, intelligent_generator=intelligent_generator, behavior_engine=behavior_engine)
+            progress.update(task, total=1, completed=1, description=f"[green]✓ AI analysis complete")
+
+            # Step 3: Generate users
+            task = progress.add_task("[cyan]Generating users...", total=None)
+            user_gen = UserGenerator(config, taxonomy_data, intelligent_generator=intelligent_generator, rng=rng)
+            users = user_gen.generate_users()
+            progress.update(task, total=1, completed=1, description=f"[green]✓ Generated {len(users):,} users")
+
+            # Step 4: Generate logs
             task = progress.add_task("[cyan]Generating logs...", total=None)
-            log_gen = LogGenerator(config, taxonomy_data, behavior_engine, users)
-            logs = log_gen.generate()
-            progress.update(task, completed=True, description=f"[green]✓ Generated {len(logs):,} log entries")
 
-            # Step 6: Save to file
+            def show_progress(done, total, lines, elapsed, _task=task):
+                # 진행률 단위는 유저-날짜, 속도는 초당 기록 라인 수
+                rate = lines / elapsed if elapsed > 0 else 0.0
+                progress.update(
+                    _task, completed=done, total=total,
+                    description=f"[cyan]Generating logs... {lines:,} lines, {rate:,.0f} events/s",
+                )
+
+            telemetry = Telemetry.from_config(config, on_progress=show_progress)
+            log_gen = LogGenerator(
+                config, taxonomy_data, behavior_engine, users, rng=rng, telemetry=telemetry,
+                on_file_complete=pipeline.submit if pipeline else None,
+            )
+            upload_result = None
+            with pipeline or contextlib.nullcontext():
+                report = log_gen.generate()
+                progress.update(task, total=1, completed=1, description=f"[green]✓ Generated {report.total_lines:,} log entries")
+
+                # Step 4.5: 남은 파일 업로드 대기
+                if pipeline:
+                    task = progress.add_task("[cyan]Uploading remaining files...", total=None)
+                    upload_result = pipeline.close()
+                    status = "[green]✓" if upload_result.success else "[red]✗"
+                    progress.update(task, total=1, completed=1, description=f"{status} Uploaded {upload_result.lines:,} events")
+
+            # Step 5: Save to file
             task = progress.add_task("[cyan]Saving to file...", total=None)
             output_path = log_gen.save_to_file()
-            progress.update(task, completed=True, description=f"[green]✓ Saved to {output_path}")
+            progress.update(task, total=1, completed=1, description=f"[green]✓ Saved to {output_path}")
 
         console.print(f"\n[bold green]✓ Generation complete![/bold green]")
         console.print(f"Output file: [cyan]{output_path}[/cyan]")
-        console.print(f"Total logs: [cyan]{len(logs):,}[/cyan]")
+        console.print(f"Total logs: [cyan]{report.total_lines:,}[/cyan] ({report.total_bytes / 1024 / 1024:.1f} MB, {report.elapsed_seconds:.1f}s)")
+        if config.output_compression != "none":
+            console.print(f"On disk: [cyan]{report.total_disk_bytes / 1024 / 1024:.1f} MB[/cyan] ({config.output_compression})")
+        if upload_result is not None:
+            console.print(
+                f"Uploaded: [cyan]{upload_result.lines:,}[/cyan] events in {upload_result.batches:,} batches "
+                f"({upload_result.bytes_sent / 1024 / 1024:.1f} MB sent, 재시도 {upload_result.retries:,}회, "
+                f"생성 대기 {pipeline.wait_seconds:.1f}s)"
+            )
+            if not upload_result.success:
+                console.print(f"[bold red]✗ 업로드 실패: {upload_result.error}[/bold red]")
+                console.print(f"  남은 파일은 upload -d {config.output_dir} --uploader http 로 이어서 전송할 수 있습니다.")
 
     except Exception as e:
         console.print(f"\n[bold red]✗ Error: {str(e)}[/bold red]")
@@ -224,6 +351,8 @@ def generate(
 @click.argument('taxonomy_file', type=click.Path(exists=True))
 def inspect(taxonomy_file: str):
     """Inspect a taxonomy file"""
+    from .readers.taxonomy_reader import TaxonomyReader
+
     console.print(f"\n[bold cyan]Inspecting taxonomy: {taxonomy_file}[/bold cyan]")
     console.print("=" * 60)
 
@@ -266,6 +395,11 @@ def inspect(taxonomy_file: str):
 @click.option('--remove-after-days', type=int, default=7, help='파일 삭제 기간 (일)')
 @click.option('--monitor-interval', type=int, default=5, help='모니터링 간격 (초)')
 @click.option('--no-auto-stop', is_flag=True, default=False, help='업로드 후 LogBus 자동 중지 안 함')
+@click.option('--uploader', type=click.Choice(['logbus', 'http']), default='logbus', help='업로드 방식 (logbus: LogBus2 바이너리, http: receiver로 직접 전송)')
+@click.option('--concurrency', type=int, default=4, help='[http] 동시 전송 수')
+@click.option('--batch-size', type=int, default=500, help='[http] 배치당 최대 이벤트 수')
+@click.option('--checkpoint', type=click.Path(), default=None, help='[http] 전송 오프셋 체크포인트 파일 (기본값: 데이터 위치/.upload_checkpoint.json)')
+@click.option('--reset-checkpoint', is_flag=True, default=False, help='[http] 체크포인트를 지우고 처음부터 전송')
 def upload(
     data_file: Optional[str],
     data_dir: Optional[str],
@@ -278,10 +412,16 @@ def upload(
     remove_after_days: int,
     monitor_interval: int,
     no_auto_stop: bool,
+    uploader: str,
+    concurrency: int,
+    batch_size: int,
+    checkpoint: Optional[str],
+    reset_checkpoint: bool,
 ):
     """생성된 데이터를 ThinkingEngine으로 업로드 (단일 파일 또는 디렉토리)"""
     from .config.settings_manager import SettingsManager
-    from pathlib import Path
+    from .uploader.logbus_config import LogBusConfigGenerator, detect_file_patterns
+    from .uploader.logbus_runner import LogBusRunner
 
     # 데이터 소스 확인
     if not data_file and not data_dir:
@@ -301,41 +441,40 @@ def upload(
         if not data_path.is_dir():
             console.print(f"[red]✗ 디렉토리를 찾을 수 없습니다: {data_dir}[/red]")
             return
-        # 디렉토리 내 .jsonl 파일들 찾기
-        jsonl_files = sorted(data_path.glob("logs_*.jsonl"))
+        # 디렉토리 내 로그 파일들 찾기 (압축/분할 파일 포함)
+        jsonl_files = sorted(path for pattern in detect_file_patterns(data_path) for path in data_path.glob(pattern))
         if not jsonl_files:
-            console.print(f"[red]✗ 디렉토리에 logs_*.jsonl 파일이 없습니다: {data_dir}[/red]")
+            console.print(f"[red]✗ 디렉토리에 logs_*.jsonl(.gz/.zst) 파일이 없습니다: {data_dir}[/red]")
             return
         console.print(f"\n[cyan]발견된 파일:[/cyan] {len(jsonl_files)}개")
         for f in jsonl_files[:5]:
             console.print(f"  • {f.name}")
         if len(jsonl_files) > 5:
             console.print(f"  • ... 외 {len(jsonl_files) - 5}개")
-        # 디렉토리 경로만 전달 (logbus_config.py에서 *.jsonl 패턴 추가)
+        # 디렉토리 경로만 전달 (logbus_config.py에서 파일 형식별 패턴 추가)
         data_file = str(data_path.absolute())
         is_directory = True
     else:
+        jsonl_files = [Path(data_file)]
         data_file = str(data_file)
         is_directory = False
 
-    console.print("\n[bold cyan]📤 LogBus2 데이터 업로드[/bold cyan]")
+    if uploader == 'http':
+        console.print("\n[bold cyan]📤 ThinkingEngine 직접 업로드 (HTTP)[/bold cyan]")
+    else:
+        console.print("\n[bold cyan]📤 LogBus2 데이터 업로드[/bold cyan]")
     console.print("=" * 60)
 
     # 설정 관리자에서 불러오기
     settings = SettingsManager()
 
-    # Load from settings or environment variables
-    app_id = app_id or settings.get("te_app_id") or os.getenv("TE_APP_ID")
-    push_url = push_url or settings.get("te_receiver_url") or os.getenv("TE_RECEIVER_URL")
-    logbus_path = logbus_path or settings.get("logbus_path") or os.getenv("LOGBUS_PATH", "./logbus 2/logbus")
+    # Load from settings or environment variables (없으면 입력받기)
+    app_id, push_url = _resolve_te_target(app_id, push_url, settings)
+    if uploader == 'logbus':
+        logbus_path = logbus_path or settings.get("logbus_path") or os.getenv("LOGBUS_PATH", "./logbus 2/logbus")
     cpu_limit = cpu_limit or int(os.getenv("LOGBUS_CPU_LIMIT", "4"))
 
-    # 설정이 없으면 입력받기
-    if not app_id:
-        app_id = settings.get_te_app_id()
-    if not push_url:
-        push_url = settings.get_te_receiver_url()
-    if not logbus_path:
+    if uploader == 'logbus' and not logbus_path:
         logbus_path = settings.get_logbus_path()
 
     # Validate required fields (all fields should be set by now through settings manager)
@@ -346,6 +485,15 @@ def upload(
         console.print("[red]✗ Receiver URL이 필요합니다. 설정에서 Receiver URL을 입력하거나 --push-url 옵션을 사용하세요.[/red]")
         return
 
+    if uploader == 'http':
+        checkpoint_path = Path(checkpoint) if checkpoint else (
+            (Path(data_file) if is_directory else Path(data_file).parent) / ".upload_checkpoint.json"
+        )
+        _upload_http(
+            jsonl_files, app_id, push_url, compress, concurrency, batch_size, checkpoint_path, reset_checkpoint
+        )
+        return
+
     console.print(f"\n[green]설정:[/green]")
     console.print(f"  데이터 파일: {data_file}")
     console.print(f"  APP ID: {app_id}")
@@ -389,19 +537,104 @@ def upload(
         raise
 
 
+def _resolve_te_target(app_id: Optional[str], push_url: Optional[str], settings=None):
+    """APP ID와 Receiver URL 결정 (옵션 → 설정 파일 → 환경 변수 → 대화형 입력 순)"""
+    if settings is None:
+        from .config.settings_manager import SettingsManager
+        settings = SettingsManager()
+
+    app_id = app_id or settings.get("te_app_id") or os.getenv("TE_APP_ID")
+    push_url = push_url or settings.get("te_receiver_url") or os.getenv("TE_RECEIVER_URL")
+    if not app_id:
+        app_id = settings.get_te_app_id()
+    if not push_url:
+        push_url = settings.get_te_receiver_url()
+    return app_id, push_url
+
+
+def _upload_http(
+    files,
+    app_id: str,
+    push_url: str,
+    compress: bool,
+    concurrency: int,
+    batch_size: int,
+    checkpoint_path: Path,
+    reset_checkpoint: bool,
+):
+    """HttpUploader로 receiver에 직접 전송 (체크포인트로 중단 지점부터 재개)"""
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
+    from .uploader.http_uploader import HttpUploader, UploadCheckpoint
+
+    checkpoint = UploadCheckpoint(checkpoint_path)
+    if reset_checkpoint:
+        checkpoint.clear()
+
+    console.print(f"\n[green]설정:[/green]")
+    console.print(f"  파일: {len(files)}개")
+    console.print(f"  APP ID: {app_id}")
+    console.print(f"  Receiver URL: {push_url}")
+    console.print(f"  압축: {'사용' if compress else '미사용'}")
+    console.print(f"  동시 전송: {concurrency} (배치당 최대 {batch_size:,}개)")
+    console.print(f"  체크포인트: {checkpoint_path}")
+    console.print()
+
+    total_bytes = sum(path.stat().st_size for path in files)
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TimeRemainingColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task("업로드 중...", total=len(files))
+
+        def show_progress(result):
+            progress.update(
+                task,
+                completed=result.files + result.skipped_files,
+                description=f"업로드 중... {result.lines:,} events ({result.bytes_sent / 1024 / 1024:.1f} MB sent)",
+            )
+
+        http_uploader = HttpUploader(
+            push_url,
+            app_id,
+            concurrency=concurrency,
+            batch_lines=batch_size,
+            compress=compress,
+            checkpoint=checkpoint,
+            on_progress=show_progress,
+        )
+        result = http_uploader.upload_files(files)
+        show_progress(result)
+
+    if result.skipped_files:
+        console.print(f"  이전에 전송을 마친 파일 {result.skipped_files}개는 건너뜀")
+    console.print(f"  전송: {result.lines:,} events, {result.batches:,} batches, 재시도 {result.retries:,}회")
+    console.print(f"  크기: {result.bytes_read / 1024 / 1024:.1f} MB → {result.bytes_sent / 1024 / 1024:.1f} MB (전체 {total_bytes / 1024 / 1024:.1f} MB on disk)")
+    console.print(f"  속도: {result.lines_per_second:,.0f} events/s ({result.elapsed_seconds:.1f}s)")
+
+    if result.success:
+        console.print("\n[bold green]✓ 업로드 완료![/bold green]")
+    else:
+        console.print(f"\n[bold red]✗ 업로드 실패: {result.error}[/bold red]")
+        console.print("  같은 명령으로 다시 실행하면 체크포인트 지점부터 이어서 전송합니다.")
+        raise SystemExit(1)
+
+
 @cli.command()
 def cache_stats():
     """AI 분석 캐시 통계 조회"""
-    from .utils.cache_manager import CacheManager
-
     cache = CacheManager()
     stats = cache.get_stats()
+    response_stats = AIResponseCache().get_stats()
 
     console.print("\n[bold cyan]AI 분석 캐시 통계[/bold cyan]")
     console.print("=" * 60)
     console.print(f"[green]총 캐시 파일:[/green] {stats['total_cached']}")
     console.print(f"[green]총 크기:[/green] {stats['total_size_mb']:.2f} MB")
     console.print(f"[green]캐시 위치:[/green] {stats['cache_dir']}")
+    console.print(f"[green]AI 응답 캐시:[/green] {response_stats['entries']}개 ({response_stats['total_size_mb']:.2f} MB)")
 
     if stats['files']:
         console.print(f"\n[cyan]캐시 파일 목록:[/cyan]")
@@ -420,8 +653,6 @@ def cache_stats():
 @click.confirmation_option(prompt='정말 캐시를 삭제하시겠습니까?')
 def cache_clear(pattern: Optional[str]):
     """AI 분석 캐시 초기화"""
-    from .utils.cache_manager import CacheManager
-
     cache = CacheManager()
 
     if pattern:
@@ -429,6 +660,7 @@ def cache_clear(pattern: Optional[str]):
         console.print(f"[green]✓ 패턴 '{pattern}' 캐시 삭제 완료[/green]")
     else:
         cache.clear()
+        AIResponseCache().clear()
         console.print("[green]✓ 전체 캐시 초기화 완료[/green]")
 
 
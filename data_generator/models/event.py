@@ -1,11 +1,91 @@
 """
 Event log data models following ThinkingEngine JSON structure.
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 from pydantic import BaseModel, Field
 import json
 
 
+# json.dumps(data, ensure_ascii=False)와 같은 설정의 인코더를 한 번만 생성해서 재사용
+_STDLIB_ENCODE: Callable[[Any], str] = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _build_line_dict(
+    log_type: str,
+    time: str,
+    properties: Dict[str, Any],
+    account_id: Optional[str] = None,
+    distinct_id: Optional[str] = None,
+    event_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """ThinkingEngine 라인 딕셔너리 (키 순서는 기존 to_json_line과 동일)"""
+    if event_name is not None:
+        data = {"#type": log_type, "#time": time, "#event_name": event_name, "properties": properties}
+    else:
+        data = {"#type": log_type, "#time": time, "properties": properties}
+    if account_id:
+        data["#account_id"] = account_id
+    if distinct_id:
+        data["#distinct_id"] = distinct_id
+    return data
+
+
+class EventLineEncoder:
+    """
+    이벤트 라인 직렬화기 (JSON 백엔드 선택 가능)
+
+    - json (기본): 표준 라이브러리 인코더, 기존 to_json_line과 바이트 단위로 동일
+    - orjson / ujson: 설치되어 있을 때만 사용, 구분자 공백이 없는 compact 형식이라
+      같은 데이터라도 바이트는 달라짐 (ThinkingEngine 적재 결과는 동일)
+    """
+
+    BACKENDS = ("json", "orjson", "ujson")
+
+    def __init__(self, backend: str = "json"):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported JSON backend: {backend} (choose from {', '.join(self.BACKENDS)})")
+
+        self.backend = "json"
+        self._encode: Callable[[Any], str] = _STDLIB_ENCODE
+
+        if backend == "orjson":
+            try:
+                import orjson
+                self._encode = lambda data: orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+                self.backend = backend
+            except ImportError:
+                print("  ⚠️  orjson이 설치되어 있지 않아 표준 json으로 직렬화합니다")
+        elif backend == "ujson":
+            try:
+                import ujson
+                self._encode = lambda data: ujson.dumps(data, ensure_ascii=False, escape_forward_slashes=False)
+                self.backend = backend
+            except ImportError:
+                print("  ⚠️  ujson이 설치되어 있지 않아 표준 json으로 직렬화합니다")
+
+    def track(
+        self,
+        time: str,
+        event_name: str,
+        properties: Dict[str, Any],
+        account_id: Optional[str] = None,
+        distinct_id: Optional[str] = None,
+    ) -> str:
+        """track 라인 직렬화"""
+        return self._encode(_build_line_dict("track", time, properties, account_id, distinct_id, event_name))
+
+    def user(
+        self,
+        log_type: str,
+        time: str,
+        properties: Dict[str, Any],
+        account_id: Optional[str] = None,
+        distinct_id: Optional[str] = None,
+    ) -> str:
+        """user_set / user_set_once / user_add / user_append 라인 직렬화"""
+        return self._encode(_build_line_dict(log_type, time, properties, account_id, distinct_id))
+
+
 class TrackEvent(BaseModel):
     """
     Track event - goes to Event Table
@@ -26,17 +106,9 @@ class TrackEvent(BaseModel):
 
     def to_json_line(self) -> str:
         """Convert to single-line JSON string"""
-        data = {
-            "#type": self.type,
-            "#time": self.time,
-            "#event_name": self.event_name,
-            "properties": self.properties
-        }
-        if self.account_id:
-            data["#account_id"] = self.account_id
-        if self.distinct_id:
-            data["#distinct_id"] = self.distinct_id
-        return json.dumps(data, ensure_ascii=False)
+        return _STDLIB_ENCODE(_build_line_dict(
+            self.type, self.time, self.properties, self.account_id, self.distinct_id, self.event_name
+        ))
 
 
 class UserSetEvent(BaseModel):
@@ -54,17 +126,9 @@ class UserSetEvent(BaseModel):
         populate_by_name = True
 
     def to_json_line(self) -> str:
-        import json
-        data = {
-            "#type": self.type,
-            "#time": self.time,
-            "properties": self.properties
-        }
-        if self.account_id:
-            data["#account_id"] = self.account_id
-        if self.distinct_id:
-            data["#distinct_id"] = self.distinct_id
-        return json.dumps(data, ensure_ascii=False)
+        return _STDLIB_ENCODE(_build_line_dict(
+            self.type, self.time, self.properties, self.account_id, self.distinct_id
+        ))
 
 
 class UserSetOnceEvent(BaseModel):
@@ -82,17 +146,9 @@ class UserSetOnceEvent(BaseModel):
         populate_by_name = True
 
     def to_json_line(self) -> str:
-        import json
-        data = {
-            "#type": self.type,
-            "#time": self.time,
-            "properties": self.properties
-        }
-        if self.account_id:
-            data["#account_id"] = self.account_id
-        if self.distinct_id:
-            data["#distinct_id"] = self.distinct_id
-        return json.dumps(data, ensure_ascii=False)
+        return _STDLIB_ENCODE(_build_line_dict(
+            self.type, self.time, self.properties, self.account_id, self.distinct_id
+        ))
 
 
 class UserAddEvent(BaseModel):
@@ -110,17 +166,9 @@ class UserAddEvent(BaseModel):
         populate_by_name = True
 
     def to_json_line(self) -> str:
-        import json
-        data = {
-            "#type": self.type,
-            "#time": self.time,
-            "properties": self.properties
-        }
-        if self.account_id:
-            data["#account_id"] = self.account_id
-        if self.distinct_id:
-            data["#distinct_id"] = self.distinct_id
-        return json.dumps(data, ensure_ascii=False)
+        return _STDLIB_ENCODE(_build_line_dict(
+            self.type, self.time, self.properties, self.account_id, self.distinct_id
+        ))
 
 
 class UserAppendEvent(BaseModel):
@@ -138,14 +186,6 @@ class UserAppendEvent(BaseModel):
         populate_by_name = True
 
     def to_json_line(self) -> str:
-        import json
-        data = {
-            "#type": self.type,
-            "#time": self.time,
-            "properties": self.properties
-        }
-        if self.account_id:
-            data["#account_id"] = self.account_id
-        if self.distinct_id:
-            data["#distinct_id"] = self.distinct_id
-        return json.dumps(data, ensure_ascii=False)
+        return _STDLIB_ENCODE(_build_line_dict(
+            self.type, self.time, self.properties, self.account_id, self.distinct_id
+        ))
@@ -0,0 +1,336 @@
+"""
+Columnar user population store.
+유저 집단을 NumPy 열(column)로 보관하고, 핫 루프에서는 __slots__ 행 뷰(UserRow)로 접근
+"""
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Callable, Iterator, Sequence
+
+import numpy as np
+
+from .user import User, UserSegment, LifecycleStage
+from ..utils.rng import stable_hash64
+
+
+# 코드 <-> enum 변환표 (열에는 uint8 코드만 저장)
+SEGMENTS = tuple(UserSegment)
+STAGES = tuple(LifecycleStage)
+SEGMENT_CODES = {segment: code for code, segment in enumerate(SEGMENTS)}
+STAGE_CODES = {stage: code for code, stage in enumerate(STAGES)}
+
+# 생명주기 단계 순서 (User._is_valid_transition과 동일 - 앞으로만 진행 가능)
+_STAGE_ORDER = {
+    LifecycleStage.INSTALLED: 0,
+    LifecycleStage.FIRST_SESSION: 1,
+    LifecycleStage.REGISTERED: 2,
+    LifecycleStage.ONBOARDING_STARTED: 3,
+    LifecycleStage.ONBOARDING_COMPLETED: 4,
+    LifecycleStage.ACTIVE: 5,
+    LifecycleStage.ADVANCED: 6,
+}
+
+_EPOCH = datetime(1970, 1, 1)
+
+# 유저 1명의 상태/유저 속성을 처음 필요할 때 만드는 함수 (UserGenerator가 지정)
+StateFactory = Callable[["UserRow"], Dict[str, Any]]
+
+
+def format_distinct_id(key: int) -> str:
+    """64비트 키 -> distinct_id 문자열 ("device_" + 16자리 hex)"""
+    return f"device_{key:016x}"
+
+
+def format_account_id(key: int) -> str:
+    """64비트 키 -> account_id 문자열 ("user_" + 16자리 hex)"""
+    return f"user_{key:016x}"
+
+
+def _to_seconds(value: datetime) -> int:
+    """naive datetime -> 1970-01-01 기준 초"""
+    return int((value - _EPOCH).total_seconds())
+
+
+class UserStore:
+    """
+    유저 집단의 열 저장소
+
+    - ID/세그먼트/생명주기 단계/시각/행동 특성은 유저 수 길이의 NumPy 배열로 보관
+    - current_state(공통 속성)와 유저 속성은 처음 접근할 때 state_factory로 생성하며,
+      생성된 상태만 희소 딕셔너리(states)에 보관 (활동하지 않은 유저는 메모리를 쓰지 않음)
+    - store[i]는 열을 직접 읽고 쓰는 가벼운 UserRow 뷰를 반환
+    """
+
+    def __init__(
+        self,
+        distinct_keys: np.ndarray,
+        account_keys: np.ndarray,
+        has_account: np.ndarray,
+        segment_codes: np.ndarray,
+        stage_codes: np.ndarray,
+        scenario_codes: np.ndarray,
+        scenario_keys: Sequence[str],
+        first_seen: np.ndarray,
+        days_before_start: np.ndarray,
+        daily_session_count: np.ndarray,
+        session_duration_minutes: np.ndarray,
+        conversion_probability: np.ndarray,
+        stream_ids: np.ndarray,
+    ):
+        self.distinct_keys = np.asarray(distinct_keys, dtype=np.uint64)  # distinct_id의 64비트 키
+        self.account_keys = np.asarray(account_keys, dtype=np.uint64)  # account_id의 64비트 키
+        self.has_account = np.asarray(has_account, dtype=bool)  # account_id 보유 여부 (신규 유저는 False)
+        self.segment_codes = np.asarray(segment_codes, dtype=np.uint8)  # SEGMENTS 인덱스
+        self.stage_codes = np.asarray(stage_codes, dtype=np.uint8)  # STAGES 인덱스 (생성 중 갱신)
+        self.scenario_codes = np.asarray(scenario_codes, dtype=np.uint16)  # scenario_keys 인덱스
+        self.scenario_keys: List[str] = list(scenario_keys)
+        self.first_seen = np.asarray(first_seen, dtype=np.int64)  # 1970-01-01 기준 초
+        self.last_seen = self.first_seen.copy()
+        self.days_before_start = np.asarray(days_before_start, dtype=np.int16)
+        self.daily_session_count = np.asarray(daily_session_count, dtype=np.float32)
+        self.session_duration_minutes = np.asarray(session_duration_minutes, dtype=np.float32)
+        self.conversion_probability = np.asarray(conversion_probability, dtype=np.float32)
+        self.stream_ids = np.asarray(stream_ids, dtype=np.uint64)  # 유저별 난수 스트림 id
+        self.user_set_done = np.zeros(len(self.distinct_keys), dtype=bool)  # 초기 user_set 기록 여부
+
+        # 희소 저장 (필요한 유저만)
+        self.states: Dict[int, Dict[str, Any]] = {}  # current_state
+        self.user_properties: Dict[int, Dict[str, Any]] = {}  # 미리 주어진 유저 속성 (from_users)
+        self.lifecycle_history: Dict[int, List[tuple]] = {}  # (from 코드, to 코드, 초)
+
+        self.state_factory: Optional[StateFactory] = None
+        self.user_properties_factory: Optional[StateFactory] = None
+
+    @classmethod
+    def from_users(cls, users: Sequence[User]) -> "UserStore":
+        """
+        pydantic User 리스트를 열 저장소로 변환 (기존 호출 코드 호환용)
+
+        ID 문자열이 "device_"/"user_" + 16자리 hex 형식이 아니면 그대로 보존할 수 없으므로 ValueError
+        """
+        def parse_key(value: Optional[str], prefix: str) -> int:
+            if not value:
+                return 0
+            if not value.startswith(prefix):
+                raise ValueError(f"지원하지 않는 유저 ID 형식: {value}")
+            return int(value[len(prefix):], 16)
+
+        scenario_keys: List[str] = []
+        scenario_index: Dict[str, int] = {}
+        scenario_codes = []
+        for user in users:
+            key = user.metadata.get("scenario_key", user.segment.value)
+            if key not in scenario_index:
+                scenario_index[key] = len(scenario_keys)
+                scenario_keys.append(key)
+            scenario_codes.append(scenario_index[key])
+
+        store = cls(
+            distinct_keys=[parse_key(user.distinct_id, "device_") for user in users],
+            account_keys=[parse_key(user.account_id, "user_") for user in users],
+            has_account=[bool(user.account_id) for user in users],
+            segment_codes=[SEGMENT_CODES[user.segment] for user in users],
+            stage_codes=[STAGE_CODES[user.lifecycle_stage] for user in users],
+            scenario_codes=scenario_codes,
+            scenario_keys=scenario_keys,
+            first_seen=[_to_seconds(user.first_seen_time) for user in users],
+            days_before_start=[user.metadata.get("days_before_start", 0) for user in users],
+            daily_session_count=[user.daily_session_count for user in users],
+            session_duration_minutes=[user.session_duration_minutes for user in users],
+            conversion_probability=[user.conversion_probability for user in users],
+            stream_ids=[stable_hash64(user.account_id or user.distinct_id) for user in users],
+        )
+        store.last_seen[:] = [_to_seconds(user.last_seen_time) for user in users]
+        for index, user in enumerate(users):
+            store.states[index] = dict(user.current_state)
+            store.user_properties[index] = dict(user.metadata.get("user_properties", {}))
+        return store
+
+    def __len__(self) -> int:
+        return len(self.distinct_keys)
+
+    def __getitem__(self, index: int) -> "UserRow":
+        return UserRow(self, int(index))
+
+    def __iter__(self) -> Iterator["UserRow"]:
+        for index in range(len(self)):
+            yield UserRow(self, index)
+
+    def rows(self, indices: Sequence[int]) -> List["UserRow"]:
+        """인덱스 배열 순서대로 행 뷰 리스트 생성"""
+        return [UserRow(self, index) for index in np.asarray(indices).tolist()]
+
+    def state_for(self, index: int) -> Dict[str, Any]:
+        """유저의 current_state (처음 접근 시 state_factory로 생성)"""
+        state = self.states.get(index)
+        if state is None:
+            state = self.state_factory(UserRow(self, index)) if self.state_factory else {}
+            self.states[index] = state
+        return state
+
+    def user_properties_for(self, index: int) -> Dict[str, Any]:
+        """
+        유저의 USER 속성 (user_set 초기값)
+
+        초기 user_set을 기록할 때 한 번만 쓰이므로 생성 결과는 보관하지 않는다.
+        """
+        properties = self.user_properties.get(index)
+        if properties is not None:
+            return properties
+        return self.user_properties_factory(UserRow(self, index)) if self.user_properties_factory else {}
+
+    def nbytes(self) -> int:
+        """열 배열이 차지하는 바이트 수 (희소 상태 딕셔너리 제외)"""
+        return sum(
+            column.nbytes for column in (
+                self.distinct_keys, self.account_keys, self.has_account, self.segment_codes,
+                self.stage_codes, self.scenario_codes, self.first_seen, self.last_seen,
+                self.days_before_start, self.daily_session_count, self.session_duration_minutes,
+                self.conversion_probability, self.stream_ids, self.user_set_done,
+            )
+        )
+
+
+class UserRow:
+    """
+    UserStore의 유저 1명에 대한 행 뷰
+
+    User 모델과 같은 속성/메서드를 제공하며 값은 저장소의 열에서 바로 읽고 쓴다.
+    """
+    __slots__ = ("store", "index", "_ids")
+
+    def __init__(self, store: UserStore, index: int):
+        self.store = store
+        self.index = index
+        self._ids: Optional[tuple] = None  # (account_id, distinct_id) - 처음 접근 시 문자열로 변환
+
+    def _id_strings(self) -> tuple:
+        if self._ids is None:
+            store, index = self.store, self.index
+            account_id = format_account_id(int(store.account_keys[index])) if store.has_account[index] else None
+            self._ids = (account_id, format_distinct_id(int(store.distinct_keys[index])))
+        return self._ids
+
+    def __repr__(self) -> str:
+        return f"UserRow(index={self.index}, distinct_id={self.distinct_id!r}, segment={self.segment.value!r})"
+
+    # IDs
+    @property
+    def distinct_id(self) -> str:
+        return self._id_strings()[1]
+
+    @property
+    def account_id(self) -> Optional[str]:
+        return self._id_strings()[0]
+
+    @property
+    def user_key(self) -> str:
+        """account_id가 있으면 account_id, 없으면 distinct_id"""
+        return self.account_id or self.distinct_id
+
+    @property
+    def stream_id(self) -> int:
+        return int(self.store.stream_ids[self.index])
+
+    # Profile
+    @property
+    def segment(self) -> UserSegment:
+        return SEGMENTS[self.store.segment_codes[self.index]]
+
+    @property
+    def lifecycle_stage(self) -> LifecycleStage:
+        return STAGES[self.store.stage_codes[self.index]]
+
+    @lifecycle_stage.setter
+    def lifecycle_stage(self, stage: LifecycleStage):
+        self.store.stage_codes[self.index] = STAGE_CODES[stage]
+
+    @property
+    def scenario_key(self) -> str:
+        return self.store.scenario_keys[self.store.scenario_codes[self.index]]
+
+    # Behavior characteristics
+    @property
+    def daily_session_count(self) -> float:
+        return float(self.store.daily_session_count[self.index])
+
+    @property
+    def session_duration_minutes(self) -> float:
+        return float(self.store.session_duration_minutes[self.index])
+
+    @property
+    def conversion_probability(self) -> float:
+        return float(self.store.conversion_probability[self.index])
+
+    # Timestamps
+    @property
+    def first_seen_time(self) -> datetime:
+        return _EPOCH + timedelta(seconds=int(self.store.first_seen[self.index]))
+
+    @property
+    def last_seen_time(self) -> datetime:
+        return _EPOCH + timedelta(seconds=int(self.store.last_seen[self.index]))
+
+    @property
+    def days_before_start(self) -> int:
+        return int(self.store.days_before_start[self.index])
+
+    # State
+    @property
+    def current_state(self) -> Dict[str, Any]:
+        return self.store.state_for(self.index)
+
+    @property
+    def user_properties(self) -> Dict[str, Any]:
+        return self.store.user_properties_for(self.index)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """User.metadata 호환용 읽기 전용 스냅샷 (유저 속성은 user_properties로 접근)"""
+        metadata: Dict[str, Any] = {
+            "days_before_start": self.days_before_start,
+            "scenario_key": self.scenario_key,
+        }
+        history = self.store.lifecycle_history.get(self.index)
+        if history:
+            metadata["lifecycle_history"] = [
+                {
+                    "from": STAGES[from_code].value,
+                    "to": STAGES[to_code].value,
+                    "timestamp": (_EPOCH + timedelta(seconds=seconds)).isoformat(),
+                }
+                for from_code, to_code, seconds in history
+            ]
+        return metadata
+
+    def update_state(self, properties: Dict[str, Any]) -> None:
+        """Update current user state"""
+        self.current_state.update(properties)
+
+    def get_state(self, key: str, default: Any = None) -> Any:
+        """Get current state value"""
+        return self.current_state.get(key, default)
+
+    def transition_to(self, new_stage: LifecycleStage, timestamp: Optional[datetime] = None) -> bool:
+        """
+        유저를 새로운 생명주기 단계로 전환 (User.transition_to와 동일한 규칙)
+
+        Returns:
+            전환 성공 여부
+        """
+        old_stage = self.lifecycle_stage
+        if old_stage == new_stage:
+            return False
+
+        from_order = _STAGE_ORDER.get(old_stage)
+        to_order = _STAGE_ORDER.get(new_stage)
+        if from_order is not None and to_order is not None and to_order <= from_order:
+            return False
+
+        self.lifecycle_stage = new_stage
+        self.store.lifecycle_history.setdefault(self.index, []).append(
+            (STAGE_CODES[old_stage], STAGE_CODES[new_stage], _to_seconds(timestamp or datetime.now()))
+        )
+        return True
+
+    def can_perform_event(self, event_name: str, lifecycle_rules: Optional[Dict[str, Any]] = None) -> bool:
+        """현재 생명주기 단계에서 이 이벤트를 수행할 수 있는지 확인 (User.can_perform_event와 동일)"""
+        return User.can_perform_event(self, event_name, lifecycle_rules)
@@ -2,7 +2,7 @@
 생명주기별 이벤트 규칙 및 제약조건
 AI가 분석 못할 경우 사용할 하드코딩된 폴백 규칙
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from ..models.user import LifecycleStage
 
 
@@ -263,17 +263,54 @@ EVENT_CONSTRAINTS: Dict[str, Dict[str, Any]] = {
 
 
 class LifecycleRulesEngine:
-    """생명주기 규칙 엔진 - AI 분석 결과 + 하드코딩 폴백"""
+    """
+    생명주기 규칙 엔진 - AI 분석 결과 + 하드코딩 폴백
 
-    def __init__(self, ai_rules: Optional[Dict[str, Any]] = None):
+    택소노미 이벤트와 단계가 고정돼 있으므로 생성 시점에 단계 × 이벤트 허용 테이블과 전환 테이블을
+    미리 계산해 두고, 세션마다 호출되는 is_event_allowed_in_lifecycle/get_transition_event는 조회만 한다.
+    테이블에 없는 이벤트는 처음 조회할 때 규칙을 평가해 테이블에 추가한다.
+    규칙(ai_rules 등)을 바꾼 뒤에는 load_ai_rules() 또는 compile()로 테이블을 다시 만들어야 한다.
+    """
+
+    def __init__(self, ai_rules: Optional[Dict[str, Any]] = None, event_names: Iterable[str] = ()):
         """
         Args:
             ai_rules: AI가 분석한 규칙 (선택)
+            event_names: 미리 컴파일할 이벤트 이름 (보통 택소노미 전체 이벤트)
         """
         self.ai_rules = ai_rules or {}
         self.hardcoded_rules = LIFECYCLE_EVENT_RULES
         self.event_constraints = EVENT_CONSTRAINTS
 
+        self.event_names: Tuple[str, ...] = ()
+        self.allowed_table: Dict[LifecycleStage, Dict[str, bool]] = {}  # 단계 → 이벤트 → 허용 여부
+        self.transition_table: Dict[LifecycleStage, Dict[str, Optional[str]]] = {}  # 단계 → 이벤트 → 전환 단계
+        self.compile(event_names)
+
+    def compile(self, event_names: Optional[Iterable[str]] = None):
+        """
+        단계 × 이벤트 허용/전환 테이블 계산
+
+        Args:
+            event_names: 컴파일할 이벤트 이름 (None이면 이전에 컴파일한 이벤트)
+        """
+        if event_names is not None:
+            self.event_names = tuple(event_names)
+        # 매번 새 딕셔너리로 교체 (이전 테이블을 참조하는 캐시가 갱신 여부를 identity로 확인할 수 있도록)
+        self.allowed_table = {
+            stage: {name: self._evaluate_allowed(name, stage) for name in self.event_names}
+            for stage in LifecycleStage
+        }
+        self.transition_table = {
+            stage: {name: self._evaluate_transition(stage, name) for name in self.event_names}
+            for stage in LifecycleStage
+        }
+
+    def load_ai_rules(self, ai_rules: Optional[Dict[str, Any]]):
+        """AI 규칙 교체 후 테이블 재계산"""
+        self.ai_rules = ai_rules or {}
+        self.compile()
+
     def get_allowed_events_for_stage(self, lifecycle_stage: LifecycleStage) -> List[str]:
         """
         특정 생명주기 단계에서 허용된 이벤트 패턴 리스트
@@ -314,6 +351,14 @@ class LifecycleRulesEngine:
         Returns:
             전환할 단계 (없으면 None)
         """
+        table = self.transition_table[lifecycle_stage]
+        if event_name in table:
+            return table[event_name]
+        target_stage = table[event_name] = self._evaluate_transition(lifecycle_stage, event_name)
+        return target_stage
+
+    def _evaluate_transition(self, lifecycle_stage: LifecycleStage, event_name: str) -> Optional[str]:
+        """규칙을 직접 평가해 전환 단계 계산 (테이블 컴파일용)"""
         # AI 규칙 우선
         if lifecycle_stage.value in self.ai_rules:
             ai_transitions = self.ai_rules[lifecycle_stage.value].get("transition_events", {})
@@ -371,6 +416,14 @@ class LifecycleRulesEngine:
         Returns:
             허용 여부
         """
+        table = self.allowed_table[lifecycle_stage]
+        allowed = table.get(event_name)
+        if allowed is None:
+            allowed = table[event_name] = self._evaluate_allowed(event_name, lifecycle_stage)
+        return allowed
+
+    def _evaluate_allowed(self, event_name: str, lifecycle_stage: LifecycleStage) -> bool:
+        """규칙을 직접 평가해 허용 여부 계산 (테이블 컴파일용)"""
         # 1. 금지 이벤트 체크
         forbidden = self.get_forbidden_events_for_stage(lifecycle_stage)
         for pattern in forbidden:
@@ -0,0 +1,195 @@
+"""
+세션 이벤트 마르코프 모델
+
+AI가 분석한 세그먼트별 event_sequence / event_probabilities와 ScenarioPattern의 퍼널 정의를
+"현재 이벤트 → 다음 이벤트" 전이 행렬 하나로 컴파일한다. 세그먼트와 생명주기 단계 조합마다 한 번만 만들고,
+하루치 세션 전체를 NumPy로 한 걸음씩 동시에 진행시켜 샘플링한다.
+"""
+import random
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .scenarios import ScenarioPattern
+from ..utils.sampling import alias_table
+
+
+# 세션 번호와 걸음 번호를 counter 난수의 sub 키 하나로 합칠 때 걸음 번호에 쓰는 비트 수
+STEP_BITS = 16
+
+
+@dataclass
+class SessionEventPlan:
+    """
+    하루치 전체 세션의 이벤트 (BehaviorEngine.plan_session_events 결과)
+
+    세션 순서는 DailySessionPlan과 같다. events[i]는 stage_codes[i] 단계 기준으로 샘플링한 이벤트이며,
+    난수는 (유저, 날짜, 세션 번호, 걸음)으로만 정해지므로 같은 세션을 다른 단계로 다시 샘플링해도 결정적이다.
+    """
+    day: int  # date.toordinal()
+    session_ids: np.ndarray  # (sessions,) uint64 - 세션 소유 유저의 난수 스트림 id
+    session_numbers: np.ndarray  # (sessions,) int - 유저 안에서의 세션 번호
+    duration_minutes: np.ndarray  # (sessions,) float - 세션 길이 (분)
+    stage_codes: List[int]  # 세션별 샘플링에 쓴 생명주기 단계 (STAGE_CODES, 모델이 없었으면 -1)
+    events: List[Optional[List[str]]]  # 세션별 이벤트명 (모델이 없었으면 None)
+
+    def events_for(self, session_index: int, stage_code: int) -> Optional[List[str]]:
+        """미리 샘플링한 세션 이벤트 (샘플링 때와 생명주기 단계가 다르면 None - 호출 측에서 수정 금지)"""
+        if self.stage_codes[session_index] != stage_code:
+            return None
+        return self.events[session_index]
+
+
+class SessionMarkovModel:
+    """
+    이벤트 전이 행렬 기반 세션 모델
+
+    다음 이벤트 분포는 세 성분의 혼합이다.
+    - AI 시퀀스에서 현재 이벤트 바로 다음 이벤트 (SEQUENCE_WEIGHT)
+    - 퍼널 정의에서 현재 이벤트의 다음 단계 (FUNNEL_WEIGHT)
+    - 이벤트 확률 가중치에 따른 임의 이동 (JUMP_WEIGHT)
+    현재 이벤트에 해당 성분이 없으면 남은 성분끼리 다시 정규화한다.
+    세션은 항상 시퀀스의 첫 이벤트로 시작한다.
+    """
+
+    SEQUENCE_WEIGHT = 0.75
+    FUNNEL_WEIGHT = 0.15
+    JUMP_WEIGHT = 0.10
+
+    def __init__(
+        self,
+        sequence: Sequence[str],
+        event_weights: Optional[Mapping[str, float]] = None,
+        funnels: Optional[Mapping[str, Sequence[str]]] = None,
+        candidates: Optional[Iterable[str]] = None,
+        max_events: Optional[int] = None,
+    ):
+        """
+        Args:
+            sequence: 생명주기 단계에서 허용된 이벤트만 남긴 AI event_sequence (비어 있으면 안 됨)
+            event_weights: 이벤트 → 임의 이동 가중치 (없는 이벤트는 1.0)
+            funnels: 퍼널 이름 → 이벤트 순서 (None이면 ScenarioPattern.get_funnel_sequences())
+            candidates: 퍼널 단계로 추가할 수 있는 이벤트 (None이면 시퀀스 이벤트만 사용)
+            max_events: 세션당 최대 이벤트 수 (None이면 len(sequence))
+        """
+        if not sequence:
+            raise ValueError("SessionMarkovModel needs a non-empty sequence")
+        if funnels is None:
+            funnels = ScenarioPattern.get_funnel_sequences()
+        allowed = set(candidates) if candidates is not None else set()
+
+        # 상태: 시퀀스 이벤트 (등장 순서) + 후보에 있는 퍼널 이벤트
+        names: List[str] = list(dict.fromkeys(sequence))
+        index: Dict[str, int] = {name: i for i, name in enumerate(names)}
+        funnel_paths = []
+        for steps in funnels.values():
+            path = [step for step in steps if step in index or step in allowed]
+            for step in path:
+                if step not in index:
+                    index[step] = len(names)
+                    names.append(step)
+            funnel_paths.append([index[step] for step in path])
+
+        n = len(names)
+        sequence_next = np.zeros((n, n))
+        for current, following in zip(sequence, sequence[1:]):
+            sequence_next[index[current], index[following]] += 1.0
+        funnel_next = np.zeros((n, n))
+        for path in funnel_paths:
+            for current, following in zip(path, path[1:]):
+                funnel_next[current, following] += 1.0
+
+        weights = event_weights or {}
+        jump = np.array([max(float(weights.get(name, 1.0)), 0.0) for name in names])
+        if jump.sum() <= 0:
+            jump = np.ones(n)
+
+        matrix = np.zeros((n, n))
+        for component, weight in (
+            (sequence_next, self.SEQUENCE_WEIGHT),
+            (funnel_next, self.FUNNEL_WEIGHT),
+            (np.broadcast_to(jump, (n, n)), self.JUMP_WEIGHT),
+        ):
+            totals = component.sum(axis=1, keepdims=True)
+            matrix += np.divide(component, totals, out=np.zeros((n, n)), where=totals > 0) * weight
+        matrix /= matrix.sum(axis=1, keepdims=True)
+
+        self.names = names
+        self.index = index
+        self.transition_matrix = matrix
+        self.initial_state = index[sequence[0]]
+        self.max_events = min(max_events if max_events is not None else len(sequence), (1 << STEP_BITS) - 1)
+        # 행별 Walker alias 테이블 - 걸음마다 상태 수와 무관하게 세션당 O(1)
+        tables = [alias_table(row) for row in matrix.tolist()]
+        self._alias_rows = tables  # 세션 1개를 파이썬으로 샘플링할 때 사용 (작은 배열의 NumPy 호출 비용 회피)
+        self._alias_prob = np.array([prob for prob, _ in tables])
+        self._alias_next = np.array([alias for _, alias in tables], dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def event_counts(self, duration_minutes: np.ndarray) -> np.ndarray:
+        """세션 길이(분)별 이벤트 수 - 2~3분에 1개, 최소 2개, 최대 max_events"""
+        counts = (np.asarray(duration_minutes, dtype=float) / 2.5).astype(np.int64)
+        return np.minimum(np.maximum(counts, 2), self.max_events)
+
+    def walk(self, uniforms: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        여러 세션을 동시에 샘플링
+
+        Args:
+            uniforms: (sessions, steps) [0, 1) 균등 난수 (t번째 열로 t번째 이벤트를 고름, 0번째 열은 미사용)
+            counts: (sessions,) 세션별 이벤트 수 (steps 이하)
+
+        Returns:
+            (sessions, steps) int16 상태 인덱스 (세션 이벤트 수 이후는 -1)
+        """
+        session_count, steps = uniforms.shape
+        codes = np.full((session_count, steps), -1, dtype=np.int16)
+        if session_count == 0 or steps == 0:
+            return codes
+
+        n = len(self.names)
+        state = np.full(session_count, self.initial_state, dtype=np.intp)
+        codes[:, 0] = np.where(counts > 0, state, -1)
+        for t in range(1, steps):
+            scaled = uniforms[:, t] * n
+            column = np.minimum(scaled.astype(np.intp), n - 1)
+            keep = scaled - column < self._alias_prob[state, column]
+            state = np.where(keep, column, self._alias_next[state, column])
+            codes[:, t] = np.where(counts > t, state, -1)
+        return codes
+
+    def sample(self, rng: random.Random, count: int) -> List[str]:
+        """세션 1개 샘플링 (계획 없이 단독으로 호출될 때 - rng에서 걸음마다 난수 1개)"""
+        if count <= 0:
+            return []
+        # walk()와 같은 규칙을 세션 1개에 대해 파이썬으로 적용
+        rand = rng.random
+        names, rows = self.names, self._alias_rows
+        n = len(names)
+        state = self.initial_state
+        events = [names[state]]
+        for _ in range(count - 1):
+            scaled = rand() * n
+            column = min(int(scaled), n - 1)
+            prob, alias = rows[state]
+            state = column if scaled - column < prob[column] else alias[column]
+            events.append(names[state])
+        return events
+
+    def decode_batch(self, codes: np.ndarray, counts: np.ndarray) -> List[List[str]]:
+        """walk() 결과 → 세션별 이벤트명 리스트 (이름 조회를 NumPy로 한 번에)"""
+        name_table = np.array(self.names + [None], dtype=object)  # -1(빈 칸)은 마지막 None
+        return [row[:count] for row, count in zip(name_table[codes].tolist(), counts.tolist())]
+
+    def decode(self, codes: np.ndarray) -> List[str]:
+        """상태 인덱스 행 → 이벤트명 리스트 (-1에서 멈춤)"""
+        names = self.names
+        events = []
+        for code in codes.tolist():
+            if code < 0:
+                break
+            events.append(names[code])
+        return events
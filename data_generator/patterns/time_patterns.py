@@ -1,15 +1,62 @@
 """
 Time-based patterns for realistic data generation.
 """
-import random
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Sequence
 import numpy as np
 
+from ..utils.rng import RandomStreams
+
+
+@dataclass
+class DailySessionPlan:
+    """
+    하루치 전체 유저의 세션 계획 (TimePatternGenerator.plan_daily_sessions 결과)
+
+    유저 i의 세션은 session_offsets[i]:session_offsets[i + 1] 구간에 있으며 시작 시각 순으로 정렬되어 있다.
+    """
+    active: np.ndarray  # (users,) bool - 오늘 활동 여부
+    session_counts: np.ndarray  # (users,) int - 세션 수 (비활성 유저는 0)
+    session_offsets: np.ndarray  # (users + 1,) int - 유저별 세션 구간 시작 인덱스
+    start_seconds: np.ndarray  # (sessions,) int - 자정 기준 세션 시작 초
+    duration_minutes: np.ndarray  # (sessions,) float - 세션 길이 (분)
+
+    def sessions_for(self, user_index: int, date: datetime) -> List[tuple]:
+        """유저 1명의 세션을 (start_time, end_time) 튜플 리스트로 변환"""
+        begin, end = self.session_offsets[user_index], self.session_offsets[user_index + 1]
+        return [
+            (date + timedelta(seconds=start), date + timedelta(seconds=start, minutes=duration))
+            for start, duration in zip(
+                self.start_seconds[begin:end].tolist(), self.duration_minutes[begin:end].tolist()
+            )
+        ]
+
 
 class TimePatternGenerator:
     """Generates realistic time-based patterns"""
 
+    # 세그먼트별 일일 활동 확률 계수
+    SEGMENT_ACTIVITY_MULTIPLIERS = {
+        "new_user": 0.9,  # High initial engagement
+        "active_user": 1.0,
+        "power_user": 1.2,  # Very consistent
+        "churning_user": 0.5,  # Declining engagement
+        "churned_user": 0.05,  # Rarely active
+        "returning_user": 0.7,
+    }
+
+    # 요일별 활동 계수 (0=Monday, 6=Sunday)
+    DAY_OF_WEEK_MULTIPLIERS = {
+        0: 0.9,   # Monday - slightly lower
+        1: 1.0,   # Tuesday
+        2: 1.0,   # Wednesday
+        3: 1.0,   # Thursday
+        4: 1.1,   # Friday - slightly higher
+        5: 1.2,   # Saturday - weekend boost
+        6: 1.15,  # Sunday - weekend boost
+    }
+
     @staticmethod
     def get_hourly_distribution(pattern_type: str = "normal") -> Dict[int, float]:
         """
@@ -54,96 +101,134 @@ class TimePatternGenerator:
         Get day-of-week activity distribution (0=Monday, 6=Sunday).
         Returns multiplier for each day.
         """
-        return {
-            0: 0.9,   # Monday - slightly lower
-            1: 1.0,   # Tuesday
-            2: 1.0,   # Wednesday
-            3: 1.0,   # Thursday
-            4: 1.1,   # Friday - slightly higher
-            5: 1.2,   # Saturday - weekend boost
-            6: 1.15,  # Sunday - weekend boost
-        }
+        return dict(TimePatternGenerator.DAY_OF_WEEK_MULTIPLIERS)
 
     @staticmethod
-    def generate_session_times(
-        date: datetime,
-        session_count: int,
-        hourly_dist: Dict[int, float],
-        session_duration_minutes: float,
-    ) -> List[tuple]:
-        """
-        Generate realistic session start and end times for a day.
-
-        Returns:
-            List of (start_time, end_time) tuples
-        """
-        sessions = []
-
-        # Convert hourly distribution to probabilities
-        hours = list(range(24))
-        probs = [hourly_dist.get(h, 0) for h in hours]
-        probs = np.array(probs) / sum(probs)
-
-        # Generate session start hours
-        start_hours = np.random.choice(hours, size=session_count, p=probs)
-        start_hours = sorted(start_hours)
+    def get_hourly_probabilities(pattern_type: str = "normal") -> np.ndarray:
+        """시간대 분포를 합이 1인 24개 확률 배열로 변환 (패턴별 캐싱)"""
+        probs = _HOURLY_PROBABILITY_CACHE.get(pattern_type)
+        if probs is None:
+            hourly_dist = TimePatternGenerator.get_hourly_distribution(pattern_type)
+            probs = np.array([hourly_dist.get(h, 0) for h in range(24)], dtype=float)
+            probs /= probs.sum()
+            probs.setflags(write=False)
+            _HOURLY_PROBABILITY_CACHE[pattern_type] = probs
+        return probs
 
-        for hour in start_hours:
-            # Add random minutes within the hour
-            minute = random.randint(0, 59)
-            second = random.randint(0, 59)
-
-            start_time = date.replace(hour=hour, minute=minute, second=second)
-
-            # Calculate end time with some randomness
-            duration_variance = random.uniform(0.7, 1.3)  # ±30% variance
-            actual_duration = session_duration_minutes * duration_variance
-            end_time = start_time + timedelta(minutes=actual_duration)
-
-            sessions.append((start_time, end_time))
-
-        return sessions
+    @staticmethod
+    def get_hourly_cdf(pattern_type: str = "normal") -> np.ndarray:
+        """시간대 분포의 누적 확률 배열 (역변환 샘플링용, 패턴별 캐싱)"""
+        cdf = _HOURLY_CDF_CACHE.get(pattern_type)
+        if cdf is None:
+            cdf = np.cumsum(TimePatternGenerator.get_hourly_probabilities(pattern_type))
+            cdf.setflags(write=False)
+            _HOURLY_CDF_CACHE[pattern_type] = cdf
+        return cdf
 
     @staticmethod
-    def should_user_be_active(
+    def plan_daily_sessions(
         date: datetime,
-        user_segment: str,
-        base_daily_probability: float = 0.8
-    ) -> bool:
+        stream_ids: Sequence[int],
+        segments: Sequence[str],
+        activity_probabilities: Sequence[float],
+        session_ranges: Sequence[Sequence[int]],
+        duration_ranges: Sequence[Sequence[float]],
+        time_patterns: Sequence[str],
+        rng: RandomStreams,
+    ) -> DailySessionPlan:
         """
-        Determine if a user should be active on a given day.
+        전체 유저의 하루 활동 여부/세션 수/세션 시작 시각/세션 길이를 NumPy로 한 번에 샘플링
+
+        활동 확률은 기본 확률 x 세그먼트 계수 x 요일 계수, 시작 시각은 시간대 패턴 분포, 길이는 평균 ±30%이며,
+        유저 수와 무관하게 몇 번의 배열 연산으로 끝난다.
+        난수는 rng.counter_uniforms로 (날짜, 유저 스트림 id, 세션 번호)마다 고정되므로
+        유저를 어떻게 나눠서(샤딩) 계획해도 유저별 결과는 같다.
 
         Args:
-            date: The date to check
-            user_segment: User segment type
-            base_daily_probability: Base probability of being active
+            date: 대상 날짜 (자정)
+            stream_ids: 유저별 난수 스트림 id (UserStore.stream_ids)
+            segments: 유저별 세그먼트 값 (user.segment.value)
+            activity_probabilities: 유저별 기본 일일 활동 확률
+            session_ranges: 유저별 (최소, 최대) 일일 세션 수
+            duration_ranges: 유저별 (최소, 최대) 평균 세션 길이 (분)
+            time_patterns: 유저별 시간대 패턴 (normal, power_user, night_owl, morning_person)
+            rng: 공유 난수 스트림
 
         Returns:
-            True if user should be active
+            DailySessionPlan
         """
-        # Adjust probability based on segment
-        segment_multipliers = {
-            "new_user": 0.9,  # High initial engagement
-            "active_user": 1.0,
-            "power_user": 1.2,  # Very consistent
-            "churning_user": 0.5,  # Declining engagement
-            "churned_user": 0.05,  # Rarely active
-            "returning_user": 0.7,
-        }
-
-        multiplier = segment_multipliers.get(user_segment, 1.0)
-        probability = base_daily_probability * multiplier
-
-        # Day of week effect
-        day_multipliers = TimePatternGenerator.get_day_of_week_distribution()
-        day_multiplier = day_multipliers.get(date.weekday(), 1.0)
-
-        final_probability = min(probability * day_multiplier, 1.0)
-
-        return random.random() < final_probability
-
-    @staticmethod
-    def add_realistic_microseconds(dt: datetime) -> datetime:
-        """Add realistic microseconds to a datetime"""
-        microseconds = random.randint(0, 999999)
-        return dt.replace(microsecond=microseconds)
+        user_count = len(segments)
+        day = date.toordinal()
+        scope = RandomStreams.SCOPE_DAY_PLAN
+        stream_ids = np.asarray(stream_ids, dtype=np.uint64).reshape(user_count)
+
+        # 1. 활동 여부: 기본 확률 x 세그먼트 계수 x 요일 계수
+        segment_values, segment_codes = np.unique(np.asarray(segments, dtype=object), return_inverse=True)
+        segment_multipliers = np.array(
+            [TimePatternGenerator.SEGMENT_ACTIVITY_MULTIPLIERS.get(value, 1.0) for value in segment_values],
+            dtype=float,
+        )
+        day_multiplier = TimePatternGenerator.DAY_OF_WEEK_MULTIPLIERS.get(date.weekday(), 1.0)
+        probabilities = np.minimum(
+            np.asarray(activity_probabilities, dtype=float).reshape(user_count)
+            * segment_multipliers[segment_codes.reshape(user_count)] * day_multiplier,
+            1.0,
+        )
+        active = rng.counter_uniforms(stream_ids, scope, day, 0) < probabilities
+
+        # 2. 세션 수 (양 끝 포함)와 유저별 평균 세션 길이
+        session_ranges = np.asarray(session_ranges, dtype=np.int64).reshape(user_count, 2)
+        duration_ranges = np.asarray(duration_ranges, dtype=float).reshape(user_count, 2)
+        if np.any(session_ranges[:, 1] < session_ranges[:, 0]):
+            raise ValueError("daily_session_range의 최소값이 최대값보다 큽니다")
+
+        span = session_ranges[:, 1] - session_ranges[:, 0] + 1
+        session_counts = session_ranges[:, 0] + np.minimum(
+            (rng.counter_uniforms(stream_ids, scope, day, 1) * span).astype(np.int64), span - 1
+        )
+        session_counts = np.where(active, np.maximum(session_counts, 0), 0)
+        avg_durations = duration_ranges[:, 0] + rng.counter_uniforms(stream_ids, scope, day, 2) * (
+            duration_ranges[:, 1] - duration_ranges[:, 0]
+        )
+
+        session_offsets = np.zeros(user_count + 1, dtype=np.int64)
+        np.cumsum(session_counts, out=session_offsets[1:])
+        total_sessions = int(session_offsets[-1])
+        owners = np.repeat(np.arange(user_count), session_counts)
+        session_ids = stream_ids[owners]
+        session_numbers = np.arange(total_sessions, dtype=np.int64) - session_offsets[owners]
+
+        # 3. 세션 시작 시간대: 시간대 패턴별 누적 분포에서 역변환 샘플링
+        hour_uniforms = rng.counter_uniforms(session_ids, scope, day, 3, sub=session_numbers)
+        start_hours = np.empty(total_sessions, dtype=np.int64)
+        pattern_values, pattern_codes = np.unique(np.asarray(time_patterns, dtype=object), return_inverse=True)
+        session_pattern_codes = pattern_codes.reshape(user_count)[owners]
+        for code, pattern_type in enumerate(pattern_values):
+            mask = session_pattern_codes == code
+            if mask.any():
+                cdf = TimePatternGenerator.get_hourly_cdf(pattern_type)
+                start_hours[mask] = np.minimum(np.searchsorted(cdf, hour_uniforms[mask], side="right"), 23)
+
+        # 유저 안에서 시작 시간대 순으로 정렬 (분/초는 정렬 후 무작위로 부여)
+        order = np.lexsort((start_hours, owners))
+        start_hours = start_hours[order]
+        minutes = (rng.counter_uniforms(session_ids, scope, day, 4, sub=session_numbers) * 60).astype(np.int64)
+        seconds = (rng.counter_uniforms(session_ids, scope, day, 5, sub=session_numbers) * 60).astype(np.int64)
+        start_seconds = start_hours * 3600 + minutes * 60 + seconds
+
+        # 4. 세션 길이: 유저 평균 길이 ±30%
+        variance = 0.7 + 0.6 * rng.counter_uniforms(session_ids, scope, day, 6, sub=session_numbers)
+        duration_minutes = avg_durations[owners] * variance
+
+        return DailySessionPlan(
+            active=active,
+            session_counts=session_counts,
+            session_offsets=session_offsets,
+            start_seconds=start_seconds,
+            duration_minutes=duration_minutes,
+        )
+
+
+# 시간대 패턴별 정규화된 확률 배열 캐시 (get_hourly_probabilities)
+_HOURLY_PROBABILITY_CACHE: Dict[str, np.ndarray] = {}
+_HOURLY_CDF_CACHE: Dict[str, np.ndarray] = {}
@@ -0,0 +1,454 @@
+"""
+ThinkingEngine receiver 직접 업로드 모듈 (LogBus2 바이너리 없이)
+
+생성된 JSONL(.gz/.zst 포함)을 읽어 배치 단위로 gzip 압축해 push_url로 전송한다.
+ThinkingData SDK와 같은 /sync_server 프로토콜을 사용하며, 스레드마다 연결을 재사용하고
+429/5xx/연결 오류는 지수 백오프 + 지터로 재시도한다.
+파일별로 연속해서 전송이 끝난 바이트 오프셋을 체크포인트에 남겨 중단 후 이어서 전송할 수 있다.
+"""
+import os
+import json
+import gzip
+import time
+import socket
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..utils.rate_limiter import jittered_backoff
+from ..writers.jsonl_writer import open_log_reader
+
+
+DEFAULT_ENDPOINT_PATH = "/sync_server"
+
+
+class ReceiverError(Exception):
+    """receiver가 배치를 받지 않음 (retryable이면 재시도 대상)"""
+
+    def __init__(self, message: str, retryable: bool, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+@dataclass
+class UploadResult:
+    """업로드 결과 집계"""
+    files: int = 0  # 전송을 마친 파일 수 (이전 실행에서 끝난 파일 제외)
+    skipped_files: int = 0  # 체크포인트상 이미 전송이 끝난 파일 수
+    lines: int = 0
+    bytes_read: int = 0  # 압축 전 JSONL 바이트 수
+    bytes_sent: int = 0  # 전송한 HTTP 본문 바이트 수 (gzip 압축 후)
+    batches: int = 0
+    retries: int = 0
+    elapsed_seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+    @property
+    def lines_per_second(self) -> float:
+        return self.lines / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class UploadCheckpoint:
+    """
+    파일별 전송 완료 오프셋 (압축 해제 기준 바이트)
+
+    배치는 동시에 전송되므로 끝난 순서가 뒤섞일 수 있다. 파일 앞에서부터 빈틈없이 끝난 구간까지만
+    오프셋을 올리므로, 중단 후 재실행하면 일부 배치가 다시 전송될 수는 있어도 빠지지는 않는다.
+    path가 None이면 메모리에서만 추적한다.
+    """
+
+    def __init__(self, path: Optional[Path] = None, save_interval: float = 1.0):
+        self.path = Path(path) if path else None
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._completed: Dict[str, Dict[int, int]] = {}  # 파일 → {배치 시작: 배치 끝} (오프셋보다 앞서 끝난 배치)
+        self._final_offsets: Dict[str, int] = {}  # 읽기가 끝난 파일의 마지막 오프셋
+        self._last_saved = 0.0
+        if self.path and self.path.exists():
+            try:
+                self._entries = json.loads(self.path.read_text(encoding="utf-8")).get("files", {})
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️  체크포인트를 읽을 수 없어 처음부터 전송합니다: {e}")
+
+    @staticmethod
+    def _signature(path: Path) -> Dict:
+        stat = path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def start_file(self, path: Path) -> Optional[int]:
+        """
+        전송을 시작할 오프셋 반환 (이미 끝난 파일이면 None)
+
+        체크포인트 이후 파일이 바뀌었으면(크기/수정 시각) 처음부터 전송.
+        """
+        key = str(Path(path).absolute())
+        signature = self._signature(Path(path))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.get("size") != signature["size"] or entry.get("mtime_ns") != signature["mtime_ns"]:
+                entry = {**signature, "offset": 0, "done": False}
+                self._entries[key] = entry
+            self._completed[key] = {}
+            self._final_offsets.pop(key, None)
+            return None if entry["done"] else entry["offset"]
+
+    def complete_batch(self, path: Path, start: int, end: int) -> bool:
+        """
+        배치 전송 완료 반영
+
+        Returns:
+            이 배치로 파일 전체 전송이 끝났으면 True
+        """
+        key = str(Path(path).absolute())
+        with self._lock:
+            entry = self._entries[key]
+            completed = self._completed[key]
+            completed[start] = end
+            while entry["offset"] in completed:
+                entry["offset"] = completed.pop(entry["offset"])
+            done = self._check_done(key)
+        self._maybe_save()
+        return done
+
+    def finish_reading(self, path: Path, final_offset: int) -> bool:
+        """
+        파일 읽기 완료 (마지막 배치까지 제출함)
+
+        Returns:
+            이미 모든 배치 전송이 끝나 있으면 True
+        """
+        key = str(Path(path).absolute())
+        with self._lock:
+            self._final_offsets[key] = final_offset
+            done = self._check_done(key)
+        self._maybe_save()
+        return done
+
+    def _check_done(self, key: str) -> bool:
+        entry = self._entries[key]
+        if entry["done"] or self._final_offsets.get(key) != entry["offset"]:
+            return False
+        entry["done"] = True
+        return True
+
+    def _maybe_save(self, force: bool = False):
+        if self.path is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_saved < self.save_interval:
+            return
+        with self._lock:
+            data = json.dumps({"files": self._entries}, ensure_ascii=False, indent=2)
+            self._last_saved = now
+        # 쓰는 중에 중단돼도 이전 체크포인트가 남도록 임시 파일에 쓰고 교체
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        temp_path.write_text(data, encoding="utf-8")
+        os.replace(temp_path, self.path)
+
+    def save(self):
+        """체크포인트 즉시 저장"""
+        self._maybe_save(force=True)
+
+    def clear(self):
+        """체크포인트 삭제 (처음부터 다시 전송)"""
+        with self._lock:
+            self._entries = {}
+            self._completed = {}
+            self._final_offsets = {}
+        if self.path and self.path.exists():
+            self.path.unlink()
+
+
+class HttpUploader:
+    """
+    ThinkingEngine receiver로 JSONL을 직접 전송
+
+    파일을 순서대로 읽어 배치(최대 batch_lines 라인 / batch_bytes 바이트)를 만들고
+    concurrency개 스레드가 동시에 전송한다. 메모리에는 최대 concurrency * 2개 배치만 올라간다.
+    """
+
+    def __init__(
+        self,
+        push_url: str,
+        app_id: str,
+        concurrency: int = 4,
+        batch_lines: int = 500,
+        batch_bytes: int = 1024 * 1024,
+        compress: bool = True,
+        compression_level: int = 6,
+        max_retries: int = 5,
+        timeout: float = 30.0,
+        checkpoint: Optional[UploadCheckpoint] = None,
+        on_progress: Optional[Callable[[UploadResult], None]] = None,
+    ):
+        """
+        Args:
+            push_url: ThinkingEngine receiver URL (경로가 없으면 /sync_server)
+            app_id: ThinkingEngine APP ID
+            concurrency: 동시 전송 스레드 수
+            batch_lines: 배치당 최대 라인 수
+            batch_bytes: 배치당 최대 바이트 수 (압축 전)
+            compress: True면 배치 본문을 gzip 압축
+            compression_level: gzip 압축 레벨
+            max_retries: 배치당 최대 재시도 횟수
+            timeout: 요청 타임아웃 (초)
+            checkpoint: 전송 오프셋 체크포인트 (None이면 메모리에서만 추적)
+            on_progress: 배치 전송이 끝날 때마다 호출 (누적 결과 전달)
+        """
+        if concurrency < 1 or batch_lines < 1 or batch_bytes < 1:
+            raise ValueError("concurrency, batch_lines, batch_bytes must be positive")
+
+        url = urlsplit(push_url if "://" in push_url else f"http://{push_url}")
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported push_url scheme: {url.scheme}")
+        self.scheme = url.scheme
+        self.host = url.hostname
+        self.port = url.port
+        self.endpoint = url.path if url.path not in ("", "/") else DEFAULT_ENDPOINT_PATH
+        if url.query:
+            self.endpoint += f"?{url.query}"
+
+        self.app_id = app_id
+        self.concurrency = concurrency
+        self.batch_lines = batch_lines
+        self.batch_bytes = batch_bytes
+        self.compress = compress
+        self.compression_level = compression_level
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.checkpoint = checkpoint or UploadCheckpoint()
+        self.on_progress = on_progress
+
+        self._local = threading.local()  # 스레드별 HTTP 연결 (keep-alive 재사용)
+        self._connections: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._failed = threading.Event()
+        self._result = UploadResult()
+
+    # ------------------------------------------------------------------
+    # 업로드
+    # ------------------------------------------------------------------
+
+    def upload_files(self, files: Iterable[Path]) -> UploadResult:
+        """
+        파일들을 순서대로 전송 (배치는 동시에 전송)
+
+        한 배치라도 재시도 끝에 실패하면 새 배치 제출을 멈추고 실패 결과를 반환한다.
+        """
+        self._result = UploadResult()
+        self._failed.clear()
+        started_at = time.perf_counter()
+        slots = threading.BoundedSemaphore(self.concurrency * 2)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="te-upload") as pool:
+                for path in files:
+                    if self._failed.is_set():
+                        break
+                    path = Path(path)
+                    offset = self.checkpoint.start_file(path)
+                    if offset is None:
+                        with self._lock:
+                            self._result.skipped_files += 1
+                        continue
+
+                    end = offset
+                    for start, end, lines in self._iter_batches(path, offset):
+                        slots.acquire()
+                        if self._failed.is_set():
+                            slots.release()
+                            break
+                        future = pool.submit(self._send_batch, path, start, end, lines)
+                        future.add_done_callback(lambda _: slots.release())
+                    else:
+                        if self.checkpoint.finish_reading(path, end):
+                            self._file_done()
+        finally:
+            self._close_connections()
+            self.checkpoint.save()
+
+        self._result.elapsed_seconds = time.perf_counter() - started_at
+        return self._result
+
+    def _iter_batches(self, path: Path, offset: int) -> Iterator[Tuple[int, int, List[bytes]]]:
+        """
+        (시작 오프셋, 끝 오프셋, 라인 목록) 배치 순회 (빈 라인은 건너뜀)
+
+        라인 단위로 읽지 않고 batch_bytes 블록을 읽어 한 번에 나누므로, 생성과 같은 프로세스에서
+        돌아가도 (생성-업로드 파이프라인) 파이썬 루프가 GIL을 오래 잡지 않는다.
+        """
+        batch_lines = self.batch_lines
+        with open_log_reader(path) as reader:
+            if offset:
+                self._skip_to(reader, offset)
+            position = offset
+            pending = b""  # 블록 끝에서 잘린 라인
+            while True:
+                chunk = reader.read(self.batch_bytes)
+                if not chunk:
+                    break
+                data = pending + chunk if pending else chunk
+                cut = data.rfind(b"\n") + 1
+                pending = data[cut:]
+                if not cut:
+                    continue
+                lines = data[:cut].split(b"\n")
+                lines.pop()  # 마지막 개행 뒤의 빈 조각
+                for i in range(0, len(lines), batch_lines):
+                    group = lines[i:i + batch_lines]
+                    start = position
+                    position += sum(map(len, group)) + len(group)
+                    yield start, position, [line for line in group if line.strip()]
+            if pending:
+                start = position
+                position += len(pending)
+                yield start, position, [pending] if pending.strip() else []
+
+    @staticmethod
+    def _skip_to(reader, offset: int):
+        """압축 해제 기준 offset까지 건너뜀 (seek가 안 되는 스트림은 읽어서 버림)"""
+        try:
+            reader.seek(offset)
+        except (OSError, ValueError):
+            remaining = offset
+            while remaining > 0:
+                chunk = reader.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+
+    def _send_batch(self, path: Path, start: int, end: int, lines: List[bytes]):
+        """배치 1개 전송 (재시도 포함) 후 체크포인트 반영"""
+        if self._failed.is_set():
+            return
+        try:
+            sent = self._send(lines) if lines else 0
+        except Exception as e:
+            with self._lock:
+                if self._result.error is None:
+                    self._result.error = f"{path.name} [{start}:{end}] 전송 실패: {e}"
+            self._failed.set()
+            return
+
+        with self._lock:
+            self._result.lines += len(lines)
+            self._result.bytes_read += end - start
+            self._result.bytes_sent += sent
+            self._result.batches += 1
+        if self.checkpoint.complete_batch(path, start, end):
+            self._file_done()
+        elif self.on_progress is not None:
+            self.on_progress(self._result)
+
+    def _file_done(self):
+        with self._lock:
+            self._result.files += 1
+        if self.on_progress is not None:
+            self.on_progress(self._result)
+
+    def _send(self, lines: List[bytes]) -> int:
+        """
+        배치 본문을 만들어 전송 (재시도 대상 오류는 백오프 후 다시 시도)
+
+        Returns:
+            전송한 본문 바이트 수
+        """
+        body = b"[" + b",".join(lines) + b"]"
+        if self.compress:
+            body = gzip.compress(body, compresslevel=self.compression_level, mtime=0)
+
+        attempt = 0
+        while True:
+            try:
+                self._post(body, len(lines))
+                return len(body)
+            except ReceiverError as e:
+                if not e.retryable or attempt >= self.max_retries:
+                    raise
+                retry_after = e.retry_after
+            except (OSError, http.client.HTTPException) as e:
+                # 연결이 끊겼으면 다음 시도에서 새로 연결
+                self._reset_connection()
+                if attempt >= self.max_retries:
+                    raise ReceiverError(f"연결 오류: {e}", retryable=False) from e
+                retry_after = None
+
+            with self._lock:
+                self._result.retries += 1
+            time.sleep(jittered_backoff(attempt, retry_after, base_seconds=0.5, max_seconds=30.0))
+            attempt += 1
+
+    def _post(self, body: bytes, count: int):
+        """HTTP POST 1회 (receiver 응답 code가 0이 아니면 ReceiverError)"""
+        headers = {
+            "appid": self.app_id,
+            "compress": "gzip" if self.compress else "none",
+            "Content-Type": "application/json",
+            "TA-Integration-Type": "demo-data-generator",
+            "TA-Integration-Count": str(count),
+        }
+        connection = self._connection()
+        connection.request("POST", self.endpoint, body=body, headers=headers)
+        response = connection.getresponse()
+        payload = response.read()
+
+        if response.status == 429 or response.status >= 500:
+            retry_after = response.getheader("Retry-After")
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            raise ReceiverError(f"HTTP {response.status}", retryable=True, retry_after=retry_after)
+        if response.status != 200:
+            raise ReceiverError(f"HTTP {response.status}: {payload[:200]!r}", retryable=False)
+
+        try:
+            code = json.loads(payload).get("code", 0) if payload.strip() else 0
+        except (ValueError, AttributeError):
+            code = 0
+        if code != 0:
+            raise ReceiverError(f"receiver code {code}: {payload[:200]!r}", retryable=False)
+
+    # ------------------------------------------------------------------
+    # 연결 관리
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            connection = connection_class(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _reset_connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            try:
+                connection.close()
+            except (OSError, socket.error):
+                pass
+            self._local.connection = None
+
+    def _close_connections(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.close()
+            except OSError:
+                pass
+        self._local = threading.local()
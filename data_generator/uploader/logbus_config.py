@@ -6,6 +6,23 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass, field
 
+from ..writers.jsonl_writer import COMPRESSION_SUFFIXES, output_file_pattern
+
+
+def detect_file_patterns(data_dir: Path) -> List[str]:
+    """
+    디렉터리에 있는 생성 로그 파일 형식(무압축/gzip/zstd)별 glob 패턴
+
+    생성 시 압축/분할 설정과 관계없이 logs_YYYYMMDD[_HH][.NNN].jsonl[.gz|.zst] 파일을 모두 잡는다.
+    해당하는 파일이 없으면 무압축 패턴만 반환.
+    """
+    patterns = [
+        output_file_pattern(compression)
+        for compression in COMPRESSION_SUFFIXES
+        if any(data_dir.glob(output_file_pattern(compression)))
+    ]
+    return patterns or [output_file_pattern("none")]
+
 
 @dataclass
 class LogBusDataSource:
@@ -98,13 +115,13 @@ class LogBusConfigGenerator:
         file_path = Path(data_file_path)
         if file_path.is_file():
             # 특정 파일인 경우 해당 파일만
-            pattern = str(file_path.absolute())
+            patterns = [str(file_path.absolute())]
         else:
-            # 디렉터리인 경우 *.jsonl 패턴
-            pattern = str(file_path.absolute() / "*.jsonl")
+            # 디렉터리인 경우 들어 있는 로그 파일 형식(압축 여부)별 패턴
+            patterns = [str(file_path.absolute() / pattern) for pattern in detect_file_patterns(file_path)]
 
         datasource = LogBusDataSource(
-            file_patterns=[pattern],
+            file_patterns=patterns,
             app_id=app_id,
             http_compress=http_compress,
             unit_remove="day" if auto_remove else None,
@@ -125,7 +142,8 @@ class LogBusConfigGenerator:
         data_dir: str,
         app_id: str,
         push_url: str,
-        file_pattern: str = "*.jsonl",
+        file_pattern: Optional[str] = None,
+        compression: Optional[str] = None,
         cpu_limit: Optional[int] = 4,
         http_compress: str = "gzip",
         auto_remove: bool = False,
@@ -139,7 +157,8 @@ class LogBusConfigGenerator:
             data_dir: 데이터 파일이 있는 디렉터리 경로
             app_id: ThinkingEngine APP ID
             push_url: ThinkingEngine Receiver URL
-            file_pattern: 파일 매칭 패턴 (예: "*.jsonl", "logs_*.jsonl")
+            file_pattern: 파일 매칭 패턴 (예: "*.jsonl", "logs_*.jsonl.gz") - None이면 compression에 맞는 패턴
+            compression: 생성 시 출력 압축 방식 (none, gzip, zstd) - None이면 디렉터리 내용으로 판단
             cpu_limit: CPU 코어 수 제한
             http_compress: HTTP 압축 방식
             auto_remove: 파일 자동 삭제 여부
@@ -147,10 +166,15 @@ class LogBusConfigGenerator:
             remove_dirs: 디렉터리 자동 삭제 여부
         """
         dir_path = Path(data_dir).absolute()
-        pattern = str(dir_path / file_pattern)
+        if file_pattern:
+            patterns = [file_pattern]
+        elif compression:
+            patterns = [output_file_pattern(compression)]
+        else:
+            patterns = detect_file_patterns(dir_path)
 
         datasource = LogBusDataSource(
-            file_patterns=[pattern],
+            file_patterns=[str(dir_path / pattern) for pattern in patterns],
             app_id=app_id,
             http_compress=http_compress,
             unit_remove="day" if auto_remove else None,
@@ -0,0 +1,124 @@
+"""
+생성-업로드 파이프라인
+
+LogGenerator가 파일 1개(하루치 또는 분할 조각)를 완성할 때마다 크기가 제한된 큐로 넘기고,
+백그라운드 스레드의 HttpUploader가 이어서 전송한다. 업로드가 밀려 큐가 가득 차면
+생성 쪽 submit()이 막히므로 생성도 함께 멈춘다 (백프레셔).
+전체 시간은 생성 + 업로드 합이 아니라 둘 중 느린 쪽에 가까워진다.
+"""
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from .http_uploader import HttpUploader, UploadResult
+from ..writers.report import FileStats
+
+
+_END = object()  # 큐 종료 표시
+
+
+class UploadPipeline:
+    """
+    완성된 파일을 순서대로 받아 백그라운드에서 업로드
+
+    사용 예:
+        with UploadPipeline(uploader) as pipeline:
+            LogGenerator(..., on_file_complete=pipeline.submit).generate()
+        result = pipeline.result
+    """
+
+    def __init__(self, uploader: HttpUploader, max_pending_files: int = 2):
+        """
+        Args:
+            uploader: 파일 전송에 사용할 HttpUploader (체크포인트 포함)
+            max_pending_files: 전송을 기다릴 수 있는 최대 파일 수 (넘으면 생성이 대기)
+        """
+        if max_pending_files < 1:
+            raise ValueError("max_pending_files must be positive")
+        self.uploader = uploader
+        self.max_pending_files = max_pending_files
+        self.result: Optional[UploadResult] = None
+        self.submitted_files = 0
+        self.wait_seconds = 0.0  # 큐가 가득 차서 생성이 기다린 시간 합
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending_files)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._stopped_warned = False
+
+    def start(self) -> "UploadPipeline":
+        self._thread = threading.Thread(target=self._run, name="te-upload-pipeline", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self.uploader.upload_files(self._pending_files())
+        except BaseException as e:  # 생성 쪽에서 close() 때 다시 알림
+            self._error = e
+
+    def _pending_files(self) -> Iterator[Path]:
+        while True:
+            path = self._queue.get()
+            if path is _END:
+                return
+            yield path
+
+    def submit(self, file: Union[FileStats, Path]):
+        """
+        완성된 파일을 업로드 큐에 추가 (큐가 가득 차면 자리가 날 때까지 대기)
+
+        업로드가 실패해 멈춘 뒤에는 파일을 받지 않는다 (생성은 계속되고, 남은 파일은 upload 명령으로 재개).
+        """
+        path = file.path if isinstance(file, FileStats) else Path(file)
+        started_at = time.perf_counter()
+        if self._put(path):
+            self.submitted_files += 1
+        elif not self._stopped_warned:
+            self._stopped_warned = True
+            print(f"  ⚠️  업로드가 중단되어 이후 파일은 전송하지 않습니다: {self._failure()}")
+        self.wait_seconds += time.perf_counter() - started_at
+
+    def _put(self, item) -> bool:
+        """업로드 스레드가 살아 있는 동안 큐에 넣기 시도 (스레드가 끝났으면 False)"""
+        while self._thread is not None and self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _failure(self) -> str:
+        if self._error is not None:
+            return str(self._error)
+        if self.result is not None and self.result.error:
+            return self.result.error
+        return "업로드 스레드 종료"
+
+    def close(self) -> UploadResult:
+        """남은 파일 전송을 기다린 뒤 결과 반환"""
+        if self._thread is None:
+            return self.result or UploadResult()
+        self._put(_END)
+        self._thread.join()
+        self._thread = None
+        if self._error is not None:
+            raise self._error
+        return self.result
+
+    def __enter__(self) -> "UploadPipeline":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # 생성이 실패했으면 이미 넘긴 파일까지만 전송하고 원래 예외를 그대로 전달
+            try:
+                self.close()
+            except Exception:
+                pass
+        return False
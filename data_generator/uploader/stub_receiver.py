@@ -0,0 +1,135 @@
+"""
+로컬 테스트용 ThinkingEngine receiver 스텁
+
+HttpUploader가 보내는 /sync_server 배치를 받아 메모리에 쌓는다. 실제 서버 없이 업로드 경로
+(압축, 재시도, 체크포인트 재개)를 확인할 때 사용한다.
+
+    python -m data_generator.uploader.stub_receiver --port 8991
+    python -m data_generator.main upload -d ./data_generator/output --uploader http -u http://127.0.0.1:8991 -a demo
+"""
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import click
+
+
+class StubReceiver:
+    """
+    메모리에 이벤트를 쌓는 receiver 스텁
+
+    fail_first개 요청은 fail_status로 거절해서 재시도 경로를 확인할 수 있고,
+    delay를 주면 요청마다 응답을 늦춰 원격 receiver의 네트워크 지연을 흉내 낸다.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        fail_first: int = 0,
+        fail_status: int = 503,
+        delay: float = 0.0,
+    ):
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.delay = delay
+        self.events: List[Dict] = []
+        self.batches = 0
+        self.requests = 0
+        self.app_ids = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubReceiver":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubReceiver":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _receive(self, headers, body: bytes):
+        """요청 1건 처리 → (HTTP 상태, 응답 JSON)"""
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            self.requests += 1
+            if self.requests <= self.fail_first:
+                return self.fail_status, {"code": -1, "msg": "stub failure"}
+
+        if headers.get("compress", "none") == "gzip":
+            body = gzip.decompress(body)
+        try:
+            events = json.loads(body)
+        except ValueError:
+            return 200, {"code": 2, "msg": "invalid json"}
+        if isinstance(events, dict):
+            events = [events]
+
+        with self._lock:
+            self.events.extend(events)
+            self.batches += 1
+            self.app_ids.add(headers.get("appid"))
+        return 200, {"code": 0}
+
+    def _handler_class(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, payload = receiver._receive(self.headers, body)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+@click.command()
+@click.option('--host', type=str, default='127.0.0.1', help='바인딩 주소')
+@click.option('--port', type=int, default=8991, help='포트')
+@click.option('--fail-first', type=int, default=0, help='처음 N개 요청을 실패시킴 (재시도 확인용)')
+@click.option('--delay', type=float, default=0.0, help='요청마다 응답 지연 (초, 네트워크 지연 흉내)')
+def main(host: str, port: int, fail_first: int, delay: float):
+    """로컬 receiver 스텁 실행 (Ctrl+C로 종료하면 받은 이벤트 수 출력)"""
+    receiver = StubReceiver(host, port, fail_first=fail_first, delay=delay).start()
+    print(f"🤖 Stub receiver: {receiver.url}/sync_server")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        receiver.stop()
+        print(f"✓ {receiver.batches:,} batches, {len(receiver.events):,} events")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,11 @@
 Cache manager for AI analysis results.
 Inspired by Metabase dataset-generator's caching strategy.
 """
+import os
 import json
+import time
 import hashlib
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional
@@ -28,6 +31,11 @@ class CacheManager:
         )
         return hashlib.sha256(content.encode()).hexdigest()[:16]
 
+    def compute_content_hash(self, content: Any) -> str:
+        """임의의 JSON 직렬화 가능한 내용의 해시 (키 정렬 후 계산하므로 순서 무관)"""
+        serialized = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16]
+
     def get_cache_key(self, taxonomy_hash: str, ai_provider: str, product_info: Dict[str, Any]) -> str:
         """캐시 키 생성"""
         # 택소노미 + AI provider + industry로 캐시 키 생성
@@ -125,3 +133,160 @@ class CacheManager:
         """캐시 존재 여부 확인"""
         cache_file = self.cache_dir / f"{key}.json"
         return cache_file.exists()
+
+
+class AIResponseCache:
+    """
+    AI 응답 캐시 (content-addressed)
+
+    키는 (provider, model, 정규화된 system/user 프롬프트)의 SHA-256이므로 택소노미나 제품 정보가
+    바뀌어 프롬프트가 달라지면 자동으로 새 키가 된다. 같은 입력의 반복 실행은 네트워크 호출 없이 응답을 재사용.
+    - TTL: 저장 후 ttl_seconds가 지난 응답은 무시하고 삭제
+    - 크기 제한: 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 응답부터 삭제
+    - refresh=True: 캐시를 읽지 않고 새로 호출한 응답으로 덮어씀 (--refresh-ai)
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        cache_dir: str = ".cache/responses",
+        ttl_seconds: Optional[float] = 30 * 24 * 3600,
+        max_bytes: Optional[int] = 200 * 1024 * 1024,
+        refresh: bool = False,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()  # 동시 프리페치에서 저장/정리 보호
+
+    @staticmethod
+    def normalize_prompt(text: str) -> str:
+        """공백/줄바꿈 차이를 무시하도록 프롬프트 정규화"""
+        return " ".join(text.split())
+
+    def key_for(self, provider: str, model: Optional[str], system_prompt: str, user_prompt: str) -> str:
+        """응답 캐시 키 (프롬프트 내용 해시)"""
+        payload = json.dumps(
+            {
+                "version": self.FORMAT_VERSION,
+                "provider": provider,
+                "model": model,
+                "system": self.normalize_prompt(system_prompt),
+                "user": self.normalize_prompt(user_prompt),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시된 응답 반환 (없거나 만료되었거나 refresh 모드면 None)"""
+        if self.refresh:
+            self.misses += 1
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            print(f"  ⚠️  AI 응답 캐시 로드 실패 (무시): {e}")
+            self.misses += 1
+            return None
+
+        if self._is_expired(data.get('stored_at', 0)):
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        # 마지막 사용 시각 갱신 (크기 초과 시 오래 사용하지 않은 응답부터 삭제)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return data.get('response')
+
+    def put(self, key: str, response: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None):
+        """응답 저장 후 크기 제한에 맞춰 정리"""
+        path = self._path(key)
+        cache_data = {
+            'stored_at': time.time(),
+            'created_at': datetime.now().isoformat(),
+            'metadata': metadata or {},
+            'response': response,
+        }
+
+        with self._lock:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(cache_data, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"  ⚠️  AI 응답 캐시 저장 실패 (무시): {e}")
+                return
+            self._evict()
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds
+
+    def _remove(self, path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _evict(self):
+        """
+        크기 제한을 넘으면 마지막 사용 시각(mtime)이 오래된 응답부터 삭제
+
+        만료된 응답은 get()에서 읽을 때 삭제된다.
+        """
+        if self.max_bytes is None:
+            return
+
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """전체 응답 캐시 삭제"""
+        files = list(self.cache_dir.glob("*/*.json"))
+        for path in files:
+            self._remove(path)
+        print(f"  ✓ AI 응답 캐시 {len(files)}개 삭제")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """응답 캐시 통계"""
+        files = list(self.cache_dir.glob("*/*.json"))
+        return {
+            'entries': len(files),
+            'total_size_mb': round(sum(f.stat().st_size for f in files) / 1024 / 1024, 2),
+            'cache_dir': str(self.cache_dir.absolute()),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,49 @@
+"""
+locale별 Faker 인스턴스 지연 생성
+
+Faker는 임포트와 locale 1개 생성에 각각 수십~수백 ms가 걸리는데, 실제로는 AI 예시 값이 없는
+문자열 속성의 폴백에서만 쓰인다. 처음 요청된 locale만 그때 만들고 공유 난수 스트림을 연결한다.
+"""
+import random
+from typing import Any, Dict, Tuple
+
+
+DEFAULT_LOCALES: Tuple[str, ...] = ("ko_KR", "en_US", "ja_JP", "zh_CN")
+
+
+class FakerPool:
+    """
+    locale → Faker 매핑 (처음 조회할 때 생성)
+
+    pool["ko_KR"]처럼 딕셔너리와 같게 조회하며, 생성된 인스턴스는 모두 rng를 난수 소스로 쓴다.
+    """
+
+    def __init__(self, rng: random.Random, locales: Tuple[str, ...] = DEFAULT_LOCALES):
+        self.locales = tuple(locales)
+        self._rng = rng
+        self._instances: Dict[str, Any] = {}
+
+    @property
+    def rng(self) -> random.Random:
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng: random.Random):
+        """난수 스트림 교체 (이미 만든 인스턴스에도 반영)"""
+        self._rng = rng
+        for faker in self._instances.values():
+            faker.random = rng
+
+    def __getitem__(self, locale: str) -> Any:
+        faker = self._instances.get(locale)
+        if faker is None:
+            if locale not in self.locales:
+                raise KeyError(locale)
+            from faker import Faker
+
+            faker = self._instances[locale] = Faker(locale)
+            faker.random = self._rng
+        return faker
+
+    def __contains__(self, locale: object) -> bool:
+        return locale in self.locales
@@ -0,0 +1,167 @@
+"""
+AI 공식 힌트 컴파일러
+
+"level * 1000", "total_spent + purchase_amount" 같은 산술식을 한 번만 파싱해서 허용된 AST 노드만 남았는지
+검사하고, 노드마다 클로저로 컴파일한다. 평가할 때는 공식에 나오는 변수만 조회하므로 문자열 치환
+(level이 max_level 안의 level까지 바꾸는 문제)이나 eval 호출이 없다.
+"""
+import ast
+import math
+import operator
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class FormulaError(ValueError):
+    """허용되지 않는 문법/연산이 들어 있는 공식"""
+
+
+class _Undefined(Exception):
+    """평가 결과가 정의되지 않음 (0으로 나누기, 너무 큰 거듭제곱 등) - 호출 측에는 None으로 보임"""
+
+
+# 허용하는 연산자
+_BINARY_OPS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS: Dict[type, Callable[[Any], Any]] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+# 허용하는 함수 (인자는 모두 숫자)
+_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "min": min,
+    "max": max,
+    "abs": abs,
+    "round": round,
+    "sqrt": math.sqrt,
+    "log": math.log,
+}
+
+# 거듭제곱 지수 상한 (큰 정수 거듭제곱이 메모리/시간을 다 쓰지 않도록)
+MAX_EXPONENT = 64
+# 결과 크기 상한 (비트) - 거듭제곱 전에 추정해서 거절하고, 이보다 큰 정수 결과는 None
+# (수천 자리 정수는 json.dumps에서 ValueError가 나고 계산 자체도 느림)
+MAX_RESULT_BITS = 63
+# 공식 길이 상한 (AI 응답이 비정상적으로 긴 경우 파싱 전에 거절)
+MAX_FORMULA_LENGTH = 500
+
+_Node = Callable[[Tuple[Any, ...]], Any]
+
+
+class CompiledFormula:
+    """
+    컴파일된 공식 (compile_formula 결과)
+
+    variables는 공식에 나오는 변수명 (등장 순서)이며, 호출 시 lookup(변수명)으로 값을 읽는다.
+    변수 값이 없거나 숫자가 아니거나 결과가 정의되지 않으면 (0으로 나누기, inf/nan, 64비트를 넘는 정수 등) None을 반환한다.
+    """
+
+    __slots__ = ("source", "variables", "_evaluate")
+
+    def __init__(self, source: str, variables: Tuple[str, ...], evaluate: _Node):
+        self.source = source
+        self.variables = variables
+        self._evaluate = evaluate
+
+    def __call__(self, lookup: Callable[[str], Any]) -> Optional[float]:
+        values = []
+        for name in self.variables:
+            value = lookup(name)
+            if not isinstance(value, (int, float)):
+                return None
+            values.append(value)
+        try:
+            result = self._evaluate(tuple(values))
+        except (_Undefined, ArithmeticError, ValueError, TypeError):
+            return None
+        if isinstance(result, complex) or (isinstance(result, float) and not math.isfinite(result)):
+            return None
+        if isinstance(result, int) and result.bit_length() > MAX_RESULT_BITS:
+            return None
+        return result
+
+    def __repr__(self) -> str:
+        return f"CompiledFormula({self.source!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_formula(source: str) -> CompiledFormula:
+    """
+    공식 문자열 → CompiledFormula (같은 문자열은 캐시된 객체 재사용)
+
+    Raises:
+        FormulaError: 문법 오류이거나 허용되지 않는 노드(속성 접근, 임의 함수 호출, 비교 등)가 있을 때
+    """
+    if not isinstance(source, str) or not source.strip():
+        raise FormulaError("formula must be a non-empty string")
+    if len(source) > MAX_FORMULA_LENGTH:
+        raise FormulaError(f"formula is longer than {MAX_FORMULA_LENGTH} characters")
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as e:
+        raise FormulaError(f"invalid formula syntax: {source!r}") from e
+
+    slots: Dict[str, int] = {}
+    evaluate = _compile_node(tree.body, slots, source)
+    return CompiledFormula(source, tuple(slots), evaluate)
+
+
+def try_compile_formula(source: Any) -> Optional[CompiledFormula]:
+    """compile_formula와 같지만 허용되지 않는 공식이면 None"""
+    try:
+        return compile_formula(source)
+    except (FormulaError, TypeError):
+        return None
+
+
+def _compile_node(node: ast.AST, slots: Dict[str, int], source: str) -> _Node:
+    """AST 노드 1개 → values 튜플(변수 슬롯 순서)을 받는 클로저"""
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise FormulaError(f"unsupported constant {value!r} in {source!r}")
+        return lambda values: value
+
+    if isinstance(node, ast.Name):
+        slot = slots.setdefault(node.id, len(slots))
+        return lambda values: values[slot]
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        op = _UNARY_OPS[type(node.op)]
+        operand = _compile_node(node.operand, slots, source)
+        return lambda values: op(operand(values))
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        left = _compile_node(node.left, slots, source)
+        right = _compile_node(node.right, slots, source)
+        if isinstance(node.op, ast.Pow):
+            return lambda values: _checked_pow(left(values), right(values))
+        op = _BINARY_OPS[type(node.op)]
+        return lambda values: op(left(values), right(values))
+
+    if (
+        isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _FUNCTIONS
+        and not node.keywords and node.args
+    ):
+        function = _FUNCTIONS[node.func.id]
+        args: List[_Node] = [_compile_node(arg, slots, source) for arg in node.args]
+        return lambda values: function(*[arg(values) for arg in args])
+
+    raise FormulaError(f"unsupported expression {type(node).__name__} in {source!r}")
+
+
+def _checked_pow(base: Any, exponent: Any) -> Any:
+    """지수와 결과 크기를 제한한 거듭제곱 (결과 비트 수는 exponent * log2(|base|)로 미리 추정)"""
+    if abs(exponent) > MAX_EXPONENT:
+        raise _Undefined()
+    magnitude = abs(base)
+    if exponent > 0 and magnitude > 1 and exponent * math.log2(magnitude) > MAX_RESULT_BITS:
+        raise _Undefined()
+    return base ** exponent
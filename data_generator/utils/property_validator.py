@@ -2,7 +2,8 @@
 ThinkingEngine 속성명 검증 및 정제 유틸리티
 """
 import re
-from typing import Dict, Any, Set
+from functools import lru_cache
+from typing import Dict, Any, Set, Iterable
 
 
 class PropertyNameValidator:
@@ -36,6 +37,10 @@ class PropertyNameValidator:
 
     # 속성명 검증 패턴: 숫자/문자로 시작, 숫자/문자/밑줄만 포함
     VALID_PATTERN = re.compile(r'^[a-zA-Z0-9][a-zA-Z0-9_]{0,49}$')
+    INVALID_CHARS_PATTERN = re.compile(r'[^a-zA-Z0-9_]')
+
+    # 택소노미/프리셋처럼 미리 알려진 속성명의 정제 결과 (register_names로 등록, 크기 제한 없음)
+    _known_names: Dict[str, str] = {}
 
     @classmethod
     def is_valid_property_name(cls, name: str) -> bool:
@@ -58,7 +63,9 @@ class PropertyNameValidator:
     @classmethod
     def sanitize_property_name(cls, name: str) -> str:
         """
-        속성명을 ThinkingEngine 규칙에 맞게 정제
+        속성명을 ThinkingEngine 규칙에 맞게 정제 (결과 캐싱)
+
+        등록된 속성명은 딕셔너리에서 바로 찾고, 그 외 이름은 크기 제한이 있는 LRU 캐시 사용
 
         Args:
             name: 원본 속성명
@@ -66,6 +73,21 @@ class PropertyNameValidator:
         Returns:
             정제된 속성명
         """
+        sanitized = cls._known_names.get(name)
+        if sanitized is None:
+            sanitized = _sanitize_unknown_name(name)
+        return sanitized
+
+    @classmethod
+    def register_names(cls, names: Iterable[str]):
+        """미리 알려진 속성명들의 정제 결과를 캐시에 등록"""
+        for name in names:
+            if name not in cls._known_names:
+                cls._known_names[name] = cls._sanitize_property_name_uncached(name)
+
+    @classmethod
+    def _sanitize_property_name_uncached(cls, name: str) -> str:
+        """속성명 정제 (캐시 없이 매번 계산)"""
         # 미리 설정된 속성은 그대로 반환
         if name.startswith('#') and name in cls.PREDEFINED_PROPERTIES:
             return name
@@ -84,7 +106,7 @@ class PropertyNameValidator:
         name = name.replace(' ', '_')
 
         # 허용되지 않는 문자 제거
-        name = re.sub(r'[^a-zA-Z0-9_]', '', name)
+        name = cls.INVALID_CHARS_PATTERN.sub('', name)
 
         # 숫자로 시작하면 앞에 밑줄 추가
         if name and name[0].isdigit():
@@ -168,6 +190,53 @@ class PropertyNameValidator:
         return sanitized_event
 
 
+@lru_cache(maxsize=4096)
+def _sanitize_unknown_name(name: str) -> str:
+    """등록되지 않은 속성명 정제 (LRU 캐시)"""
+    return PropertyNameValidator._sanitize_property_name_uncached(name)
+
+
+class PropertyKeyRemap:
+    """
+    이벤트 타입별 속성 키 정제 테이블
+
+    키 집합이 고정된 속성 딕셔너리(같은 이벤트의 속성 등)는 원본 키 -> 정제 키 테이블로
+    딕셔너리 컴프리헨션 한 번에 정제한다. 처음 보는 키는 테이블에 추가하며,
+    서로 다른 원본 키가 같은 이름으로 정제되는 충돌이 생기면 _2, _3 접미사 순서가
+    딕셔너리 순서에 따라 달라지므로 항상 sanitize_properties 경로를 사용한다.
+    """
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self._remap: Dict[str, str] = {}
+        self._outputs: Set[str] = set()
+        self.has_collision = False
+        self.add_keys(keys)
+
+    def add_keys(self, keys: Iterable[str]):
+        """원본 키를 테이블에 추가"""
+        for key in keys:
+            if key in self._remap:
+                continue
+            new_key = PropertyNameValidator.sanitize_property_name(key)
+            if new_key in self._outputs:
+                self.has_collision = True
+            self._remap[key] = new_key
+            self._outputs.add(new_key)
+
+    def apply(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """속성 딕셔너리의 키 정제 (PropertyNameValidator.sanitize_properties와 같은 결과)"""
+        if not self.has_collision:
+            remap = self._remap
+            try:
+                return {remap[key]: value for key, value in properties.items()}
+            except KeyError:
+                self.add_keys(properties)
+                if not self.has_collision:
+                    return {remap[key]: value for key, value in properties.items()}
+
+        return PropertyNameValidator.sanitize_properties(properties)
+
+
 def validate_property_name(name: str) -> bool:
     """속성명 유효성 검증 (간편 함수)"""
     return PropertyNameValidator.is_valid_property_name(name)
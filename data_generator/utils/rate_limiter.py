@@ -1,86 +1,183 @@
 """
 Rate limiter for AI API calls.
 Inspired by Metabase dataset-generator's rate limiting strategy.
+
+GCRA(Generic Cell Rate Algorithm) 방식의 토큰 버킷: 식별자(provider)마다 분당 요청 수와
+분당 토큰 수 예산을 따로 관리하고, 요청 시 슬롯을 원자적으로 예약한 뒤 필요한 만큼만 대기한다.
 """
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from collections import defaultdict
+import random
+import asyncio
+import threading
+from typing import Dict, Optional, Tuple
+
+
+def jittered_backoff(
+    attempt: int,
+    retry_after: Optional[float] = None,
+    base_seconds: float = 1.0,
+    max_seconds: float = 60.0,
+    rng: Optional[random.Random] = None,
+) -> float:
+    """
+    지수 백오프 + full jitter 대기 시간 ([0, base * 2^attempt] 구간에서 균등 선택)
+
+    동시에 429를 받은 요청들이 같은 시점에 다시 몰리지 않도록 분산시킨다.
+    서버가 Retry-After를 알려주면 그보다 짧게 기다리지 않는다.
+    """
+    delay = (rng or random).uniform(0, min(max_seconds, base_seconds * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
 
 
 class RateLimiter:
-    """AI API 호출 rate limiting"""
+    """
+    AI API 호출 rate limiting (스레드 안전 - 동시 프리페치에서 공유)
+
+    각 예산은 "이론적 도착 시각(TAT)" 하나로 표현된다. 요청 1건(또는 토큰 n개)은 TAT를
+    window/limit(×n)만큼 뒤로 미루고, TAT가 현재 시각보다 window 이상 앞서면 그 차이만큼 대기.
+    → limit개까지는 즉시 버스트 허용, 이후에는 균등한 간격으로 통과.
+    """
 
-    def __init__(self, max_requests: int = 10, window_seconds: int = 60):
+    def __init__(
+        self,
+        max_requests: int = 10,
+        window_seconds: int = 60,
+        max_tokens: Optional[int] = None,
+    ):
         """
         Args:
-            max_requests: 최대 요청 수
+            max_requests: 윈도우당 최대 요청 수
             window_seconds: 시간 윈도우 (초)
+            max_tokens: 윈도우당 최대 토큰 수 (None이면 토큰 예산 없음)
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Dict[str, List[datetime]] = defaultdict(list)
+        self.max_tokens = max_tokens
+        self._tat: Dict[Tuple[str, str], float] = {}  # (identifier, "requests"|"tokens") → TAT (monotonic)
+        self._blocked_until: Dict[str, float] = {}  # 429 응답 후 식별자 전체 대기 시각
+        self._lock = threading.Lock()  # 예약 갱신 보호 (대기는 락 밖에서)
+        self._jitter = random.Random()  # 백오프 지터 전용 (데이터 생성 난수와 분리)
 
-    def check_limit(self, identifier: str = 'default') -> bool:
-        """
-        Rate limit 체크
+    def _budgets(self, tokens: int):
+        """(예산 종류, 한도, 비용) 목록"""
+        budgets = [("requests", self.max_requests, 1)]
+        if self.max_tokens and tokens > 0:
+            # 한도보다 큰 요청도 통과할 수 있도록 비용을 한도로 제한
+            budgets.append(("tokens", self.max_tokens, min(tokens, self.max_tokens)))
+        return budgets
 
-        Args:
-            identifier: 식별자 (예: "openai", "anthropic")
+    def _compute(self, identifier: str, tokens: int, now: float):
+        """예약 시 대기 시간과 새 TAT 계산 (락 안에서 호출)"""
+        wait = max(0.0, self._blocked_until.get(identifier, 0.0) - now)
+        new_tats = []
+        for kind, limit, cost in self._budgets(tokens):
+            if limit <= 0:
+                continue
+            interval = self.window_seconds / limit
+            tat = max(self._tat.get((identifier, kind), now), now)
+            new_tat = tat + interval * cost
+            wait = max(wait, new_tat - self.window_seconds - now)
+            new_tats.append(((identifier, kind), new_tat))
+        return wait, new_tats
 
-        Returns:
-            True if allowed, raises Exception if rate limited
+    def reserve(self, identifier: str = 'default', tokens: int = 0) -> float:
+        """
+        요청 슬롯을 예약하고 대기해야 할 시간(초)을 반환 (예외 없음)
+
+        예약은 즉시 반영되므로 동시에 호출한 스레드/코루틴은 서로 다른 시각으로 줄을 선다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait, new_tats = self._compute(identifier, tokens, now)
+            for key, new_tat in new_tats:
+                self._tat[key] = new_tat
+            return wait
 
-        Raises:
-            Exception: Rate limit 초과 시
+    def check_limit(self, identifier: str = 'default', tokens: int = 0) -> bool:
         """
-        now = datetime.now()
-        cutoff = now - timedelta(seconds=self.window_seconds)
+        Rate limit 체크 (대기 없이 통과 가능하면 예약하고 True, 아니면 예약하지 않고 False)
 
-        # 이전 요청 기록 정리 (윈도우 밖의 요청 제거)
-        self.requests[identifier] = [
-            req_time for req_time in self.requests[identifier]
-            if req_time > cutoff
-        ]
+        Args:
+            identifier: 식별자 (예: "openai", "anthropic")
+            tokens: 이번 요청의 예상 토큰 수
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait, new_tats = self._compute(identifier, tokens, now)
+            if wait > 0:
+                return False
+            for key, new_tat in new_tats:
+                self._tat[key] = new_tat
+            return True
 
-        # Rate limit 체크
-        if len(self.requests[identifier]) >= self.max_requests:
-            oldest = self.requests[identifier][0]
-            wait_time = (oldest + timedelta(seconds=self.window_seconds) - now).total_seconds()
+    def acquire(self, identifier: str = 'default', tokens: int = 0, verbose: bool = True) -> float:
+        """
+        슬롯을 예약하고 필요한 만큼 대기 (동기)
 
-            if wait_time > 0:
-                raise Exception(
-                    f"Rate limit exceeded: {len(self.requests[identifier])}/{self.max_requests} "
-                    f"requests in {self.window_seconds}s. Wait {wait_time:.1f}s"
-                )
+        Returns:
+            실제 대기한 시간 (초)
+        """
+        wait = self.reserve(identifier, tokens)
+        if wait > 0:
+            if verbose:
+                print(f"  ⏳ Rate limit 도달. {wait:.1f}초 대기 중...")
+            time.sleep(wait)
+        return wait
 
-        # 요청 기록
-        self.requests[identifier].append(now)
-        return True
+    async def acquire_async(self, identifier: str = 'default', tokens: int = 0, verbose: bool = True) -> float:
+        """acquire의 asyncio 버전 (이벤트 루프를 막지 않고 대기)"""
+        wait = self.reserve(identifier, tokens)
+        if wait > 0:
+            if verbose:
+                print(f"  ⏳ Rate limit 도달. {wait:.1f}초 대기 중...")
+            await asyncio.sleep(wait)
+        return wait
 
-    def wait_if_needed(self, identifier: str = 'default', verbose: bool = True):
+    def wait_if_needed(self, identifier: str = 'default', verbose: bool = True, tokens: int = 0):
         """
-        필요시 자동 대기
+        필요시 자동 대기 (acquire와 동일, 기존 호출부 호환용)
 
         Args:
             identifier: 식별자
             verbose: 대기 메시지 출력 여부
+            tokens: 이번 요청의 예상 토큰 수
         """
-        while True:
-            try:
-                self.check_limit(identifier)
-                break
-            except Exception as e:
-                if "Rate limit" in str(e):
-                    # Wait time 추출
-                    wait_time = float(str(e).split('Wait ')[1].split('s')[0])
+        self.acquire(identifier, tokens, verbose)
 
-                    if verbose:
-                        print(f"  ⏳ Rate limit 도달. {wait_time:.1f}초 대기 중...")
+    def record_usage(self, identifier: str, estimated_tokens: int, actual_tokens: int):
+        """
+        응답의 실제 토큰 사용량으로 토큰 예산 보정 (예약 시에는 예상치를 사용하므로)
+        """
+        if not self.max_tokens or actual_tokens == estimated_tokens:
+            return
+        key = (identifier, "tokens")
+        interval = self.window_seconds / self.max_tokens
+        with self._lock:
+            now = time.monotonic()
+            tat = self._tat.get(key, now) + (actual_tokens - estimated_tokens) * interval
+            self._tat[key] = max(tat, now)
+
+    def backoff(self, identifier: str, attempt: int, retry_after: Optional[float] = None,
+                base_seconds: float = 1.0, max_seconds: float = 60.0) -> float:
+        """
+        429(rate limit) 응답 후 지수 백오프 + 지터만큼 식별자 전체를 멈춤
 
-                    time.sleep(wait_time + 0.5)  # 약간 여유 시간 추가
-                else:
-                    raise
+        같은 식별자를 쓰는 다른 스레드도 이후 예약에서 함께 대기한다.
+
+        Args:
+            attempt: 0부터 시작하는 재시도 횟수
+            retry_after: 서버가 알려준 Retry-After (초)
+
+        Returns:
+            대기할 시간 (초) - 호출한 쪽은 acquire가 이 시간만큼 대기시킴
+        """
+        delay = jittered_backoff(attempt, retry_after, base_seconds, max_seconds, rng=self._jitter)
+        with self._lock:
+            until = time.monotonic() + delay
+            self._blocked_until[identifier] = max(self._blocked_until.get(identifier, 0.0), until)
+        return delay
 
     def get_stats(self, identifier: str = 'default') -> Dict:
         """
@@ -92,25 +189,29 @@ class RateLimiter:
         Returns:
             통계 딕셔너리
         """
-        now = datetime.now()
-        cutoff = now - timedelta(seconds=self.window_seconds)
-
-        # 현재 윈도우 내의 요청만 카운트
-        recent_requests = [
-            req_time for req_time in self.requests[identifier]
-            if req_time > cutoff
-        ]
+        with self._lock:
+            now = time.monotonic()
+            request_tat = max(self._tat.get((identifier, "requests"), now), now)
+            token_tat = max(self._tat.get((identifier, "tokens"), now), now)
+            blocked = max(0.0, self._blocked_until.get(identifier, 0.0) - now)
 
-        remaining = max(0, self.max_requests - len(recent_requests))
+        # TAT가 현재보다 앞선 만큼이 윈도우 안에서 사용 중인 예산
+        current_count = (request_tat - now) / self.window_seconds * self.max_requests if self.max_requests else 0
+        remaining = max(0, self.max_requests - current_count)
 
-        return {
+        stats = {
             'identifier': identifier,
             'max_requests': self.max_requests,
             'window_seconds': self.window_seconds,
-            'current_count': len(recent_requests),
-            'remaining': remaining,
-            'usage_percent': (len(recent_requests) / self.max_requests * 100) if self.max_requests > 0 else 0
+            'current_count': round(current_count, 2),
+            'remaining': round(remaining, 2),
+            'usage_percent': (current_count / self.max_requests * 100) if self.max_requests > 0 else 0,
+            'blocked_seconds': round(blocked, 2),
         }
+        if self.max_tokens:
+            stats['max_tokens'] = self.max_tokens
+            stats['current_tokens'] = round((token_tat - now) / self.window_seconds * self.max_tokens)
+        return stats
 
     def reset(self, identifier: Optional[str] = None):
         """
@@ -119,7 +220,44 @@ class RateLimiter:
         Args:
             identifier: 특정 식별자만 리셋 (None이면 전체)
         """
-        if identifier:
-            self.requests[identifier] = []
-        else:
-            self.requests.clear()
+        with self._lock:
+            if identifier:
+                for key in [key for key in self._tat if key[0] == identifier]:
+                    del self._tat[key]
+                self._blocked_until.pop(identifier, None)
+            else:
+                self._tat.clear()
+                self._blocked_until.clear()
+
+
+# provider별 기본 예산 (분당 요청 수, 분당 토큰 수)
+DEFAULT_PROVIDER_LIMITS = {
+    "openai": {"max_requests": 10, "max_tokens": 200_000},
+    "anthropic": {"max_requests": 10, "max_tokens": 40_000},
+}
+
+_shared_limiters: Dict[str, RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter(
+    provider: str,
+    max_requests: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+) -> RateLimiter:
+    """
+    provider별 프로세스 공용 RateLimiter (같은 provider의 클라이언트가 여러 개여도 예산 공유)
+
+    처음 생성할 때만 max_requests/max_tokens가 적용되고, 이후 호출은 기존 인스턴스를 반환한다.
+    """
+    with _shared_lock:
+        limiter = _shared_limiters.get(provider)
+        if limiter is None:
+            defaults = DEFAULT_PROVIDER_LIMITS.get(provider, {"max_requests": 10, "max_tokens": None})
+            limiter = RateLimiter(
+                max_requests=max_requests or defaults["max_requests"],
+                window_seconds=60,
+                max_tokens=max_tokens or defaults["max_tokens"],
+            )
+            _shared_limiters[provider] = limiter
+        return limiter
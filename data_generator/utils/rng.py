@@ -0,0 +1,131 @@
+"""
+결정적 난수 스트림 - (seed, user, day) 단위로 독립된 난수를 파생
+
+모든 생성기가 전역 random/np.random 대신 RandomStreams 하나를 공유하고,
+LogGenerator가 유저-날짜마다 스트림을 다시 시드하므로 유저 1명의 하루 로그는
+(seed, user, day)와 유저 상태만으로 결정된다. 따라서 샤딩/재개 실행도
+단일 프로세스 실행과 바이트 단위로 같은 파일을 만든다.
+"""
+import hashlib
+import random
+import secrets
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+_MIX_MULTIPLIER_1 = 0xBF58476D1CE4E5B9
+_MIX_MULTIPLIER_2 = 0x94D049BB133111EB
+
+
+def _splitmix64(x: int) -> int:
+    """splitmix64 (정수 1개)"""
+    z = (x + _GOLDEN_GAMMA) & _MASK64
+    z = ((z ^ (z >> 30)) * _MIX_MULTIPLIER_1) & _MASK64
+    z = ((z ^ (z >> 27)) * _MIX_MULTIPLIER_2) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _splitmix64_array(x: np.ndarray) -> np.ndarray:
+    """splitmix64 (uint64 배열, 오버플로는 2^64로 순환)"""
+    z = x + np.uint64(_GOLDEN_GAMMA)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX_MULTIPLIER_1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX_MULTIPLIER_2)
+    return z ^ (z >> np.uint64(31))
+
+
+def stable_hash64(text: str) -> int:
+    """
+    실행/프로세스와 무관하게 항상 같은 63비트 해시
+
+    내장 hash()는 PYTHONHASHSEED에 따라 실행마다 달라지므로 출력값에 사용하면 안 된다.
+    """
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & 0x7FFFFFFFFFFFFFFF
+
+
+class RandomStreams(random.Random):
+    """
+    (seed, scope...) 키로 파생되는 난수 스트림
+
+    random.Random을 상속하므로 rng.random(), rng.randint() 등을 그대로 쓸 수 있고
+    Faker 인스턴스의 .random으로도 지정할 수 있다.
+    - seed_user_day(): 유저-날짜 단위로 스트림을 다시 시드
+    - counter_uniforms(): 상태 없이 (키, id)만으로 계산되는 균등 난수 배열 (NumPy 일괄 샘플링용)
+    - numpy(): 키별 독립 numpy.random.Generator
+    """
+
+    # 파생 키의 첫 번째 원소 (용도별로 스트림이 겹치지 않도록 구분)
+    SCOPE_USERS = 1  # 유저 생성
+    SCOPE_USER_DAY = 2  # 유저 1명의 하루 로그
+    SCOPE_DAY_ORDER = 3  # 하루 안의 유저 처리 순서
+    SCOPE_DAY_PLAN = 4  # 하루 세션 계획 (활동 여부, 세션 수, 시각)
+    SCOPE_USER_INIT = 5  # 유저 초기 상태/유저 속성 (처음 필요할 때 생성)
+    SCOPE_SESSION_EVENTS = 6  # 세션 이벤트 순서 (세션 마르코프 모델)
+    SCOPE_PROPERTY_VALUES = 7  # 일괄 생성하는 이벤트 속성값
+
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Args:
+            seed: 루트 시드 (None이면 무작위 - 실행마다 다르지만 샤딩 여부와 무관하게 같은 규칙으로 파생)
+        """
+        self.root_seed = (seed if seed is not None else secrets.randbits(64)) & _MASK64
+        self._root_mix = _splitmix64(self.root_seed)
+        # 시뮬레이션 시각 ("time" 타입 속성, "current_time" 업데이트에 사용)
+        self.current_time: Optional[datetime] = None
+        super().__init__(self.root_seed)
+
+    def derive(self, *keys: int) -> int:
+        """루트 시드와 키들로 64비트 시드 파생"""
+        h = self._root_mix
+        for key in keys:
+            h = _splitmix64(h ^ (key & _MASK64))
+        return h
+
+    def seed_user_day(self, user_id: int, day: int):
+        """유저 1명의 하루 생성을 위한 시드 (day는 date.toordinal() 권장)"""
+        self.seed(self.derive(self.SCOPE_USER_DAY, user_id, day))
+
+    @contextmanager
+    def scoped(self, *keys: int) -> Iterator["RandomStreams"]:
+        """
+        (루트 시드, keys)로 잠시 다시 시드했다가 원래 상태(current_time 포함)로 복원
+
+        진행 중인 유저-날짜 스트림을 건드리지 않고 다른 스코프의 값을 지연 생성할 때 사용
+        """
+        saved_state = self.getstate()
+        saved_time = self.current_time
+        self.seed(self.derive(*keys))
+        try:
+            yield self
+        finally:
+            self.setstate(saved_state)
+            self.current_time = saved_time
+
+    def numpy(self, *keys: int) -> np.random.Generator:
+        """(루트 시드, keys)에서 파생된 독립 numpy Generator"""
+        return np.random.Generator(np.random.PCG64(np.random.SeedSequence(self.derive(*keys))))
+
+    def counter_bits(self, ids: Sequence[int], *keys: int, sub: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        (루트 시드, keys, id[, sub])마다 고정된 64비트 난수 배열
+
+        상태가 없으므로 같은 id는 어떤 배열에 어떤 순서로 들어 있어도 같은 값을 얻는다.
+        """
+        x = np.asarray(ids, dtype=np.uint64) ^ np.uint64(self.derive(*keys))
+        if sub is not None:
+            x = _splitmix64_array(x) ^ np.asarray(sub, dtype=np.uint64)
+        return _splitmix64_array(x)
+
+    def counter_uniforms(self, ids: Sequence[int], *keys: int, sub: Optional[Sequence[int]] = None) -> np.ndarray:
+        """counter_bits를 [0, 1) 균등 난수로 변환"""
+        bits = self.counter_bits(ids, *keys, sub=sub)
+        return (bits >> np.uint64(11)).astype(np.float64) * (1.0 / 9007199254740992.0)
+
+    def now(self) -> datetime:
+        """시뮬레이션 시각 (지정되지 않았으면 실제 현재 시각)"""
+        return self.current_time if self.current_time is not None else datetime.now()
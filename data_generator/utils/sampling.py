@@ -0,0 +1,84 @@
+"""
+가중치 샘플링 - Walker alias method
+
+가중치가 고정된 후보에서 여러 번 뽑을 때 한 번만 테이블을 만들면 이후 추출은 후보 수와 무관하게 O(1)이다.
+(random.choices는 추출마다 누적 가중치를 이진 탐색하므로 O(log n), weights를 넘기면 누적 합도 매번 다시 계산)
+"""
+import random
+from typing import Generic, List, Sequence, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+def alias_table(weights: Sequence[float]) -> Tuple[List[float], List[int]]:
+    """
+    Walker alias 테이블 (칸별 자기 자신을 고를 확률, 대체 후보 인덱스)
+
+    균등 난수 u에 대해 i = int(u * n), u * n - i < prob[i]이면 i, 아니면 alias[i]를 고른다.
+    음수 가중치는 0으로 취급한다.
+    """
+    weights = [w if w > 0 else 0.0 for w in weights]
+    total = sum(weights)
+    if not weights or total <= 0:
+        raise ValueError("alias table needs at least one positive weight")
+
+    n = len(weights)
+    scaled = [w * n / total for w in weights]
+    prob = [0.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = scaled[l] + scaled[s] - 1.0
+        (small if scaled[l] < 1.0 else large).append(l)
+    # 남은 칸은 (부동소수 오차 포함) 자기 자신만 가리킴
+    for i in large + small:
+        prob[i] = 1.0
+    return prob, alias
+
+
+class AliasSampler(Generic[T]):
+    """
+    Walker alias 테이블 기반 복원 추출기
+
+    추출 1회에 균등 난수 1개만 사용한다: u * n의 정수부로 칸을 고르고 소수부로 칸 안의 두 후보 중 하나를 고른다.
+    음수 가중치는 0으로 취급한다.
+    """
+
+    __slots__ = ("items", "_prob", "_alias", "_n")
+
+    def __init__(self, items: Sequence[T], weights: Sequence[float]):
+        """
+        Args:
+            items: 후보 목록
+            weights: items와 같은 길이의 가중치 (합이 0보다 커야 함)
+        """
+        if len(items) != len(weights):
+            raise ValueError("items and weights must have the same length")
+        prob, alias = alias_table(weights)
+
+        self.items = list(items)
+        # 칸마다 (자기 자신, 대체 후보)를 미리 풀어 둬서 추출 시 인덱스 간접 참조를 줄임
+        self._prob = prob
+        self._alias = [self.items[j] for j in alias]
+        self._n = len(prob)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def sample(self, rng: random.Random, k: int = 1) -> List[T]:
+        """k개 복원 추출"""
+        rand = rng.random
+        n = self._n
+        items, prob, alias = self.items, self._prob, self._alias
+        result = []
+        for _ in range(k):
+            u = rand() * n
+            i = int(u)
+            result.append(items[i] if u - i < prob[i] else alias[i])
+        return result
@@ -0,0 +1,238 @@
+"""
+생성 파이프라인 계측 - 단계별 타이머/카운터, 진행률 콜백, 하루치 프로파일 덤프
+
+기본 상태에서는 유저-날짜 단위 카운터만 갱신하므로 켜 둔 채로 실행해도 부담이 거의 없다.
+detailed=True면 핫 루프 메서드를 인스턴스 속성으로 감싸 단계별 배타 시간을 측정한다
+(감싸지 않은 경로에는 오버헤드가 전혀 없음).
+"""
+import time
+import contextlib
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+# 단계 이름 (출력 순서)
+STAGE_USER_DAY = "user_day"
+STAGE_SESSION_PLANNING = "session_planning"
+STAGE_PROPERTY_GENERATION = "property_generation"
+STAGE_SANITIZE = "sanitize"
+STAGE_SERIALIZATION = "serialization"
+STAGE_FILE_IO = "file_io"
+
+STAGES = (
+    STAGE_USER_DAY,
+    STAGE_SESSION_PLANNING,
+    STAGE_PROPERTY_GENERATION,
+    STAGE_SANITIZE,
+    STAGE_SERIALIZATION,
+    STAGE_FILE_IO,
+)
+
+# (완료 유저-날짜 수, 전체 유저-날짜 수, 기록 라인 수, 경과 초)
+ProgressCallback = Callable[[int, int, int, float], None]
+
+
+class Telemetry:
+    """
+    단계별 배타 시간 측정기 + 진행률 집계
+
+    단계가 중첩되면 (예: 유저-날짜 안의 직렬화) 안쪽 단계 시간은 바깥 단계에서 빠진다.
+    진행률 콜백은 progress_interval 초에 한 번만 호출되므로 유저마다 advance()를 불러도 된다.
+    """
+
+    def __init__(
+        self,
+        detailed: bool = False,
+        on_progress: Optional[ProgressCallback] = None,
+        progress_interval: float = 0.2,
+        profile_day: Optional[date] = None,
+        profile_output: Optional[str] = None,
+    ):
+        """
+        Args:
+            detailed: True면 instrument()로 감싼 메서드의 단계별 시간 측정
+            on_progress: 진행률 콜백 (rich 진행 표시 갱신 등)
+            progress_interval: 진행률 콜백 최소 간격 (초)
+            profile_day: 프로파일을 남길 날짜 (None이면 프로파일 없음)
+            profile_output: 프로파일 저장 경로 (.html이면 pyinstrument, 그 외는 cProfile pstats)
+        """
+        self.detailed = detailed
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.profile_day = profile_day
+        self.profile_output = profile_output
+
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self._stack: List[list] = []  # [stage, 마지막 재개 시각]
+
+        self.total_units = 0  # 전체 유저-날짜 수
+        self.done_units = 0
+        self.lines = 0
+        self.started_at = time.perf_counter()
+        self._next_report = 0.0
+
+    @classmethod
+    def from_config(cls, config, on_progress: Optional[ProgressCallback] = None) -> "Telemetry":
+        """DataGeneratorConfig의 profile_* 설정으로 생성"""
+        return cls(
+            detailed=config.profile_stages,
+            on_progress=on_progress,
+            profile_day=config.profile_day,
+            profile_output=config.profile_output,
+        )
+
+    # ------------------------------------------------------------------
+    # 진행률
+    # ------------------------------------------------------------------
+
+    def start(self, total_units: int):
+        """생성 시작 (전체 유저-날짜 수 지정)"""
+        self.total_units = total_units
+        self.done_units = 0
+        self.lines = 0
+        self.started_at = time.perf_counter()
+        self._next_report = 0.0
+        self._report(force=True)
+
+    def advance(self, units: int = 1, lines: int = 0):
+        """유저-날짜 처리 완료 반영"""
+        self.done_units += units
+        self.lines += lines
+        if self.on_progress is not None and time.perf_counter() >= self._next_report:
+            self._report()
+
+    def finish(self):
+        """마지막 진행률 보고"""
+        self._report(force=True)
+
+    def _report(self, force: bool = False):
+        if self.on_progress is None:
+            return
+        now = time.perf_counter()
+        if not force and now < self._next_report:
+            return
+        self._next_report = now + self.progress_interval
+        self.on_progress(self.done_units, self.total_units, self.lines, now - self.started_at)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def lines_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.lines / elapsed if elapsed > 0 else 0.0
+
+    # ------------------------------------------------------------------
+    # 단계별 타이머
+    # ------------------------------------------------------------------
+
+    def enter(self, stage: str):
+        now = time.perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self.seconds[parent[0]] = self.seconds.get(parent[0], 0.0) + now - parent[1]
+        self._stack.append([stage, now])
+
+    def exit(self):
+        now = time.perf_counter()
+        stage, resumed_at = self._stack.pop()
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + now - resumed_at
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+        if self._stack:
+            self._stack[-1][1] = now
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """구간 측정 (detailed 여부와 무관하게 항상 측정 - 호출 빈도가 낮은 구간용)"""
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def timed(self, stage: str, func: Callable) -> Callable:
+        """func 호출을 stage로 측정하는 함수 반환 (detailed가 아니면 func 그대로)"""
+        if not self.detailed:
+            return func
+        enter, exit_ = self.enter, self.exit
+
+        def timed_call(*args, **kwargs):
+            enter(stage)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                exit_()
+
+        return timed_call
+
+    def instrument(self, obj: Any, attr: str, stage: str):
+        """obj.attr 메서드를 stage로 측정하도록 인스턴스 속성으로 감쌈 (detailed가 아니면 아무것도 안 함)"""
+        if self.detailed:
+            setattr(obj, attr, self.timed(stage, getattr(obj, attr)))
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """다른 프로세스(샤드 워커)의 측정 결과를 합침"""
+        for stage, seconds in snapshot.get("seconds", {}).items():
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+        for stage, calls in snapshot.get("calls", {}).items():
+            self.calls[stage] = self.calls.get(stage, 0) + calls
+
+    def snapshot(self) -> Dict[str, Any]:
+        """프로세스 간 전달/리포트용 측정 결과"""
+        return {"seconds": dict(self.seconds), "calls": dict(self.calls)}
+
+    def summary_lines(self) -> List[str]:
+        """단계별 시간 요약 (측정된 단계만)"""
+        measured = [stage for stage in STAGES if stage in self.seconds]
+        measured += [stage for stage in self.seconds if stage not in STAGES]
+        total = sum(self.seconds.values())
+        lines = []
+        for stage in measured:
+            seconds = self.seconds[stage]
+            share = seconds / total * 100 if total else 0.0
+            lines.append(f"{stage:<20} {seconds:>9.2f}s {share:>5.1f}%  ({self.calls.get(stage, 0):,} calls)")
+        return lines
+
+    # ------------------------------------------------------------------
+    # 프로파일
+    # ------------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def profile(self, day: date):
+        """profile_day와 같은 날짜면 구간을 프로파일링해서 profile_output에 저장"""
+        if self.profile_day is None or day != self.profile_day:
+            yield
+            return
+
+        output = Path(self.profile_output or f"profile_{day.strftime('%Y%m%d')}.prof")
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+        if output.suffix == ".html":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                print("  ⚠️  pyinstrument가 설치되어 있지 않아 cProfile로 저장합니다")
+                output = output.with_suffix(".prof")
+            else:
+                profiler = Profiler()
+                profiler.start()
+                try:
+                    yield
+                finally:
+                    profiler.stop()
+                    output.write_text(profiler.output_html(), encoding="utf-8")
+                    print(f"  ✓ 프로파일 저장: {output}")
+                return
+
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(str(output))
+            print(f"  ✓ 프로파일 저장: {output} (python -m pstats {output})")
@@ -0,0 +1,329 @@
+"""
+JSONL 스트리밍 기록기 - 생성된 로그를 메모리에 모으지 않고 바로 파일로 흘려보냄
+
+압축(gzip/zstd)은 기록하면서 스트리밍으로 적용하고, 하루치 파일을 크기나 시간(hour) 단위로 나눌 수 있다.
+파일 이름은 LogBus2 file_patterns로 한 번에 잡을 수 있도록 항상 logs_YYYYMMDD[_HH][.NNN].jsonl[.gz|.zst] 형식.
+"""
+import io
+import gzip
+import os
+import re
+import json
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .report import FileStats
+
+
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+DEFAULT_COMPRESSION_LEVELS = {"gzip": 6, "zstd": 3}
+
+# 라인 앞부분의 "#type", "#time"의 시(hour), "#event_name" (샤드 병합 시 시간 분할/통계 집계용)
+_LINE_HEADER = re.compile(
+    rb'\{"#type": ?"([^"]+)", ?"#time": ?"\d{4}-\d\d-\d\d (\d\d)[^"]*"(?:, ?"#event_name": ?"((?:[^"\\]|\\.)*)")?'
+)
+
+
+def resolve_compression(compression: str) -> str:
+    """
+    사용 가능한 압축 방식 반환
+
+    zstd는 표준 라이브러리(compression.zstd, Python 3.14+)나 zstandard 패키지가 있을 때만 사용하고,
+    없으면 gzip으로 대체한다.
+    """
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unsupported compression: {compression} (choose from {', '.join(COMPRESSION_SUFFIXES)})")
+    if compression == "zstd" and _zstd_module() is None:
+        print("  ⚠️  zstd 모듈(zstandard)이 설치되어 있지 않아 gzip으로 압축합니다")
+        return "gzip"
+    return compression
+
+
+def _zstd_module():
+    try:
+        from compression import zstd
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+def open_compressed(path: Path, compression: str = "none", level: Optional[int] = None):
+    """
+    압축 스트림으로 파일 열기 (바이너리 쓰기)
+
+    Returns:
+        (쓰기 스트림, 원본 파일) - 원본 파일의 tell()이 지금까지 디스크에 기록된 크기
+    """
+    raw = open(path, 'wb')
+    if compression == "none":
+        return raw, raw
+
+    level = DEFAULT_COMPRESSION_LEVELS[compression] if level is None else level
+    if compression == "gzip":
+        # mtime=0: 같은 데이터면 같은 바이트 (재현성)
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=level, mtime=0), raw
+
+    zstd = _zstd_module()
+    if hasattr(zstd, "ZstdCompressor") and hasattr(zstd.ZstdCompressor, "stream_writer"):
+        # zstandard 패키지
+        return zstd.ZstdCompressor(level=level).stream_writer(raw, closefd=False), raw
+    # 표준 라이브러리 compression.zstd
+    return zstd.ZstdFile(raw, mode='wb', level=level), raw
+
+
+def open_log_reader(path: Path):
+    """
+    생성된 로그 파일을 압축 여부(.gz/.zst)에 맞춰 바이너리 읽기 스트림으로 열기 (라인 단위 순회 가능)
+    """
+    path = Path(path)
+    if path.suffix == COMPRESSION_SUFFIXES["gzip"]:
+        return gzip.open(path, 'rb')
+    if path.suffix == COMPRESSION_SUFFIXES["zstd"]:
+        zstd = _zstd_module()
+        if zstd is None:
+            raise RuntimeError(f"zstd 모듈(zstandard)이 없어 읽을 수 없습니다: {path}")
+        if hasattr(zstd, "ZstdDecompressor") and hasattr(zstd.ZstdDecompressor, "stream_reader"):
+            # zstandard 패키지 - 라인 순회를 위해 버퍼 리더로 감쌈
+            return io.BufferedReader(zstd.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+        return zstd.ZstdFile(path, mode='rb')
+    return open(path, 'rb')
+
+
+def output_file_path(base_path: Path, compression: str = "none", hour: Optional[int] = None, part: Optional[int] = None) -> Path:
+    """
+    일별 기준 경로(logs_YYYYMMDD.jsonl)에서 실제 출력 파일 경로 생성
+
+    hour가 있으면 logs_YYYYMMDD_HH, part가 있으면 .NNN을 붙임 (이름순 정렬 = 시간/분할 순서)
+    """
+    base_path = Path(base_path)
+    stem = base_path.name[:-len(".jsonl")] if base_path.name.endswith(".jsonl") else base_path.stem
+    if hour is not None:
+        stem += f"_{hour:02d}"
+    if part is not None:
+        stem += f".{part:03d}"
+    return base_path.with_name(f"{stem}.jsonl{COMPRESSION_SUFFIXES[compression]}")
+
+
+def output_file_pattern(compression: str = "none", prefix: str = "logs_") -> str:
+    """출력 파일 전체를 잡는 glob 패턴 (LogBus2 file_patterns / 업로드 대상 검색용)"""
+    return f"{prefix}*.jsonl{COMPRESSION_SUFFIXES[compression]}"
+
+
+def parse_line_header(line: bytes) -> Tuple[str, Optional[int], Optional[str]]:
+    """기록된 라인에서 (#type, #time의 시, #event_name) 추출 (형식이 다르면 ("track", None, None))"""
+    match = _LINE_HEADER.match(line)
+    if match is None:
+        return "track", None, None
+    event_name = match.group(3)
+    if event_name is not None:
+        event_name = json.loads(b'"' + event_name + b'"') if b'\\' in event_name else event_name.decode('utf-8')
+    return match.group(1).decode('utf-8'), int(match.group(2)), event_name
+
+
+class _OutputStream:
+    """분할 키(시간)별 버퍼와 현재 기록 중인 파일"""
+
+    __slots__ = ("hour", "part", "buffer", "type_counts", "event_counts", "file", "raw", "stats")
+
+    def __init__(self, hour: Optional[int]):
+        self.hour = hour
+        self.part = 0
+        self.buffer: List[str] = []
+        self.type_counts: Dict[str, int] = {}  # 버퍼에 쌓인 라인의 집계 (flush 시 파일 통계로 이동)
+        self.event_counts: Dict[str, int] = {}
+        self.file = None
+        self.raw = None
+        self.stats: Optional[FileStats] = None
+
+
+class JsonlStreamWriter:
+    """
+    버퍼 크기가 제한된 JSONL 스트리밍 기록기
+
+    write()로 받은 라인은 flush_size 만큼 모이면 파일에 기록되므로
+    하루치 로그가 아무리 많아도 메모리에는 버퍼 하나만 남는다 (시간 분할이면 시간별 버퍼).
+    파일은 첫 flush 시점에 열리며, 라인이 하나도 없으면 파일을 만들지 않는다.
+    기록하면서 라인/바이트/이벤트 수를 함께 집계하므로 끝난 뒤 파일을 다시 읽을 필요가 없다.
+    """
+
+    def __init__(
+        self,
+        flush_size: int = 10000,
+        compression: str = "none",
+        compression_level: Optional[int] = None,
+        max_file_bytes: Optional[int] = None,
+        split_by_hour: bool = False,
+        on_file_closed: Optional[Callable[[FileStats], None]] = None,
+    ):
+        """
+        Args:
+            flush_size: 버퍼에 쌓을 최대 라인 수 (도달하면 파일로 flush)
+            compression: none, gzip, zstd (zstd 모듈이 없으면 gzip)
+            compression_level: 압축 레벨 (None이면 gzip 6, zstd 3)
+            max_file_bytes: 파일 1개의 최대 디스크 크기 - 넘으면 다음 파일(.001, .002 ...)로 넘어감
+            split_by_hour: True면 이벤트 시각의 시(hour)별로 파일을 나눔
+            on_file_closed: 파일 1개를 다 쓰고 닫을 때마다 호출 (분할 파일은 하루가 끝나기 전에도 호출)
+        """
+        if flush_size <= 0:
+            raise ValueError("flush_size must be positive")
+
+        self.flush_size = flush_size
+        self.compression = resolve_compression(compression)
+        self.compression_level = compression_level
+        self.max_file_bytes = max_file_bytes
+        self.split_by_hour = split_by_hour
+        self.on_file_closed = on_file_closed
+        self.path: Optional[Path] = None
+        # 크기 분할이면 버퍼가 한도의 1/8을 넘을 때도 flush (분할 지점이 한도를 크게 넘지 않도록)
+        self._flush_bytes = max_file_bytes // 8 if max_file_bytes else 0
+
+        self._streams: Dict[Optional[int], _OutputStream] = {}
+        self._stream = _OutputStream(None)  # 시간 분할이 아닐 때의 유일한 스트림
+        self._buffered = 0
+        self._buffered_bytes = 0
+        self._lines = 0
+        self._completed: List[FileStats] = []
+
+    def open(self, path: Path):
+        """
+        새 일별 기록 시작 (이전 기록이 열려 있으면 닫음)
+
+        Args:
+            path: 일별 기준 경로 (logs_YYYYMMDD.jsonl) - 실제 파일 이름은 output_file_path 규칙으로 결정
+        """
+        if self.path is not None:
+            self.close()
+
+        self.path = Path(path)
+        self._streams = {}
+        self._stream = _OutputStream(None)
+        if not self.split_by_hour:
+            self._streams[None] = self._stream
+        self._buffered = 0
+        self._buffered_bytes = 0
+        self._lines = 0
+        self._completed = []
+
+    @property
+    def lines_written(self) -> int:
+        """현재 일별 기록에 write()된 라인 수 (버퍼에 남은 라인 포함)"""
+        return self._lines
+
+    def write(self, line: str, log_type: str = "track", event_name: Optional[str] = None, hour: Optional[int] = None):
+        """
+        JSONL 라인 1개 기록 (개행 문자 제외)
+
+        Args:
+            line: JSON 문자열
+            log_type: "#type" 값 (track, user_set ...)
+            event_name: track 이벤트의 "#event_name" (통계 집계용)
+            hour: 이벤트 시각의 시 (split_by_hour일 때 파일 선택에 사용)
+        """
+        if self.split_by_hour:
+            stream = self._streams.get(hour)
+            if stream is None:
+                stream = self._streams[hour] = _OutputStream(hour)
+        else:
+            stream = self._stream
+
+        stream.buffer.append(line)
+        type_counts = stream.type_counts
+        type_counts[log_type] = type_counts.get(log_type, 0) + 1
+        if event_name is not None:
+            event_counts = stream.event_counts
+            event_counts[event_name] = event_counts.get(event_name, 0) + 1
+
+        self._lines += 1
+        self._buffered += 1
+        if self._buffered >= self.flush_size:
+            self.flush()
+        elif self._flush_bytes:
+            self._buffered_bytes += len(line)
+            if self._buffered_bytes >= self._flush_bytes:
+                self.flush()
+
+    def flush(self):
+        """버퍼에 쌓인 라인을 파일에 기록"""
+        if not self._buffered:
+            return
+
+        if self.path is None:
+            raise RuntimeError("JsonlStreamWriter.open()을 먼저 호출해야 합니다")
+
+        for stream in self._streams.values():
+            if stream.buffer:
+                self._flush_stream(stream)
+        self._buffered = 0
+        self._buffered_bytes = 0
+
+    def _flush_stream(self, stream: _OutputStream):
+        if stream.file is None:
+            part = stream.part if self.max_file_bytes else None
+            path = output_file_path(self.path, self.compression, stream.hour, part)
+            stream.file, stream.raw = open_compressed(path, self.compression, self.compression_level)
+            stream.stats = FileStats(path=path)
+
+        # 인코딩된 바이트 수를 그대로 집계하기 위해 바이너리 모드로 기록
+        data = ('\n'.join(stream.buffer) + '\n').encode('utf-8')
+        stream.file.write(data)
+
+        stats = stream.stats
+        stats.bytes += len(data)
+        stats.lines += len(stream.buffer)
+        for key, count in stream.type_counts.items():
+            stats.type_counts[key] = stats.type_counts.get(key, 0) + count
+        for key, count in stream.event_counts.items():
+            stats.event_counts[key] = stats.event_counts.get(key, 0) + count
+        stream.buffer.clear()
+        stream.type_counts = {}
+        stream.event_counts = {}
+
+        # 압축 스트림은 내부 버퍼가 있으므로 디스크 크기는 근사값 (flush 단위로 확인)
+        if self.max_file_bytes and stream.raw.tell() >= self.max_file_bytes:
+            self._finish_file(stream)
+            stream.part += 1
+
+    def _finish_file(self, stream: _OutputStream):
+        """현재 파일을 닫고 완료 목록에 추가"""
+        if stream.file is None:
+            return
+        stream.file.close()
+        if stream.raw is not stream.file:
+            stream.raw.close()
+        stats = stream.stats
+        stats.disk_bytes = os.path.getsize(stats.path)
+        self._completed.append(stats)
+        stream.file = stream.raw = stream.stats = None
+        if self.on_file_closed is not None:
+            self.on_file_closed(stats)
+
+    def close(self) -> List[FileStats]:
+        """
+        남은 버퍼를 기록하고 파일 닫기
+
+        Returns:
+            이번 일별 기록에서 만든 파일별 통계 (파일 이름순, 라인이 없으면 빈 리스트)
+        """
+        if self.path is None:
+            return []
+
+        self.flush()
+        for stream in self._streams.values():
+            self._finish_file(stream)
+
+        completed = sorted(self._completed, key=lambda stats: stats.path.name)
+        self._completed = []
+        self.path = None
+        return completed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
@@ -0,0 +1,110 @@
+"""
+생성 결과 리포트 - 기록 중에 집계한 파일별 라인/바이트/이벤트 수
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Iterable
+
+
+@dataclass
+class FileStats:
+    """출력 파일 1개의 기록 통계"""
+    path: Path
+    lines: int = 0
+    bytes: int = 0  # 압축 전 JSONL 바이트 수
+    disk_bytes: int = 0  # 디스크에 기록된 크기 (압축하지 않으면 bytes와 같음)
+    type_counts: Dict[str, int] = field(default_factory=dict)  # "#type"별 라인 수 (track, user_set ...)
+    event_counts: Dict[str, int] = field(default_factory=dict)  # track 이벤트의 "#event_name"별 라인 수
+
+    @classmethod
+    def merged(cls, path: Path, parts: Iterable["FileStats"]) -> "FileStats":
+        """여러 부분 파일의 통계를 하나로 합침 (샤드 병합용)"""
+        type_counts: Counter = Counter()
+        event_counts: Counter = Counter()
+        lines = 0
+        size = 0
+        disk_size = 0
+        for part in parts:
+            lines += part.lines
+            size += part.bytes
+            disk_size += part.disk_bytes
+            type_counts.update(part.type_counts)
+            event_counts.update(part.event_counts)
+        return cls(
+            path=Path(path),
+            lines=lines,
+            bytes=size,
+            disk_bytes=disk_size,
+            type_counts=dict(type_counts),
+            event_counts=dict(event_counts),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """딕셔너리로 변환"""
+        return {
+            "path": str(self.path),
+            "lines": self.lines,
+            "bytes": self.bytes,
+            "disk_bytes": self.disk_bytes,
+            "type_counts": dict(self.type_counts),
+            "event_counts": dict(self.event_counts),
+        }
+
+
+@dataclass
+class GenerationReport:
+    """전체 생성 결과 리포트 (LogGenerator.generate 반환값)"""
+    output_dir: Path
+    users: int = 0
+    days: int = 0
+    elapsed_seconds: float = 0.0
+    files: List[FileStats] = field(default_factory=list)
+    stage_seconds: Dict[str, float] = field(default_factory=dict)  # 계측 단계별 배타 시간 (측정한 경우만)
+
+    @property
+    def total_lines(self) -> int:
+        return sum(f.lines for f in self.files)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(f.bytes for f in self.files)
+
+    @property
+    def total_disk_bytes(self) -> int:
+        return sum(f.disk_bytes for f in self.files)
+
+    @property
+    def type_counts(self) -> Dict[str, int]:
+        counts: Counter = Counter()
+        for f in self.files:
+            counts.update(f.type_counts)
+        return dict(counts)
+
+    @property
+    def event_counts(self) -> Dict[str, int]:
+        counts: Counter = Counter()
+        for f in self.files:
+            counts.update(f.event_counts)
+        return dict(counts)
+
+    @property
+    def lines_per_second(self) -> float:
+        return self.total_lines / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """딕셔너리로 변환 (JSON 저장용)"""
+        return {
+            "output_dir": str(self.output_dir),
+            "users": self.users,
+            "days": self.days,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "total_lines": self.total_lines,
+            "total_bytes": self.total_bytes,
+            "total_disk_bytes": self.total_disk_bytes,
+            "lines_per_second": round(self.lines_per_second, 1),
+            "type_counts": self.type_counts,
+            "event_counts": self.event_counts,
+            "stage_seconds": dict(self.stage_seconds),
+            "files": [f.to_dict() for f in self.files],
+        }